@@ -0,0 +1,85 @@
+"""
+Benchmark writing and scanning the memory-mapped ColumnStore.
+
+Run from the repository root:
+    python -m benchmarks.bench_archive [--rows N] [--dir PATH] [--compact]
+
+The default of 100M rows needs about 2.2 GB of disk space.
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from array import array
+from sensors.archive import ColumnStore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BLOCK = 1_000_000
+SENSORS = 1000
+
+def write(store: ColumnStore, rows: int) -> None:
+    """
+    Fill the store with blocks of readings of rotating sensors in time order.
+
+    Args:
+        store (ColumnStore): Store to write to.
+        rows (int): Number of rows to write.
+    """
+    for start in range(0, rows, BLOCK):
+        count = min(BLOCK, rows - start)
+        if np is not None:
+            ts = np.arange(start, start + count, dtype=np.float64)
+            values = 1000.0 + np.sin(ts / 3600.0) * 20.0
+        else:
+            ts = array("d", range(start, start + count))
+            values = array("d", (1000.0 + (i % 40) for i in range(start, start + count)))
+        store.append_many(ts, (start // BLOCK) % SENSORS, "pressure", values)
+    store.flush()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000_000, help="number of rows to write and scan")
+    parser.add_argument("--dir", default=None, help="directory of the store, a temporary one by default")
+    parser.add_argument("--compact", action="store_true", help="also measure compaction")
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix="column_store_")
+    try:
+        store = ColumnStore(directory, buffer_rows=BLOCK)
+        start = time.perf_counter()
+        write(store, args.rows)
+        elapsed = time.perf_counter() - start
+        print(f"write:       {args.rows:>12,} rows in {elapsed:8.2f} s  {args.rows / elapsed:>14,.0f} rows/s")
+
+        start = time.perf_counter()
+        result = store.scan()
+        if np is not None:
+            total = float(np.frombuffer(result.value, dtype=np.float64).sum())
+        else:
+            total = sum(result.value)
+        elapsed = time.perf_counter() - start
+        print(f"full scan:   {len(result):>12,} rows in {elapsed:8.2f} s  {len(result) / elapsed:>14,.0f} rows/s  (sum={total:.6g})")
+
+        window = args.rows // 100
+        start = time.perf_counter()
+        result = store.scan(args.rows / 2, args.rows / 2 + window)
+        elapsed = time.perf_counter() - start
+        print(f"range scan:  {len(result):>12,} rows in {elapsed * 1000:8.3f} ms (zero-copy: {isinstance(result.value, memoryview)})")
+        del result
+
+        if args.compact:
+            start = time.perf_counter()
+            store.compact()
+            elapsed = time.perf_counter() - start
+            print(f"compaction:  {args.rows:>12,} rows in {elapsed:8.2f} s")
+        store.close()
+    finally:
+        if args.dir is None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
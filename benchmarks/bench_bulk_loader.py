@@ -0,0 +1,38 @@
+"""
+Benchmark loading sharded data files with an increasing number of worker processes.
+
+Reports parsed records per second and the speedup over parsing in a single process.
+The speedup is bounded by the number of CPUs of the machine.
+
+Run from the repository root:
+    python -m benchmarks.bench_bulk_loader [--shards 64] [--cities 5000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import tempfile
+import time
+from benchmarks.datagen import write_data_file
+from sensors.bulk_loader import load_shards
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, default=64, help="number of data files")
+    parser.add_argument("--cities", type=int, default=5000, help="cities per data file")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="worker process counts to measure")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [write_data_file(os.path.join(directory, f"shard_{shard}.json"), args.cities, seed=shard) for shard in range(args.shards)]
+        rows = args.shards * args.cities
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"{args.shards} shards x {args.cities:,} cities, {size / 1e6:.1f} MB, {os.cpu_count()} CPUs")
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            load_shards(paths, workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"workers {workers:>3}: {elapsed:7.2f} s  {rows / elapsed:>12,.0f} records/s  speedup {baseline / elapsed:5.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark the compressed series against plain arrays of timestamps and values.
+
+Series of minute-polled readings with millisecond jitter are built for slowly
+changing temperatures, pressures and an incompressible random signal. For each
+it reports the bytes per sample of the compressed series, of two array('d')
+and of a list of (timestamp, value) tuples of Python floats, and the throughput
+of appending, decoding all samples and reading random positions.
+
+Run from the repository root:
+    python -m benchmarks.bench_compressed [--samples 100000]
+"""
+import argparse
+import random
+import sys
+import time
+from array import array
+from typing import Callable, Dict, List, Tuple
+from sensors.compressed import CompressedSeries
+
+def make_samples(kind: str, count: int) -> List[Tuple[float, float]]:
+    """
+    Create minute-polled samples of one kind of signal.
+
+    Args:
+        kind (str): 'temperature', 'pressure' or 'random'.
+        count (int): Number of samples.
+
+    Returns:
+        List[Tuple[float, float]]: The (timestamp, value) samples.
+    """
+    rng = random.Random(0)
+    timestamp, value = 1_700_000_000.0, {"temperature": 7.0, "pressure": 1012.0, "random": 0.0}[kind]
+    samples = []
+    for _ in range(count):
+        timestamp += 60 + rng.choice((0.0, 0.0, 0.0, 0.001, -0.001, 0.003))
+        if kind == "random":
+            value = rng.uniform(-50, 50)
+        elif rng.random() < 0.2:
+            value = round(value + rng.uniform(-0.3, 0.3), 1)
+        samples.append((round(timestamp, 3), value))
+    return samples
+
+def rate(count: int, fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+def bench(samples: List[Tuple[float, float]]) -> Dict[str, float]:
+    """
+    Measure the sizes and throughputs for one series.
+
+    Args:
+        samples (List[Tuple[float, float]]): The samples.
+
+    Returns:
+        Dict[str, float]: The results.
+    """
+    count = len(samples)
+    series = CompressedSeries()
+    results = {"append/s": rate(count, lambda: [series.append(ts, value) for ts, value in samples])}
+    timestamps, values = array("d", (ts for ts, _ in samples)), array("d", (value for _, value in samples))
+    results["compressed B/sample"] = series.bytes_per_sample()
+    results["arrays B/sample"] = (timestamps.itemsize + values.itemsize)
+    results["tuples B/sample"] = (sys.getsizeof(samples) + sum(sys.getsizeof(sample) + sys.getsizeof(sample[0]) + sys.getsizeof(sample[1]) for sample in samples)) / count
+    results["compressed decode/s"] = rate(count, lambda: sum(1 for _ in series))
+    results["arrays decode/s"] = rate(count, lambda: sum(1 for _ in zip(timestamps, values)))
+    rng = random.Random(1)
+    positions = [rng.randrange(count) for _ in range(1000)]
+    results["compressed random reads/s"] = rate(len(positions), lambda: [series[i] for i in positions])
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=100_000, help="number of samples per series")
+    args = parser.parse_args()
+
+    for kind in ("temperature", "pressure", "random"):
+        print(kind)
+        for name, value in bench(make_samples(kind, args.samples)).items():
+            print(f"  {name:<28} {value:>14,.2f}" if "B/sample" in name else f"  {name:<28} {value:>14,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark the JSON decoder backends on OpenWeatherMap payloads and data files.
+
+For every installed backend it reports decoding a current weather response and
+a group response of 20 cities, in full and only their 'main' and 'wind'
+members, and decoding data files of increasing size.
+
+Run from the repository root:
+    python -m benchmarks.bench_decoder [--cities 1000 100000]
+"""
+import argparse
+import json
+import os
+import tempfile
+from benchmarks.datagen import write_data_file
+from benchmarks.stub_server import GROUP_LIMIT, city_payload
+from benchmarks.suite import format_results, measure
+from sensors.decoder import JsonDecoder, available_backends
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cities", type=int, nargs="+", default=[1_000, 100_000], help="numbers of cities of the data files")
+    args = parser.parse_args()
+
+    weather = json.dumps(city_payload(3060972)).encode()
+    group = json.dumps({"cnt": GROUP_LIMIT, "list": [city_payload(city_id) for city_id in range(GROUP_LIMIT)]}).encode()
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        files = {}
+        for cities in args.cities:
+            path = write_data_file(os.path.join(directory, f"data_{cities}.json"), cities)
+            with open(path, "rb") as file:
+                files[cities] = file.read()
+            print(f"{cities:>9,} cities: {len(files[cities]) / 1e6:8.1f} MB data")
+        print(f"weather payload {len(weather):,} bytes, group payload {len(group):,} bytes, backends: {', '.join(available_backends())}")
+
+        for backend in available_backends():
+            decoder = JsonDecoder(backend)
+            results[f"{backend}_weather"] = measure(lambda: decoder.loads(weather), batch_size=1000)
+            results[f"{backend}_group_{GROUP_LIMIT}"] = measure(lambda: decoder.loads(group), batch_size=100)
+            for cities, raw in files.items():
+                results[f"{backend}_file_{cities}"] = measure(lambda: decoder.loads(raw), min_time=0.2, min_samples=3, max_samples=200)
+    print(format_results(results))
+
+if __name__ == "__main__":
+    main()
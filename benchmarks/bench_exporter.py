@@ -0,0 +1,114 @@
+"""
+Benchmark exporting the last data of a large fleet.
+
+The baselines format every sensor on its own and write one line at a time: from
+`get_data()` and `str()`, the way snapshots were exported before, and from a
+dictionary per sensor through csv.DictWriter and json.dumps, which gives the
+same columns as the exporter. The bulk exporter is measured for CSV, NDJSON and
+binary output, all in rows per second.
+
+Run from the repository root:
+    python -m benchmarks.bench_exporter [--sensors 1000000]
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Callable, List
+from sensors.base_sensor import BaseSensor
+from sensors.bulk_loader import METRICS
+from sensors.exporter import export_fleet
+from sensors.station import METRIC_SENSORS
+
+def build_fleet(count: int) -> List[BaseSensor]:
+    """
+    Create sensors of every metric type with random last data, one in 20 without data.
+
+    Args:
+        count (int): Number of sensors.
+
+    Returns:
+        List[BaseSensor]: The fleet.
+    """
+    rng = random.Random(0)
+    classes = list(METRIC_SENSORS.values())
+    fleet = []
+    for sensor_id in range(count):
+        sensor = classes[sensor_id % len(classes)](sensor_id, f"City {sensor_id % 5000}")
+        if rng.random() >= 0.05:
+            if sensor.FILE_KEYS[0] == "wind_speed":
+                sensor.last_data = {"speed": rng.uniform(0, 20), "deg": rng.randrange(360), "gust": rng.uniform(0, 30)}
+            else:
+                sensor.last_data = round(rng.uniform(0, 100), 2)
+        fleet.append(sensor)
+    return fleet
+
+def export_naive(fleet: List[BaseSensor], path: str) -> int:
+    """
+    Write one line per sensor from `get_data()` and `str()`.
+    """
+    with open(path, "w") as file:
+        for sensor in fleet:
+            file.write(f"{sensor.sensor_id},{sensor.get_data()!r},{sensor}\n")
+    return len(fleet)
+
+def row_dict(sensor: BaseSensor) -> dict:
+    """
+    Build the row of a sensor as a dictionary.
+    """
+    row = {"sensor_id": sensor.sensor_id, "location": sensor.location, "type": type(sensor).__name__}
+    row.update({metric: None for metric in METRICS})
+    row.update(sensor.readings())
+    return row
+
+def export_dict_csv(fleet: List[BaseSensor], path: str) -> int:
+    """
+    Write one CSV row per sensor from its dictionary.
+    """
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["sensor_id", "location", "type", *METRICS])
+        writer.writeheader()
+        for sensor in fleet:
+            writer.writerow(row_dict(sensor))
+    return len(fleet)
+
+def export_dict_ndjson(fleet: List[BaseSensor], path: str) -> int:
+    """
+    Write one JSON line per sensor from its dictionary.
+    """
+    with open(path, "w") as file:
+        for sensor in fleet:
+            file.write(json.dumps(row_dict(sensor)) + "\n")
+    return len(fleet)
+
+def timed(fn: Callable[[], int]) -> float:
+    start = time.perf_counter()
+    rows = fn()
+    return rows / (time.perf_counter() - start)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sensors", type=int, default=1_000_000, help="number of sensors")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    fleet = build_fleet(args.sensors)
+    print(f"built {len(fleet):,} sensors in {time.perf_counter() - start:.1f}s")
+    with tempfile.TemporaryDirectory() as directory:
+        results = {
+            "str() lines": timed(lambda: export_naive(fleet, os.path.join(directory, "naive.txt"))),
+            "dict per row csv": timed(lambda: export_dict_csv(fleet, os.path.join(directory, "dict.csv"))),
+            "dict per row ndjson": timed(lambda: export_dict_ndjson(fleet, os.path.join(directory, "dict.ndjson"))),
+        }
+        for name in ("fleet.csv", "fleet.ndjson", "fleet.bin"):
+            path = os.path.join(directory, name)
+            results[name] = timed(lambda: export_fleet(fleet, path))
+            results[name + " size MB"] = os.path.getsize(path) / 1e6
+    for name, value in results.items():
+        print(f"{name:<24} {value:>12,.1f}" if "MB" in name else f"{name:<24} {value:>12,.0f} rows/s")
+
+if __name__ == "__main__":
+    main()
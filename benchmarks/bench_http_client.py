@@ -0,0 +1,49 @@
+"""
+Compare requests/sec of plain requests.get against the pooled HttpClient.
+
+Run from the repository root:
+    python -m benchmarks.bench_http_client [--requests N]
+"""
+import argparse
+import time
+import requests
+from benchmarks.stub_server import StubServer
+from sensors.http_client import HttpClient
+
+def measure(label: str, get, url: str, count: int) -> float:
+    """
+    Issue `count` sequential GET requests and print the achieved rate.
+
+    Args:
+        label (str): Name printed next to the result.
+        get: Function fetching a URL.
+        url (str): URL to fetch.
+        count (int): Number of requests.
+
+    Returns:
+        float: Requests per second.
+    """
+    get(url)
+    start = time.perf_counter()
+    for _ in range(count):
+        get(url)
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed
+    print(f"{label:<28} {rate:>10.0f} req/s")
+    return rate
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000, help="number of requests per client")
+    args = parser.parse_args()
+
+    with StubServer() as server:
+        url = server.url + "/data/2.5/weather"
+        before = measure("requests.get (no session)", lambda u: requests.get(u).json(), url, args.requests)
+        client = HttpClient()
+        after = measure("HttpClient (pooled)", client.get_json, url, args.requests)
+        client.close()
+    print(f"speedup: {after / before:.2f}x")
+
+if __name__ == "__main__":
+    main()
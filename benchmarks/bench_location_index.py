@@ -0,0 +1,43 @@
+"""
+Benchmark looking up one location through the byte-offset index against a full parse.
+
+For every file size it reports the one-off index build, a lookup in a fresh
+process (sidecar load plus one record), a lookup with the index in memory, and
+a full parse of the data file as done without the index.
+
+Run from the repository root:
+    python -m benchmarks.bench_location_index [--cities 1000 100000 1000000]
+"""
+import argparse
+import json
+import os
+import tempfile
+from benchmarks.datagen import write_data_file
+from benchmarks.suite import format_results, measure
+from sensors.location_index import LocationIndex
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cities", type=int, nargs="+", default=[1_000, 100_000], help="numbers of cities of the data files")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for cities in args.cities:
+            path = write_data_file(os.path.join(directory, f"data_{cities}.json"), cities)
+            location = f"City {cities // 2}"
+
+            def full_parse() -> dict:
+                with open(path, "r") as file:
+                    return json.load(file)["city_data"][location]
+
+            index = LocationIndex()
+            results[f"build_{cities}"] = measure(lambda: index.build(path), min_time=0.2, min_samples=3, max_samples=50)
+            results[f"lookup_sidecar_{cities}"] = measure(lambda: LocationIndex().lookup(path, location), min_time=0.2, min_samples=3, max_samples=200)
+            results[f"lookup_indexed_{cities}"] = measure(lambda: index.lookup(path, location), batch_size=100)
+            results[f"full_parse_{cities}"] = measure(full_parse, min_time=0.2, min_samples=3, max_samples=200)
+            print(f"{cities:>9,} cities: {os.path.getsize(path) / 1e6:8.1f} MB data, {os.path.getsize(path + '.idx') / 1e6:8.1f} MB index")
+    print(format_results(results))
+
+if __name__ == "__main__":
+    main()
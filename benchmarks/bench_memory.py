@@ -0,0 +1,95 @@
+"""
+Benchmark the memory used per sensor object.
+
+Builds a fleet of temperature sensors whose location, path and URL strings are
+created at runtime, as they are when sensors come from a configuration file, and
+reports the traced bytes per sensor. The 'before' figure uses a replica of the
+previous layout: a plain class with an instance dictionary holding uninterned
+strings. The 'after' figure uses the current slotted sensors.
+
+Run from the repository root:
+    python -m benchmarks.bench_memory [--sensors N] [--locations N]
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import Any, Callable, List
+from sensors.temperature import TemperatureSensor
+
+class DictSensor:
+    """
+    Replica of the sensor layout before slots, enums and interning.
+    """
+
+    def __init__(self, sensor_id: int, location: str, status: str = "active", source: str = "file", data_file_path: str = "data/data.json", api_url: str = "") -> None:
+        self.sensor_id = sensor_id
+        self.location = location
+        self.status = status
+        self.source = source
+        self.data_file_path = data_file_path
+        self.api_url = api_url
+        self.last_data = None
+        self.history = None
+
+def make_fleet(factory: Callable[..., Any], sensors: int, locations: int) -> List[Any]:
+    """
+    Create sensors spread over a number of locations, with strings built at runtime.
+
+    Args:
+        factory (Callable[..., Any]): Sensor class.
+        sensors (int): Number of sensors.
+        locations (int): Number of distinct locations.
+
+    Returns:
+        List[Any]: The sensors.
+    """
+    fleet = []
+    for i in range(sensors):
+        city = i % locations
+        fleet.append(factory(
+            i,
+            f"City {city}",
+            "".join(["act", "ive"]),
+            "".join(["fi", "le"]),
+            "/".join(["data", "data.json"]),
+            f"https://api.openweathermap.org/data/2.5/weather?q=City%20{city}",
+        ))
+    return fleet
+
+def bytes_per_sensor(factory: Callable[..., Any], sensors: int, locations: int) -> float:
+    """
+    Measure the traced memory of a fleet divided by its size.
+
+    Args:
+        factory (Callable[..., Any]): Sensor class.
+        sensors (int): Number of sensors.
+        locations (int): Number of distinct locations.
+
+    Returns:
+        float: Bytes allocated per sensor, including its strings and its slot in the fleet list.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fleet = make_fleet(factory, sensors, locations)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del fleet
+    return current / sensors
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sensors", type=int, default=1_000_000, help="number of sensors")
+    parser.add_argument("--locations", type=int, default=1000, help="number of distinct locations")
+    args = parser.parse_args()
+
+    before = bytes_per_sensor(DictSensor, args.sensors, args.locations)
+    after = bytes_per_sensor(TemperatureSensor, args.sensors, args.locations)
+    print(f"sensors:   {args.sensors:>12,} over {args.locations:,} locations")
+    print(f"before:    {before:>12.1f} bytes/sensor  (__dict__, uninterned strings)")
+    print(f"after:     {after:>12.1f} bytes/sensor  (__slots__, enums, interned strings)")
+    print(f"reduction: {1 - after / before:>12.1%}")
+
+if __name__ == "__main__":
+    main()
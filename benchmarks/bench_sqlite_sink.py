@@ -0,0 +1,75 @@
+"""
+Benchmark persisting readings to SQLite row by row versus through the write-behind sink.
+
+The row-by-row baseline inserts and commits every reading on the caller's
+thread with the default rollback journal. The sink reports how long the caller
+spends queueing the readings and the end-to-end rate including the final flush.
+
+Run from the repository root:
+    python -m benchmarks.bench_sqlite_sink [--rows 100000]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from sensors.sqlite_sink import INSERT, SCHEMA, SqliteSink
+
+def bench_row_by_row(path: str, rows: int) -> float:
+    """
+    Insert and commit readings one at a time.
+
+    Args:
+        path (str): Path to the database file.
+        rows (int): Number of readings.
+
+    Returns:
+        float: Seconds taken.
+    """
+    connection = sqlite3.connect(path)
+    for statement in SCHEMA:
+        connection.execute(statement)
+    start = time.perf_counter()
+    for i in range(rows):
+        connection.execute(INSERT, (i % 100, "Nitra", "temp", float(i), 20.5))
+        connection.commit()
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return elapsed
+
+def bench_sink(path: str, rows: int, batch_size: int) -> tuple:
+    """
+    Queue readings on the sink and flush them.
+
+    Args:
+        path (str): Path to the database file.
+        rows (int): Number of readings.
+        batch_size (int): Rows per transaction.
+
+    Returns:
+        tuple: Seconds spent queueing and seconds until every reading was committed.
+    """
+    with SqliteSink(path, batch_size=batch_size, max_queue=rows + 1) as sink:
+        start = time.perf_counter()
+        for i in range(rows):
+            sink.add(i % 100, "Nitra", "temp", float(i), 20.5)
+        queued = time.perf_counter() - start
+        sink.flush()
+        committed = time.perf_counter() - start
+    return queued, committed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="number of readings")
+    parser.add_argument("--baseline-rows", type=int, default=2_000, help="number of readings for the row-by-row baseline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        elapsed = bench_row_by_row(os.path.join(directory, "baseline.db"), args.baseline_rows)
+        print(f"{'row by row':<24} {args.baseline_rows / elapsed:>12,.0f} rows/s")
+        for batch_size in (100, 1000, 10_000):
+            queued, committed = bench_sink(os.path.join(directory, f"sink_{batch_size}.db"), args.rows, batch_size)
+            print(f"{f'sink batch {batch_size}':<24} {args.rows / committed:>12,.0f} rows/s   caller {queued / args.rows * 1e6:.2f} us/row")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import json
+import random
+from typing import Dict
+
+def make_city_data(cities: int, seed: int = 0) -> Dict[str, dict]:
+    """
+    Generate a realistic 'city_data' object with the keys of data/data.json.
+
+    Args:
+        cities (int): Number of locations.
+        seed (int): Seed of the random generator. Default is 0.
+
+    Returns:
+        Dict[str, dict]: Records keyed by location name ('City 0', 'City 1', ...).
+    """
+    rng = random.Random(seed)
+    return {
+        f"City {i}": {
+            "temp": round(rng.uniform(-15, 35), 1),
+            "humidity": rng.randint(10, 100),
+            "pressure": rng.randint(960, 1050),
+            "wind_speed": round(rng.uniform(0, 20), 1),
+            "wind_deg": rng.randint(0, 360),
+            "wind_gust": round(rng.uniform(0, 30), 2),
+            "rainfall": rng.randint(0, 100),
+        }
+        for i in range(cities)
+    }
+
+def write_data_file(path: str, cities: int, seed: int = 0) -> str:
+    """
+    Write a data file shaped like data/data.json.
+
+    Args:
+        path (str): Path of the file to write.
+        cities (int): Number of locations.
+        seed (int): Seed of the random generator. Default is 0.
+
+    Returns:
+        str: The path of the written file.
+    """
+    with open(path, "w") as file:
+        json.dump({"city_data": make_city_data(cities, seed)}, file, indent=2)
+    return path
@@ -0,0 +1,117 @@
+import copy
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+OWM_PAYLOAD = {
+    "coord": {"lon": 19.2960, "lat": 49.2127},
+    "weather": [{"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04d"}],
+    "base": "stations",
+    "main": {"temp": 4.2, "feels_like": 1.9, "temp_min": 3.1, "temp_max": 5.0, "pressure": 1021, "humidity": 81, "sea_level": 1021, "grnd_level": 961},
+    "visibility": 10000,
+    "wind": {"speed": 2.1, "deg": 250, "gust": 3.4},
+    "clouds": {"all": 75},
+    "dt": 1734345600,
+    "sys": {"type": 2, "id": 2036127, "country": "SK", "sunrise": 1734330000, "sunset": 1734360000},
+    "timezone": 3600,
+    "id": 3060835,
+    "name": "Dolny Kubin",
+    "cod": 200,
+}
+
+GROUP_LIMIT = 20
+UNKNOWN_CITY_IDS = 100_000_000
+
+def city_payload(city_id: int) -> Dict[str, Any]:
+    """
+    Build the deterministic current weather of a city as returned by the stub.
+
+    Args:
+        city_id (int): OpenWeatherMap city ID.
+
+    Returns:
+        Dict[str, Any]: The OWM_PAYLOAD with the city's ID and a temperature derived from it.
+    """
+    payload = copy.deepcopy(OWM_PAYLOAD)
+    payload["id"] = city_id
+    payload["name"] = f"City {city_id}"
+    payload["main"]["temp"] = round(city_id % 400 / 10, 1)
+    return payload
+
+class StubServer:
+    """
+    Local HTTP/1.1 server emulating the OpenWeatherMap current weather endpoint.
+
+    Requests to a path ending in '/group' emulate the group endpoint: the
+    comma-separated 'id' parameter selects up to GROUP_LIMIT cities, answered as
+    `{"cnt": n, "list": [...]}` with `city_payload` of every ID. IDs from
+    UNKNOWN_CITY_IDS on are unknown and left out of the list, as OpenWeatherMap does.
+
+    Attributes:
+        url (str): Base URL of the running server.
+        latency (float): Seconds every response is delayed by.
+        requests (int): Number of requests served.
+    """
+
+    def __init__(self, payload: Any = OWM_PAYLOAD, latency: float = 0.0) -> None:
+        """
+        Start the server on a free local port.
+
+        Args:
+            payload (Any): JSON payload returned for every request. Default is a realistic OpenWeatherMap response.
+            latency (float): Seconds every response is delayed by. Default is 0.
+        """
+        self.latency = latency
+        self.requests = 0
+        body = json.dumps(payload).encode()
+        stub = self
+        lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                with lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                status, response = 200, body
+                url = urlsplit(self.path)
+                if url.path.endswith("/group"):
+                    ids = [int(city_id) for city_id in parse_qs(url.query).get("id", [""])[0].split(",") if city_id]
+                    if not ids or len(ids) > GROUP_LIMIT:
+                        status, response = 400, json.dumps({"cod": "400", "message": "too many or no city IDs"}).encode()
+                    else:
+                        cities = [city_payload(city_id) for city_id in ids if city_id < UNKNOWN_CITY_IDS]
+                        response = json.dumps({"cnt": len(cities), "list": cities}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def close(self) -> None:
+        """
+        Stop the server.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,305 @@
+"""
+Reproducible benchmark suite for the sensor read paths.
+
+Measures throughput and p50/p95/p99 latency of the file source (data files of
+3 to 100k cities, cold and cached), the API source (against a local stub
+server with injected latency) and the conversion helpers. Results are written
+to bench_output.txt and bench_results.json and compared to a stored baseline.
+
+The whole suite runs several times and every case reports the median of its
+per-run p50 latencies together with their spread, so one noisy run does not
+decide the result. A case fails the run only if it is slower than the baseline
+by more than the tolerance and by more than the noise of both measurements
+(the larger spread, at least --min-delta microseconds).
+
+Run from the repository root:
+    python -m benchmarks.suite [--quick] [--repeat 3] [--update-baseline] [--tolerance 0.5]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+from benchmarks.datagen import write_data_file
+from benchmarks.stub_server import StubServer
+from sensors import batch
+from sensors.api_cache import ResponseCache, response_cache
+from sensors.file_cache import file_cache
+from sensors.humidity import HumiditySensor
+from sensors.pressure import PressureSensor
+from sensors.temperature import TemperatureSensor
+from sensors.wind import WindSensor
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+FILE_SIZES = (3, 1_000, 10_000, 100_000)
+QUICK_FILE_SIZES = (3, 1_000, 10_000)
+API_LATENCIES = (0.0, 0.005)
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """
+    Get a percentile of sorted samples by linear interpolation.
+
+    Args:
+        sorted_values (List[float]): Samples in ascending order.
+        q (float): Percentile between 0 and 100.
+
+    Returns:
+        float: The percentile.
+    """
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def measure(fn: Callable[[], object], min_time: float = 0.5, min_samples: int = 20, max_samples: int = 100_000, batch_size: int = 1, setup: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    """
+    Time repeated calls of a function.
+
+    Every sample times `batch_size` consecutive calls, so functions much faster
+    than the timer resolution are measured per call without timer overhead.
+
+    Args:
+        fn (Callable[[], object]): Function to measure.
+        min_time (float): Minimum total seconds spent measuring. Default is 0.5.
+        min_samples (int): Minimum number of samples. Default is 20.
+        max_samples (int): Maximum number of samples. Default is 100000.
+        batch_size (int): Number of calls per sample. Default is 1.
+        setup (Optional[Callable[[], None]]): Called before every sample and not timed.
+
+    Returns:
+        Dict[str, float]: Throughput in ops/s and p50/p95/p99 latency per call in microseconds.
+    """
+    fn()
+    samples = []
+    total = 0.0
+    perf_counter = time.perf_counter
+    while (total < min_time or len(samples) < min_samples) and len(samples) < max_samples:
+        if setup is not None:
+            setup()
+        start = perf_counter()
+        for _ in range(batch_size):
+            fn()
+        elapsed = perf_counter() - start
+        samples.append(elapsed / batch_size)
+        total += elapsed
+    samples.sort()
+    return {
+        "ops_per_sec": len(samples) * batch_size / total,
+        "p50_us": percentile(samples, 50) * 1e6,
+        "p95_us": percentile(samples, 95) * 1e6,
+        "p99_us": percentile(samples, 99) * 1e6,
+        "samples": len(samples),
+    }
+
+def bench_file_source(directory: str, sizes: tuple) -> Dict[str, Dict[str, float]]:
+    """
+    Measure reads from data files of increasing size, parsing every time and from the cache.
+
+    Args:
+        directory (str): Directory for the generated data files.
+        sizes (tuple): Numbers of cities of the data files.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Results keyed by case name.
+    """
+    results = {}
+    for cities in sizes:
+        path = write_data_file(os.path.join(directory, f"data_{cities}.json"), cities)
+        sensor = TemperatureSensor(0, f"City {cities // 2}", source="file", data_file_path=path)
+        results[f"file_cold_{cities}"] = measure(sensor.read_data, setup=file_cache.clear, max_samples=2_000)
+        results[f"file_cached_{cities}"] = measure(sensor.read_data, batch_size=100)
+    file_cache.clear()
+    return results
+
+def bench_api_source(latencies: tuple) -> Dict[str, Dict[str, float]]:
+    """
+    Measure API reads against the local stub server, without response caching.
+
+    Args:
+        latencies (tuple): Injected server latencies in seconds.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Results keyed by case name.
+    """
+    results = {}
+    for latency in latencies:
+        with StubServer(latency=latency) as server:
+            sensor = HumiditySensor(0, "Dolny Kubin", source="api", api_url=server.url + "/data/2.5/weather")
+            results[f"api_latency_{int(latency * 1000)}ms"] = measure(lambda: (response_cache.clear(), sensor.read_data()), max_samples=2_000)
+    shared = ResponseCache(ttl=60.0)
+    with StubServer() as server:
+        url = server.url + "/data/2.5/weather"
+        results["api_cached"] = measure(lambda: shared.get(url), batch_size=100)
+    return results
+
+def make_fleet(values: List[float]) -> List[TemperatureSensor]:
+    """
+    Create temperature sensors holding the given values.
+
+    Args:
+        values (List[float]): Last data of every sensor.
+
+    Returns:
+        List[TemperatureSensor]: The sensors.
+    """
+    fleet = []
+    for i, value in enumerate(values):
+        sensor = TemperatureSensor(i, "City")
+        sensor.last_data = value
+        fleet.append(sensor)
+    return fleet
+
+def bench_conversions() -> Dict[str, Dict[str, float]]:
+    """
+    Measure the per-sensor conversion helpers and their batch counterparts.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Results keyed by case name.
+    """
+    temperature = TemperatureSensor(0, "City")
+    temperature.last_data = 7.3
+    pressure = PressureSensor(1, "City")
+    pressure.last_data = 1012
+    wind = WindSensor(2, "City")
+    wind.last_data = {"speed": 3.5, "deg": 42, "gust": 2.54}
+    humidity = HumiditySensor(3, "City")
+    humidity.last_data = 60
+    results = {
+        "convert_to_fahrenheit": measure(temperature.convert_to_fahrenheit, batch_size=1000),
+        "convert_to_psi": measure(pressure.convert_to_psi, batch_size=1000),
+        "convert_speed_to_kmh": measure(wind.convert_speed_to_kmh, batch_size=1000),
+        "is_humid": measure(humidity.is_humid, batch_size=1000),
+    }
+    values = [float(i % 60) for i in range(10_000)]
+    results["batch_fahrenheit_10k_python"] = measure(lambda: batch.to_fahrenheit(values, use_numpy=False))
+    if batch.HAS_NUMPY:
+        values_array = batch.fleet_values(make_fleet(values), use_numpy=True)
+        results["batch_fahrenheit_10k_numpy"] = measure(lambda: batch.to_fahrenheit(values_array, use_numpy=True), batch_size=10)
+    return results
+
+def run_suite(sizes: tuple) -> Dict[str, Dict[str, float]]:
+    """
+    Run every benchmark case once.
+
+    Args:
+        sizes (tuple): Numbers of cities of the data files.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Results keyed by case name.
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        results.update(bench_file_source(directory, sizes))
+    results.update(bench_api_source(API_LATENCIES))
+    results.update(bench_conversions())
+    return results
+
+def combine_runs(runs: List[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
+    """
+    Combine repeated runs into one result per case.
+
+    Every statistic is the median over the runs, and 'p50_spread_us' is the
+    difference between the slowest and the fastest p50, the run-to-run noise of the case.
+
+    Args:
+        runs (List[Dict[str, Dict[str, float]]]): Results of every run.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Combined results keyed by case name.
+    """
+    combined = {}
+    for name in runs[0]:
+        cases = [run[name] for run in runs if name in run]
+        result = {key: statistics.median(case[key] for case in cases) for key in ("ops_per_sec", "p50_us", "p95_us", "p99_us")}
+        result["p50_spread_us"] = max(case["p50_us"] for case in cases) - min(case["p50_us"] for case in cases)
+        result["samples"] = sum(case["samples"] for case in cases)
+        result["runs"] = len(cases)
+        combined[name] = result
+    return combined
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float, min_delta_us: float = 0.0) -> List[str]:
+    """
+    Find cases whose median latency regressed against the baseline beyond the noise.
+
+    A case regresses if its p50 exceeds the baseline p50 by more than `tolerance`
+    and the slowdown is also larger than the run-to-run spread of both the
+    baseline and the current result, and than `min_delta_us`.
+
+    Args:
+        results (Dict[str, Dict[str, float]]): Current results.
+        baseline (Dict[str, Dict[str, float]]): Baseline results.
+        tolerance (float): Allowed relative slowdown, e.g. 0.5 for 50%.
+        min_delta_us (float): Slowdown in microseconds always treated as noise. Default is 0.
+
+    Returns:
+        List[str]: Description of every regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        ratio = result["p50_us"] / reference["p50_us"]
+        delta = result["p50_us"] - reference["p50_us"]
+        noise = max(result.get("p50_spread_us", 0.0), reference.get("p50_spread_us", 0.0), min_delta_us)
+        if ratio > 1 + tolerance and delta > noise:
+            regressions.append(f"{name}: p50 {result['p50_us']:.2f} us vs baseline {reference['p50_us']:.2f} us ({ratio:.2f}x, noise {noise:.2f} us)")
+    return regressions
+
+def format_results(results: Dict[str, Dict[str, float]]) -> str:
+    """
+    Format results as an aligned text table.
+
+    Args:
+        results (Dict[str, Dict[str, float]]): Results keyed by case name.
+
+    Returns:
+        str: The table.
+    """
+    lines = [f"{'case':<32} {'ops/s':>14} {'p50 us':>12} {'p95 us':>12} {'p99 us':>12}"]
+    for name, result in results.items():
+        lines.append(f"{name:<32} {result['ops_per_sec']:>14,.0f} {result['p50_us']:>12.2f} {result['p95_us']:>12.2f} {result['p99_us']:>12.2f}")
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="skip the 100k-city data file")
+    parser.add_argument("--output", default="bench_output.txt", help="text report path")
+    parser.add_argument("--json", default="bench_results.json", help="machine-readable results path")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline results to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative p50 slowdown")
+    parser.add_argument("--min-delta", type=float, default=0.25, help="p50 slowdown in microseconds always treated as noise")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs of the whole suite")
+    args = parser.parse_args(argv)
+
+    sizes = QUICK_FILE_SIZES if args.quick else FILE_SIZES
+    results = combine_runs([run_suite(sizes) for _ in range(max(args.repeat, 1))])
+
+    report = format_results(results)
+    environment = {"python": sys.version.split()[0], "platform": platform.platform(), "numpy": batch.HAS_NUMPY}
+    with open(args.json, "w") as file:
+        json.dump({"environment": environment, "results": results}, file, indent=2)
+
+    regressions: List[str] = []
+    if args.update_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump({"environment": environment, "results": results}, file, indent=2)
+        report += f"\n\nbaseline updated: {args.baseline}"
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r") as file:
+            regressions = compare(results, json.load(file)["results"], args.tolerance, args.min_delta)
+        report += "\n\n" + ("\n".join(f"REGRESSION {line}" for line in regressions) if regressions else f"no regressions beyond {args.tolerance:.0%} of the baseline")
+    with open(args.output, "w") as file:
+        file.write(report + "\n")
+    print(report)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
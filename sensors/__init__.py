@@ -1,6 +1,63 @@
-from .base_sensor import BaseSensor
+import importlib
+from typing import Any, Dict, List, Tuple
+from .base_sensor import BaseSensor, Source, Status
 from .temperature import TemperatureSensor
 from .humidity import HumiditySensor
 from .pressure import PressureSensor
 from .wind import WindSensor
-from .rainfall import RainfallSensor
\ No newline at end of file
+from .rainfall import RainfallSensor
+from .decoder import JsonDecoder, get_decoder, set_decoder
+from .file_cache import FileCache, file_cache
+from .location_index import LocationIndex, location_index
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .api_cache import ResponseCache, response_cache
+from .http_client import HttpClient, get_http_client, set_http_client
+from .history import RollingWindow, ReadingHistory, MultiChannelHistory
+from .stream import StreamIndex, iter_observations, latest_observation, stream_index, tail_observations
+from .metrics import MetricsRegistry, Histogram, registry as metrics_registry, start_metrics_server
+
+# Names importing a module the sensors themselves do not need, like asyncio,
+# sqlite3, ctypes or multiprocessing, are only imported on first access.
+_LAZY_MODULES: Dict[str, Tuple[str, ...]] = {
+    "fleet": ("FleetResult", "read_fleet"),
+    "station": ("Station",),
+    "compressed": ("CompressedSeries", "CompressedStore"),
+    "archive": ("ColumnStore", "ScanResult"),
+    "scheduler": ("PollingScheduler", "ScheduledSensor"),
+    "watcher": ("FileWatcher",),
+    "group_api": ("GroupBatcher",),
+    "bulk_loader": ("FleetSnapshot", "load_shards"),
+    "rollup": ("Rollup", "RollupEngine"),
+    "registry": ("SensorRegistry", "build_fleet", "load_fleet"),
+    "anomaly": ("Anomaly", "AnomalyMonitor", "Detector", "EwmaDetector", "FlatlineDetector", "RateOfChangeDetector", "Reason"),
+    "sqlite_sink": ("SqliteSink",),
+    "exporter": ("export_fleet", "iter_rows", "read_binary"),
+}
+_LAZY: Dict[str, str] = {name: module for module, names in _LAZY_MODULES.items() for name in names}
+
+__all__ = [
+    "BaseSensor", "Source", "Status",
+    "TemperatureSensor", "HumiditySensor", "PressureSensor", "WindSensor", "RainfallSensor",
+    "JsonDecoder", "get_decoder", "set_decoder",
+    "FileCache", "file_cache", "LocationIndex", "location_index",
+    "CircuitBreaker", "CircuitOpenError", "ResponseCache", "response_cache",
+    "HttpClient", "get_http_client", "set_http_client",
+    "RollingWindow", "ReadingHistory", "MultiChannelHistory",
+    "StreamIndex", "iter_observations", "latest_observation", "stream_index", "tail_observations",
+    "MetricsRegistry", "Histogram", "metrics_registry", "start_metrics_server",
+    *_LAZY,
+]
+
+def __getattr__(name: str) -> Any:
+    """
+    Import the module of a lazily exported name on its first use and cache the name in the package.
+    """
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,357 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+from sensors.base_sensor import BaseSensor
+from sensors.enums import _StrEnum
+
+DEFAULT_RATE_LIMITS: Dict[str, float] = {"temp": 10.0, "humidity": 50.0, "pressure": 10.0}
+FLATLINE_METRICS = ("temp", "humidity", "pressure")
+
+class Reason(_StrEnum):
+    """
+    Reason code of an anomalous reading.
+    """
+
+    SPIKE = "spike"
+    FLATLINE = "flatline"
+    RATE_OF_CHANGE = "rate_of_change"
+
+
+class Anomaly:
+    """
+    A reading flagged by a detector.
+
+    Attributes:
+        key (Hashable): Identifier of the sensor, its sensor_id for sensors.
+        metric (str): Name of the metric, e.g. 'pressure'.
+        timestamp (float): Time of the reading as a Unix timestamp.
+        value (float): The flagged reading.
+        reason (Reason): Which detector flagged it.
+        score (float): The z-score, the seconds the value has not changed, or the rate of change per hour.
+    """
+
+    __slots__ = ("key", "metric", "timestamp", "value", "reason", "score")
+
+    def __init__(self, key: Hashable, metric: str, timestamp: float, value: float, reason: Reason, score: float) -> None:
+        self.key = key
+        self.metric = metric
+        self.timestamp = timestamp
+        self.value = value
+        self.reason = reason
+        self.score = score
+
+    def __repr__(self) -> str:
+        return f"Anomaly(key={self.key!r}, metric={self.metric!r}, timestamp={self.timestamp!r}, value={self.value!r}, reason={self.reason.value!r}, score={self.score:.3g})"
+
+
+class Detector(ABC):
+    """
+    Abstract base class of the streaming detectors: the metrics they watch and a small state per (key, metric) series.
+    """
+
+    def __init__(self, metrics: Optional[Iterable[str]]) -> None:
+        self.metrics = None if metrics is None else frozenset(metrics)
+        self._state: Dict[Tuple[Hashable, str], list] = {}
+
+    def watches(self, metric: str) -> bool:
+        """
+        Check if the detector evaluates a metric.
+
+        Args:
+            metric (str): Name of the metric.
+
+        Returns:
+            bool: True if the detector watches the metric.
+        """
+        return self.metrics is None or metric in self.metrics
+
+    @abstractmethod
+    def update(self, key: Hashable, metric: str, timestamp: float, value: float) -> Optional[Anomaly]:
+        """
+        Evaluate one reading and fold it into the state of its series.
+
+        Args:
+            key (Hashable): Identifier of the sensor.
+            metric (str): Name of the metric.
+            timestamp (float): Time of the reading as a Unix timestamp.
+            value (float): The reading.
+
+        Returns:
+            Optional[Anomaly]: The anomaly, None if the reading is normal.
+        """
+        pass
+
+    def reset(self, key: Optional[Hashable] = None) -> None:
+        """
+        Forget the state of one sensor, or of all sensors.
+
+        Args:
+            key (Optional[Hashable]): Identifier of the sensor. Default is all sensors.
+        """
+        if key is None:
+            self._state.clear()
+        else:
+            for series in [series for series in self._state if series[0] == key]:
+                del self._state[series]
+
+
+class EwmaDetector(Detector):
+    """
+    Flags spikes: readings more than `threshold` standard deviations from the exponentially weighted mean.
+
+    The mean and variance are exponentially weighted moving averages, so the
+    state of a series is two floats and a count regardless of its length, and
+    the baseline follows slow drifts and level shifts.
+
+    Attributes:
+        alpha (float): Weight of the newest reading in the moving averages.
+        threshold (float): Absolute z-score above which a reading is a spike.
+        warmup (int): Number of readings of a series before it is evaluated.
+        min_std (float): Lower bound of the standard deviation, so a very steady series is not flagged for tiny changes.
+    """
+
+    def __init__(self, alpha: float = 0.1, threshold: float = 4.0, warmup: int = 10, min_std: float = 0.1, metrics: Optional[Iterable[str]] = None) -> None:
+        """
+        Initialize the detector.
+
+        Args:
+            alpha (float): Weight of the newest reading in the moving averages. Default is 0.1.
+            threshold (float): Absolute z-score above which a reading is a spike. Default is 4.
+            warmup (int): Number of readings of a series before it is evaluated. Default is 10.
+            min_std (float): Lower bound of the standard deviation. Default is 0.1.
+            metrics (Optional[Iterable[str]]): Metrics to watch. Default is all.
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        super().__init__(metrics)
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.min_std = min_std
+
+    def update(self, key: Hashable, metric: str, timestamp: float, value: float) -> Optional[Anomaly]:
+        state = self._state.get((key, metric))
+        if state is None:
+            self._state[(key, metric)] = [value, 0.0, 1]
+            return None
+        mean, variance, count = state
+        anomaly = None
+        if count >= self.warmup:
+            z = (value - mean) / max(math.sqrt(variance), self.min_std)
+            if abs(z) > self.threshold:
+                anomaly = Anomaly(key, metric, timestamp, value, Reason.SPIKE, z)
+        diff = value - mean
+        increment = self.alpha * diff
+        state[0] = mean + increment
+        state[1] = (1 - self.alpha) * (variance + diff * increment)
+        state[2] = count + 1
+        return anomaly
+
+
+class FlatlineDetector(Detector):
+    """
+    Flags stuck sensors: readings that stayed within `tolerance` of each other for at least `min_duration` seconds.
+
+    The run is measured in time rather than in readings, so reading an unchanged
+    file or a cached API payload many times in a row is not a flatline; the
+    value must also not change over a long enough period, with at least
+    `min_run` readings in it. Every reading of a run from then on is flagged.
+    Only metrics that normally vary are watched by default; rainfall is
+    legitimately 0 for days.
+
+    Attributes:
+        min_duration (float): Seconds without a change that count as a flatline.
+        min_run (int): Smallest number of readings of a flatline.
+        tolerance (float): Largest change still considered identical.
+    """
+
+    def __init__(self, min_duration: float = 3 * 3600.0, min_run: int = 3, tolerance: float = 0.0, metrics: Optional[Iterable[str]] = FLATLINE_METRICS) -> None:
+        """
+        Initialize the detector.
+
+        Args:
+            min_duration (float): Seconds without a change that count as a flatline. Default is 3 hours.
+            min_run (int): Smallest number of readings of a flatline. Default is 3.
+            tolerance (float): Largest change still considered identical. Default is 0.
+            metrics (Optional[Iterable[str]]): Metrics to watch, None for all. Default is FLATLINE_METRICS.
+        """
+        if min_run < 2:
+            raise ValueError("min_run must be at least 2")
+        if min_duration <= 0:
+            raise ValueError("min_duration must be positive")
+        super().__init__(metrics)
+        self.min_duration = min_duration
+        self.min_run = min_run
+        self.tolerance = tolerance
+
+    def update(self, key: Hashable, metric: str, timestamp: float, value: float) -> Optional[Anomaly]:
+        state = self._state.get((key, metric))
+        if state is None or abs(value - state[0]) > self.tolerance:
+            self._state[(key, metric)] = [value, timestamp, 1]
+            return None
+        state[2] += 1
+        duration = timestamp - state[1]
+        if duration >= self.min_duration and state[2] >= self.min_run:
+            return Anomaly(key, metric, timestamp, value, Reason.FLATLINE, duration)
+        return None
+
+
+class RateOfChangeDetector(Detector):
+    """
+    Flags jumps: readings that changed faster than a per-metric limit since the previous reading.
+
+    Limits are given per hour. Readings closer together than `min_interval`
+    seconds are treated as `min_interval` apart, so sampling jitter on fast
+    polls does not inflate the rate.
+
+    Attributes:
+        limits (Dict[str, float]): Largest normal change per hour of every watched metric.
+        min_interval (float): Smallest time between readings used to compute a rate, in seconds.
+    """
+
+    def __init__(self, limits: Mapping[str, float] = DEFAULT_RATE_LIMITS, min_interval: float = 60.0) -> None:
+        """
+        Initialize the detector.
+
+        Args:
+            limits (Mapping[str, float]): Largest normal change per hour of every watched metric. Default is DEFAULT_RATE_LIMITS.
+            min_interval (float): Smallest time between readings used to compute a rate, in seconds. Default is 60.
+        """
+        if min_interval <= 0:
+            raise ValueError("min_interval must be positive")
+        super().__init__(limits)
+        self.limits = dict(limits)
+        self.min_interval = min_interval
+
+    def update(self, key: Hashable, metric: str, timestamp: float, value: float) -> Optional[Anomaly]:
+        state = self._state.get((key, metric))
+        if state is None:
+            self._state[(key, metric)] = [timestamp, value]
+            return None
+        previous_timestamp, previous_value = state
+        state[0] = timestamp
+        state[1] = value
+        rate = abs(value - previous_value) * 3600.0 / max(timestamp - previous_timestamp, self.min_interval)
+        if rate > self.limits[metric]:
+            return Anomaly(key, metric, timestamp, value, Reason.RATE_OF_CHANGE, rate)
+        return None
+
+
+class AnomalyMonitor:
+    """
+    Runs streaming detectors on sensor readings.
+
+    Every detector keeps a constant-size state per (sensor, metric) series and
+    evaluates a reading in O(1), so history is never reloaded. Sensors can be
+    attached, after which every successful read (including reads pushed by the
+    file watcher, group batcher or bulk snapshot) is evaluated automatically,
+    or the latest readings of a whole fleet can be evaluated at once with
+    `evaluate`.
+
+    Attributes:
+        detectors (List[Detector]): The detectors run on every reading.
+        on_anomaly (Optional[Callable[[Anomaly], None]]): Called with every anomaly found.
+        counts (Dict[Reason, int]): Number of anomalies found per reason.
+    """
+
+    def __init__(self, detectors: Optional[Iterable[Detector]] = None, on_anomaly: Optional[Callable[[Anomaly], None]] = None) -> None:
+        """
+        Initialize the monitor.
+
+        Args:
+            detectors (Optional[Iterable[Detector]]): Detectors to run. Default is an EWMA, a flatline and a rate-of-change detector with their defaults.
+            on_anomaly (Optional[Callable[[Anomaly], None]]): Called with every anomaly found.
+        """
+        self.detectors = [EwmaDetector(), FlatlineDetector(), RateOfChangeDetector()] if detectors is None else list(detectors)
+        self.on_anomaly = on_anomaly
+        self.counts: Dict[Reason, int] = {reason: 0 for reason in Reason}
+        self._lock = threading.Lock()
+
+    def update(self, key: Hashable, metric: str, timestamp: float, value: Any) -> List[Anomaly]:
+        """
+        Evaluate one reading with every detector watching its metric.
+
+        Args:
+            key (Hashable): Identifier of the sensor.
+            metric (str): Name of the metric.
+            timestamp (float): Time of the reading as a Unix timestamp.
+            value (Any): The reading; missing and non-numeric values are ignored.
+
+        Returns:
+            List[Anomaly]: The anomalies found, empty if the reading is normal.
+        """
+        if value is None or isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+            return []
+        anomalies = []
+        with self._lock:
+            for detector in self.detectors:
+                if detector.watches(metric):
+                    anomaly = detector.update(key, metric, timestamp, value)
+                    if anomaly is not None:
+                        anomalies.append(anomaly)
+                        self.counts[anomaly.reason] += 1
+        if self.on_anomaly is not None:
+            for anomaly in anomalies:
+                self.on_anomaly(anomaly)
+        return anomalies
+
+    def observe(self, sensor: BaseSensor, timestamp: Optional[float] = None) -> List[Anomaly]:
+        """
+        Evaluate the last data of a sensor, keyed by its sensor_id.
+
+        Args:
+            sensor (BaseSensor): Sensor of any type, including stations.
+            timestamp (Optional[float]): Time of the reading. Default is now.
+
+        Returns:
+            List[Anomaly]: The anomalies found in any of the sensor's metrics.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        return [anomaly for metric, value in sensor.readings() for anomaly in self.update(sensor.sensor_id, metric, timestamp, value)]
+
+    def evaluate(self, sensors: Iterable[BaseSensor], timestamp: Optional[float] = None) -> List[Anomaly]:
+        """
+        Evaluate the latest readings of a whole fleet at once, e.g. after read_fleet or a bulk snapshot.
+
+        Args:
+            sensors (Iterable[BaseSensor]): Sensors of any type.
+            timestamp (Optional[float]): Time of the readings. Default is now.
+
+        Returns:
+            List[Anomaly]: The anomalies found, in the order of `sensors`.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        return [anomaly for sensor in sensors for anomaly in self.observe(sensor, timestamp)]
+
+    def attach(self, sensor: BaseSensor) -> None:
+        """
+        Evaluate every future reading of a sensor automatically.
+
+        Args:
+            sensor (BaseSensor): Sensor of any type, including stations.
+        """
+        sensor.monitor = self
+
+    def detach(self, sensor: BaseSensor) -> None:
+        """
+        Stop evaluating the readings of a sensor and forget its state.
+
+        Args:
+            sensor (BaseSensor): An attached sensor.
+        """
+        if sensor.monitor is self:
+            sensor.monitor = None
+        self.reset(sensor.sensor_id)
+
+    def reset(self, key: Optional[Hashable] = None) -> None:
+        """
+        Forget the state of one sensor, or of all sensors.
+
+        Args:
+            key (Optional[Hashable]): Identifier of the sensor. Default is all sensors.
+        """
+        with self._lock:
+            for detector in self.detectors:
+                detector.reset(key)
@@ -0,0 +1,269 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from sensors.circuit_breaker import CircuitBreaker, CircuitOpenError, State, endpoint_of, is_outage
+from sensors.http_client import get_http_client
+
+def fetch_json(url: str) -> Any:
+    """
+    Fetch a URL through the shared HTTP client and decode its JSON body.
+
+    Args:
+        url (str): URL to fetch.
+
+    Returns:
+        Any: The decoded JSON payload.
+
+    Raises:
+        requests.RequestException: If the request fails or the body is not valid JSON.
+    """
+    return get_http_client().get_json(url)
+
+
+class _InFlight:
+    """
+    A request that is currently being fetched, shared by all callers of the same URL.
+    """
+
+    def __init__(self, background: bool = False) -> None:
+        self.done = threading.Event()
+        self.payload: Any = None
+        self.age: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self.background = background
+
+
+class ResponseCache:
+    """
+    Shared cache of decoded API responses keyed by URL.
+
+    A payload is reused until it is older than `ttl` seconds. Concurrent callers
+    asking for the same URL while it is being fetched wait for that one request
+    instead of issuing their own (single-flight). Failed fetches are not cached;
+    every caller waiting on them receives the same exception.
+
+    Every endpoint (URL without its query) has a circuit breaker, which counts
+    only outages as failures: connection errors, timeouts and 5xx responses. A
+    client error of one URL, like a 404 for an unknown city, does not affect the
+    other URLs of the endpoint. Once the breaker opens, lookups of that endpoint
+    no longer wait on a failing server: they are served the last good payload,
+    if it is younger than `max_stale` seconds, and fail fast with
+    CircuitOpenError otherwise. When the breaker turns half-open, the probe
+    request is sent in the background while callers keep getting the stale
+    payload, and its response replaces the payload once it arrives. A fetch that
+    fails with an outage while the breaker is still closed is also answered with
+    the last good payload, if there is one; client errors are always raised.
+
+    Attributes:
+        ttl (float): Number of seconds a payload stays fresh. 0 disables caching,
+            but concurrent requests are still coalesced and the last payload is
+            still kept to be served in place of a failing endpoint.
+        max_stale (float): Maximum age in seconds of a payload served in place of a failing endpoint.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that triggered a fetch.
+        coalesced (int): Number of lookups that waited on another caller's fetch.
+        stale (int): Number of lookups served an expired payload because its endpoint was failing.
+        rejected (int): Number of lookups failed fast by an open circuit breaker.
+    """
+
+    def __init__(self, ttl: float = 60.0, fetch: Callable[[str], Any] = fetch_json, clock: Callable[[], float] = time.monotonic, max_stale: float = 3600.0, breaker_factory: Optional[Callable[[], CircuitBreaker]] = CircuitBreaker) -> None:
+        """
+        Initialize an empty response cache.
+
+        Args:
+            ttl (float): Number of seconds a payload stays fresh. Default is 60.
+            fetch (Callable[[str], Any]): Function fetching and decoding a URL. Default is fetch_json.
+            clock (Callable[[], float]): Monotonic time source. Default is time.monotonic.
+            max_stale (float): Maximum age in seconds of a payload served in place of a failing endpoint. Default is 3600.
+            breaker_factory (Optional[Callable[[], CircuitBreaker]]): Creates the circuit breaker of each endpoint. Default is CircuitBreaker with its default settings, None disables circuit breaking.
+        """
+        if ttl < 0:
+            raise ValueError("ttl must not be negative")
+        self.ttl = ttl
+        self.fetch = fetch
+        self.clock = clock
+        self.max_stale = max_stale
+        self.breaker_factory = breaker_factory
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stale = 0
+        self.rejected = 0
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._in_flight: Dict[str, _InFlight] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Any:
+        """
+        Return the decoded payload of a URL, fetching it only if needed.
+
+        The returned object is shared between all callers and must not be modified.
+
+        Args:
+            url (str): URL to fetch.
+
+        Returns:
+            Any: The decoded JSON payload.
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit breaker is open and there is no payload to serve.
+        """
+        return self.lookup(url)[0]
+
+    def lookup(self, url: str) -> Tuple[Any, Optional[float]]:
+        """
+        Return the decoded payload of a URL and, if it is stale, its age.
+
+        Args:
+            url (str): URL to fetch.
+
+        Returns:
+            Tuple[Any, Optional[float]]: The decoded JSON payload and its age in seconds if it was served
+                in place of a failing endpoint, None if it is fresh.
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit breaker is open and there is no payload to serve.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            age = None if entry is None else self.clock() - entry[0]
+            if entry is not None and age < self.ttl:
+                self.hits += 1
+                return entry[1], None
+            stale = entry if entry is not None and age < self.max_stale else None
+            breaker = self._breaker(url)
+            flight = self._in_flight.get(url)
+            leader = flight is None
+            if leader:
+                if breaker is not None and not breaker.allow():
+                    if stale is None:
+                        self.rejected += 1
+                        raise CircuitOpenError(endpoint_of(url), breaker.retry_after())
+                    self.stale += 1
+                    return stale[1], age
+                flight = _InFlight(background=stale is not None and breaker is not None and breaker.state is State.HALF_OPEN)
+                self._in_flight[url] = flight
+                self.misses += 1
+            elif stale is not None and flight.background:
+                self.stale += 1
+                return stale[1], age
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.payload, flight.age
+
+        if flight.background:
+            threading.Thread(target=self._refresh, args=(url, flight, breaker, stale), name="response-cache-refresh", daemon=True).start()
+            with self._lock:
+                self.stale += 1
+            return stale[1], age
+        self._refresh(url, flight, breaker, stale)
+        if flight.error is not None:
+            raise flight.error
+        return flight.payload, flight.age
+
+    def _refresh(self, url: str, flight: _InFlight, breaker: Optional[CircuitBreaker], stale: Optional[Tuple[float, Any]]) -> None:
+        """
+        Fetch a URL for a flight, record the outcome on the endpoint's breaker and cache a successful payload.
+
+        A foreground fetch failing with an outage is answered with the stale payload, if any; a failed background fetch keeps it cached.
+        """
+        error: Optional[BaseException] = None
+        try:
+            payload = self.fetch(url)
+        except BaseException as e:
+            error = e
+        with self._lock:
+            if breaker is not None:
+                if error is not None and is_outage(error):
+                    breaker.record_failure()
+                elif error is None or isinstance(error, Exception):
+                    # The server answered, even if with a client error for this URL.
+                    breaker.record_success()
+            if error is None:
+                flight.payload = payload
+                self._entries[url] = (self.clock(), payload)
+            elif stale is not None and is_outage(error) and not flight.background:
+                flight.payload = stale[1]
+                flight.age = self.clock() - stale[0]
+                self.stale += 1
+            else:
+                flight.error = error
+            del self._in_flight[url]
+        flight.done.set()
+        if error is not None and not isinstance(error, Exception):
+            raise error
+
+    def _breaker(self, url: str) -> Optional[CircuitBreaker]:
+        """
+        Get the circuit breaker of a URL's endpoint, creating it on first use. Called with the lock held.
+        """
+        if self.breaker_factory is None:
+            return None
+        endpoint = endpoint_of(url)
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = self.breaker_factory()
+        return breaker
+
+    def breaker(self, url: str) -> Optional[CircuitBreaker]:
+        """
+        Get the circuit breaker of a URL's endpoint.
+
+        Args:
+            url (str): Any URL of the endpoint.
+
+        Returns:
+            Optional[CircuitBreaker]: The breaker, None if circuit breaking is disabled.
+        """
+        with self._lock:
+            return self._breaker(url)
+
+    def invalidate(self, url: str) -> None:
+        """
+        Drop the cached payload of a URL, if any.
+
+        Args:
+            url (str): URL whose payload should be dropped.
+        """
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def clear(self) -> None:
+        """
+        Drop all cached payloads and circuit breakers and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._breakers.clear()
+            self.hits = 0
+            self.misses = 0
+            self.coalesced = 0
+            self.stale = 0
+            self.rejected = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+
+        Returns:
+            Dict[str, int]: Hits, misses, coalesced, stale and rejected lookups, the number of cached URLs and of open circuits.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "stale": self.stale,
+                "rejected": self.rejected,
+                "urls": len(self._entries),
+                "open_circuits": sum(breaker.state is not State.CLOSED for breaker in self._breakers.values()),
+            }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,436 @@
+import json
+import mmap
+import os
+import time
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence
+from sensors.base_sensor import BaseSensor
+
+COLUMNS = (("ts", "d"), ("sensor", "I"), ("metric", "H"), ("value", "d"))
+
+def _extend(column: array, values: Any) -> None:
+    """
+    Append values to a column buffer without per-item conversion where possible.
+
+    Args:
+        column (array): Column buffer to extend.
+        values (Any): Sequence, array or NumPy array of values.
+    """
+    if isinstance(values, array) and values.typecode == column.typecode:
+        column.extend(values)
+    elif hasattr(values, "astype"):
+        column.frombytes(values.astype(column.typecode).tobytes())
+    else:
+        column.extend(values)
+
+
+class ScanResult:
+    """
+    Rows returned by a range scan of a ColumnStore.
+
+    When the scanned range lies in the sorted part of the store and no sensor or
+    metric filter is given, the columns are zero-copy `memoryview`s of the
+    memory-mapped files; otherwise they are compact `array`s. Use `as_numpy`
+    to get NumPy views of the same buffers.
+
+    Attributes:
+        ts (Any): Timestamps of the rows.
+        sensor (Any): Sensor codes of the rows, see `sensor_ids`.
+        metric (Any): Metric codes of the rows, see `metrics`.
+        value (Any): Values of the rows.
+        sensor_ids (List[Hashable]): Sensor id of every sensor code.
+        metrics (List[str]): Metric name of every metric code.
+    """
+
+    def __init__(self, columns: Dict[str, Any], sensor_ids: List[Hashable], metrics: List[str]) -> None:
+        self.ts = columns["ts"]
+        self.sensor = columns["sensor"]
+        self.metric = columns["metric"]
+        self.value = columns["value"]
+        self.sensor_ids = sensor_ids
+        self.metrics = metrics
+
+    def __len__(self) -> int:
+        """
+        Return the number of rows.
+        """
+        return len(self.ts)
+
+    def __iter__(self):
+        """
+        Iterate over the rows as (timestamp, sensor_id, metric, value) tuples.
+        """
+        for ts, sensor, metric, value in zip(self.ts, self.sensor, self.metric, self.value):
+            yield ts, self.sensor_ids[sensor], self.metrics[metric], value
+
+    def as_numpy(self) -> Dict[str, Any]:
+        """
+        Get the columns as NumPy arrays sharing the scanned buffers.
+
+        Returns:
+            Dict[str, Any]: numpy.ndarray of every column keyed by column name.
+        """
+        import numpy as np
+        return {name: np.frombuffer(getattr(self, name), dtype=np.dtype(code)) for name, code in COLUMNS}
+
+
+class ColumnStore:
+    """
+    Append-only columnar on-disk store of sensor readings.
+
+    Every column (timestamp, sensor, metric, value) lives in its own binary file of
+    fixed-width native values, with sensor ids and metric names dictionary-encoded
+    in a small JSON metadata file. Appends are buffered in memory and written by
+    `flush`. Range scans read the columns through `mmap` and binary-search the
+    timestamps of the sorted part of the store; rows appended out of time order
+    are kept in an unsorted tail until `compact` sorts them in.
+
+    Attributes:
+        directory (str): Directory holding the column files.
+        buffer_rows (int): Number of buffered rows that triggers an automatic flush.
+    """
+
+    def __init__(self, directory: str, buffer_rows: int = 65536) -> None:
+        """
+        Open a store, creating its directory if needed.
+
+        Args:
+            directory (str): Directory holding the column files.
+            buffer_rows (int): Number of buffered rows that triggers an automatic flush. Default is 65536.
+        """
+        self.directory = directory
+        self.buffer_rows = buffer_rows
+        os.makedirs(directory, exist_ok=True)
+        self._meta_path = os.path.join(directory, "meta.json")
+        meta = {"sensors": [], "metrics": [], "sorted_rows": 0}
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, "r") as file:
+                meta = json.load(file)
+        self._sensor_ids: List[Hashable] = list(meta["sensors"])
+        self._sensor_codes: Dict[Hashable, int] = {sensor_id: code for code, sensor_id in enumerate(self._sensor_ids)}
+        self._metrics: List[str] = list(meta["metrics"])
+        self._metric_codes: Dict[str, int] = {metric: code for code, metric in enumerate(self._metrics)}
+        self._buffer = {name: array(code) for name, code in COLUMNS}
+        self._rows = self._recover_rows(meta.get("rows"))
+        self._sorted_rows = min(meta["sorted_rows"], self._rows)
+        self._last_ts = self._read_last_ts()
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._mapped_rows = -1
+
+    def _path(self, column: str) -> str:
+        return os.path.join(self.directory, f"{column}.col")
+
+    def _recover_rows(self, committed: Optional[int]) -> int:
+        """
+        Count the committed rows on disk, truncating columns left longer by an interrupted flush.
+
+        Rows written after the last metadata update may use sensor or metric codes
+        the metadata does not know, so they are dropped.
+
+        Args:
+            committed (Optional[int]): Row count recorded in the metadata, None for stores written without one.
+
+        Returns:
+            int: Number of rows stored in every column.
+        """
+        sizes = []
+        for name, code in COLUMNS:
+            path = self._path(name)
+            sizes.append(os.path.getsize(path) // array(code).itemsize if os.path.exists(path) else 0)
+        rows = min(sizes) if committed is None else min(min(sizes), committed)
+        for (name, code), size in zip(COLUMNS, sizes):
+            if size != rows:
+                with open(self._path(name), "r+b") as file:
+                    file.truncate(rows * array(code).itemsize)
+        return rows
+
+    def _read_last_ts(self) -> float:
+        if self._sorted_rows == 0:
+            return float("-inf")
+        with open(self._path("ts"), "rb") as file:
+            file.seek((self._sorted_rows - 1) * 8)
+            return array("d", file.read(8))[0]
+
+    def __len__(self) -> int:
+        """
+        Return the number of rows, including buffered ones.
+        """
+        return self._rows + len(self._buffer["ts"])
+
+    def _sensor_code(self, sensor_id: Hashable) -> int:
+        code = self._sensor_codes.get(sensor_id)
+        if code is None:
+            try:
+                valid = json.loads(json.dumps([sensor_id])) == [sensor_id]
+            except (TypeError, ValueError):
+                valid = False
+            if not valid:
+                raise TypeError(f"Sensor id {sensor_id!r} cannot be stored in the store metadata")
+            code = len(self._sensor_ids)
+            self._sensor_ids.append(sensor_id)
+            self._sensor_codes[sensor_id] = code
+        return code
+
+    def _metric_code(self, metric: str) -> int:
+        code = self._metric_codes.get(metric)
+        if code is None:
+            if len(self._metrics) >= 65536:
+                raise ValueError("Too many distinct metrics")
+            code = len(self._metrics)
+            self._metrics.append(metric)
+            self._metric_codes[metric] = code
+        return code
+
+    def append(self, ts: float, sensor_id: Hashable, metric: str, value: float) -> None:
+        """
+        Append one reading.
+
+        Args:
+            ts (float): Time of the reading as a Unix timestamp.
+            sensor_id (Hashable): Identifier of the sensor.
+            metric (str): Name of the metric, e.g. 'temp'.
+            value (float): Value of the reading.
+
+        Raises:
+            TypeError: If the sensor id does not survive a JSON round-trip, e.g. a tuple.
+        """
+        sensor_code = self._sensor_code(sensor_id)
+        metric_code = self._metric_code(metric)
+        buffer = self._buffer
+        buffer["ts"].append(ts)
+        buffer["sensor"].append(sensor_code)
+        buffer["metric"].append(metric_code)
+        buffer["value"].append(value)
+        if len(buffer["ts"]) >= self.buffer_rows:
+            self.flush()
+
+    def append_many(self, ts: Sequence[float], sensor_id: Hashable, metric: str, values: Sequence[float]) -> None:
+        """
+        Append many readings of one sensor and metric, e.g. a sensor's history.
+
+        Args:
+            ts (Sequence[float]): Timestamps of the readings.
+            sensor_id (Hashable): Identifier of the sensor.
+            metric (str): Name of the metric.
+            values (Sequence[float]): Values of the readings.
+
+        Raises:
+            ValueError: If ts and values differ in length.
+            TypeError: If the sensor id does not survive a JSON round-trip, e.g. a tuple.
+        """
+        if len(ts) != len(values):
+            raise ValueError("ts and values must have the same length")
+        sensor_code = self._sensor_code(sensor_id)
+        metric_code = self._metric_code(metric)
+        buffer = self._buffer
+        _extend(buffer["ts"], ts)
+        _extend(buffer["value"], values)
+        buffer["sensor"].extend(array("I", [sensor_code]) * len(ts))
+        buffer["metric"].extend(array("H", [metric_code]) * len(ts))
+        if len(buffer["ts"]) >= self.buffer_rows:
+            self.flush()
+
+    def append_sensor(self, sensor: BaseSensor, ts: Optional[float] = None) -> int:
+        """
+        Append the last data of a sensor, one row per metric.
+
+        Args:
+            sensor (BaseSensor): Sensor whose last data is archived.
+            ts (Optional[float]): Time of the reading. Default is the current time.
+
+        Returns:
+            int: Number of rows appended.
+        """
+        ts = time.time() if ts is None else ts
+        count = 0
+        for metric, value in sensor.readings():
+            if value is not None:
+                self.append(ts, sensor.sensor_id, metric, value)
+                count += 1
+        return count
+
+    def flush(self) -> None:
+        """
+        Write the buffered rows to the column files and update the metadata.
+
+        The metadata records the row count, so rows of a flush interrupted before the
+        metadata is replaced are dropped when the store is reopened.
+        """
+        buffer = self._buffer
+        count = len(buffer["ts"])
+        if count:
+            for name, _ in COLUMNS:
+                with open(self._path(name), "ab") as file:
+                    buffer[name].tofile(file)
+            if self._sorted_rows == self._rows:
+                ts = buffer["ts"]
+                last = self._last_ts
+                for i in range(count):
+                    if ts[i] < last:
+                        break
+                    last = ts[i]
+                    self._sorted_rows += 1
+                self._last_ts = last
+            self._rows += count
+            self._buffer = {name: array(code) for name, code in COLUMNS}
+        self._write_meta()
+
+    def _write_meta(self) -> None:
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump({"sensors": self._sensor_ids, "metrics": self._metrics, "rows": self._rows, "sorted_rows": self._sorted_rows}, file)
+        os.replace(tmp_path, self._meta_path)
+
+    def _columns(self) -> Dict[str, memoryview]:
+        """
+        Map the column files into memory, remapping them if rows were flushed since the last call.
+
+        Returns:
+            Dict[str, memoryview]: Typed view of every column file.
+        """
+        if self._mapped_rows != self._rows:
+            self._maps = {}
+            if self._rows:
+                for name, _ in COLUMNS:
+                    with open(self._path(name), "rb") as file:
+                        self._maps[name] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_rows = self._rows
+        if not self._maps:
+            return {name: memoryview(array(code)) for name, code in COLUMNS}
+        return {name: memoryview(self._maps[name]).cast(code) for name, code in COLUMNS}
+
+    def scan(self, start: float = float("-inf"), end: float = float("inf"), sensor_id: Optional[Hashable] = None, metric: Optional[str] = None) -> ScanResult:
+        """
+        Get the flushed rows with start <= ts < end, optionally of one sensor and metric.
+
+        Args:
+            start (float): Inclusive lower bound of the timestamps. Default is unbounded.
+            end (float): Exclusive upper bound of the timestamps. Default is unbounded.
+            sensor_id (Optional[Hashable]): Only return rows of this sensor. Default is all sensors.
+            metric (Optional[str]): Only return rows of this metric. Default is all metrics.
+
+        Returns:
+            ScanResult: The matching rows, in time order for the sorted part of the store.
+        """
+        columns = self._columns()
+        sensor_code = self._sensor_codes.get(sensor_id) if sensor_id is not None else None
+        metric_code = self._metric_codes.get(metric) if metric is not None else None
+        if (sensor_id is not None and sensor_code is None) or (metric is not None and metric_code is None):
+            return ScanResult({name: array(code) for name, code in COLUMNS}, self._sensor_ids, self._metrics)
+
+        ts = columns["ts"]
+        sorted_ts = ts[:self._sorted_rows]
+        lo = bisect_left(sorted_ts, start)
+        hi = bisect_left(sorted_ts, end, lo)
+        if sensor_code is None and metric_code is None and self._sorted_rows == self._rows:
+            return ScanResult({name: view[lo:hi] for name, view in columns.items()}, self._sensor_ids, self._metrics)
+
+        rows = self._filter(columns, range(lo, hi), sensor_code, metric_code)
+        tail = (i for i in range(self._sorted_rows, self._rows) if start <= ts[i] < end)
+        rows.extend(self._filter(columns, tail, sensor_code, metric_code))
+        return ScanResult({name: array(code, (columns[name][i] for i in rows)) for name, code in COLUMNS}, self._sensor_ids, self._metrics)
+
+    @staticmethod
+    def _filter(columns: Dict[str, memoryview], rows: Iterable[int], sensor_code: Optional[int], metric_code: Optional[int]) -> List[int]:
+        sensor = columns["sensor"]
+        metric = columns["metric"]
+        return [i for i in rows if (sensor_code is None or sensor[i] == sensor_code) and (metric_code is None or metric[i] == metric_code)]
+
+    def compact(self, deduplicate: bool = True) -> None:
+        """
+        Sort all rows by time and rewrite the column files, making every row scannable without copies.
+
+        Args:
+            deduplicate (bool): Keep only the last written row of every (ts, sensor, metric). Default is True.
+        """
+        self.flush()
+        if self._rows == 0:
+            return
+        columns = {name: array(code, self._columns()[name]) for name, code in COLUMNS}
+        self._maps = {}
+        self._mapped_rows = -1
+        order = _sort_order(columns["ts"], columns["sensor"], columns["metric"], deduplicate)
+        for name, code in COLUMNS:
+            tmp_path = self._path(name) + ".tmp"
+            with open(tmp_path, "wb") as file:
+                _take(columns[name], order).tofile(file)
+            os.replace(tmp_path, self._path(name))
+        self._rows = len(order)
+        self._sorted_rows = self._rows
+        self._last_ts = columns["ts"][order[-1]]
+        self._write_meta()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the size of the store.
+
+        Returns:
+            Dict[str, int]: Number of flushed, sorted and buffered rows, sensors and metrics.
+        """
+        return {
+            "rows": self._rows,
+            "sorted_rows": self._sorted_rows,
+            "buffered_rows": len(self._buffer["ts"]),
+            "sensors": len(self._sensor_ids),
+            "metrics": len(self._metrics),
+        }
+
+    def close(self) -> None:
+        """
+        Flush the buffered rows and release the memory maps.
+        """
+        self.flush()
+        self._maps = {}
+        self._mapped_rows = -1
+
+
+def _sort_order(ts: array, sensor: array, metric: array, deduplicate: bool) -> Any:
+    """
+    Compute the row order sorting a store by (ts, sensor, metric).
+
+    Rows with equal keys keep their write order, so with deduplication the last
+    written one survives. NumPy is used when installed.
+
+    Args:
+        ts (array): Timestamp column.
+        sensor (array): Sensor code column.
+        metric (array): Metric code column.
+        deduplicate (bool): Drop all but the last written row of every key.
+
+    Returns:
+        Any: Row indices in sorted order, as a list or NumPy array.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        ts_np, sensor_np, metric_np = (np.frombuffer(column, dtype=column.typecode) for column in (ts, sensor, metric))
+        order = np.lexsort((metric_np, sensor_np, ts_np))
+        if deduplicate and len(order) > 1:
+            keys = (ts_np[order], sensor_np[order], metric_np[order])
+            last = np.ones(len(order), dtype=bool)
+            last[:-1] = (keys[0][1:] != keys[0][:-1]) | (keys[1][1:] != keys[1][:-1]) | (keys[2][1:] != keys[2][:-1])
+            order = order[last]
+        return order
+    order = sorted(range(len(ts)), key=lambda i: (ts[i], sensor[i], metric[i]))
+    if deduplicate:
+        order = [i for n, i in enumerate(order) if n + 1 == len(order) or (ts[i], sensor[i], metric[i]) != (ts[order[n + 1]], sensor[order[n + 1]], metric[order[n + 1]])]
+    return order
+
+def _take(column: array, order: Any) -> array:
+    """
+    Reorder a column.
+
+    Args:
+        column (array): Column to reorder.
+        order (Any): Row indices as a list or NumPy array.
+
+    Returns:
+        array: The reordered column.
+    """
+    if hasattr(order, "dtype"):
+        import numpy as np
+        return array(column.typecode, np.frombuffer(column, dtype=column.typecode)[order].tobytes())
+    return array(column.typecode, (column[i] for i in order))
@@ -1,31 +1,114 @@
+import json
+import sys
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Union
+from sensors.file_cache import file_cache
+from sensors.api_cache import response_cache
+from sensors.circuit_breaker import CircuitOpenError
+from sensors.enums import _StrEnum
+from sensors.history import ReadingHistory
+from sensors.location_index import location_index
+from sensors.metrics import registry
+from sensors.stream import latest_observation
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+class Status(_StrEnum):
+    """
+    Status of a sensor.
+    """
+
+    ACTIVE = "active"
+    INACTIVE = "inactive"
+    MAINTENANCE = "maintenance"
+    ERROR = "error"
+
+
+class Source(_StrEnum):
+    """
+    Source of the sensor data.
+    """
+
+    FILE = "file"
+    API = "api"
+    STREAM = "stream"
+
+
+def intern_string(value: Any) -> Any:
+    """
+    Intern a string, so sensors sharing a location, path or URL share one string object.
+
+    Args:
+        value (Any): Value to intern; anything that is not a plain str is returned unchanged.
+
+    Returns:
+        Any: The interned string or the value itself.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+def _member(enum: type, value: Any) -> Any:
+    """
+    Get the enum member of a value, keeping unknown values as interned strings.
+
+    Args:
+        enum (type): Status or Source.
+        value (Any): Member or string value.
+
+    Returns:
+        Any: The enum member, or the interned value if it is not a member.
+    """
+    try:
+        return enum(value)
+    except ValueError:
+        return intern_string(value)
+
 
 class BaseSensor(ABC):
     """
     Abstract base class for sensors.
 
+    Sensors use `__slots__` instead of an instance dictionary, keep their status and
+    source as shared enum members and intern their location, path and URL strings,
+    so large fleets of sensors stay small in memory. Values that are not Status or
+    Source members are kept as plain strings; such a sensor is simply not active
+    or fails to read with a ValueError.
+
     Attributes:
         sensor_id (int): Unique identifier for the sensor.
         location (str): Location where the sensor is deployed.
-        status (str): Status of the sensor ('active', 'inactive', etc.).
-        source (str): Source of the sensor data ('file', 'api', etc.).
+        status (Status): Status of the sensor ('active', 'inactive', etc.).
+        source (Source): Source of the sensor data ('file', 'api' or 'stream').
         data_file_path (str): Path to the file containing sensor data.
         api_url (str): URL to fetch sensor data from an API.
         last_data (Any): Last data read by the sensor.
+        history (Optional[ReadingHistory]): Ring buffer of past readings, None if disabled.
+        use_index (bool): Whether file reads decode only the location's record through the byte-offset index.
+        monitor (Optional[AnomalyMonitor]): Monitor evaluating every successful read, None if not attached.
+        sink (Optional[SqliteSink]): Sink persisting every successful read, None if not persisted.
+        stale_age (Optional[float]): Age in seconds of the last data if the last read was served a stale API
+            response because the endpoint is failing, None if the last data is fresh.
+        FILE_KEYS (Tuple[str, ...]): Keys of the 'city_data' records the sensor reads.
     """
+
+    __slots__ = ("sensor_id", "_location", "_status", "_source", "_data_file_path", "_api_url", "last_data", "history", "use_index", "monitor", "sink", "stale_age")
+
+    FILE_KEYS: Tuple[str, ...] = ()
     
-    def __init__(self, sensor_id: int, location: str, status: str = "active", source: str = "file", data_file_path: str = "data/data.json", api_url: str = "") -> None:
+    def __init__(self, sensor_id: int, location: str, status: Union[Status, str] = "active", source: Union[Source, str] = "file", data_file_path: str = "data/data.json", api_url: str = "", history_capacity: int = 0, use_index: bool = False) -> None:
         """
         Initialize the base sensor with common attributes.
 
         Args:
             sensor_id (int): Unique identifier for the sensor.
             location (str): Location where the sensor is deployed.
-            status (str): Status of the sensor. Default is 'active'.
-            source (str): Source of the sensor data. Default is 'file'.
-            data_file_path (str): Path to the file containing sensor data. Default is 'data/sensors_data.json'.
+            status (Union[Status, str]): Status of the sensor. Default is 'active'.
+            source (Union[Source, str]): Source of the sensor data. Default is 'file'.
+            data_file_path (str): Path to the file containing sensor data, a newline-delimited JSON log for the 'stream' source. Default is 'data/sensors_data.json'.
             api_url (str): URL to fetch sensor data from an API. Default is an empty string. Recomennded to use a OpenWeatherMapAPI.
+            history_capacity (int): Number of past readings kept in the history. Default is 0, which disables the history.
+            use_index (bool): Read only the location's record through the byte-offset index instead of parsing the whole data file. Default is False.
         """
         self.sensor_id = sensor_id
         self.location = location
@@ -34,22 +117,67 @@ class BaseSensor(ABC):
         self.data_file_path = data_file_path
         self.api_url = api_url
         self.last_data = None
+        self.history = self.create_history(history_capacity) if history_capacity > 0 else None
+        self.use_index = use_index
+        self.monitor = None
+        self.sink = None
+        self.stale_age = None
+
+    @property
+    def location(self) -> str:
+        return self._location
+
+    @location.setter
+    def location(self, value: str) -> None:
+        self._location = intern_string(value)
+
+    @property
+    def status(self) -> Status:
+        return self._status
+
+    @status.setter
+    def status(self, value: Union[Status, str]) -> None:
+        self._status = _member(Status, value)
+
+    @property
+    def source(self) -> Source:
+        return self._source
 
-    def get_status(self) -> str:
+    @source.setter
+    def source(self, value: Union[Source, str]) -> None:
+        self._source = _member(Source, value)
+
+    @property
+    def data_file_path(self) -> str:
+        return self._data_file_path
+
+    @data_file_path.setter
+    def data_file_path(self, value: str) -> None:
+        self._data_file_path = intern_string(value)
+
+    @property
+    def api_url(self) -> str:
+        return self._api_url
+
+    @api_url.setter
+    def api_url(self, value: str) -> None:
+        self._api_url = intern_string(value)
+
+    def get_status(self) -> Status:
         """
         Get the current status of the sensor.
 
         Returns:
-            str: The current status of the sensor.
+            Status: The current status of the sensor.
         """
-        return self.status
+        return self._status
 
-    def set_status(self, new_status: str) -> None:
+    def set_status(self, new_status: Union[Status, str]) -> None:
         """
         Set a new status for the sensor.
 
         Args:
-            new_status (str): New status to assign to the sensor.
+            new_status (Union[Status, str]): New status to assign to the sensor.
         """
         self.status = new_status
         
@@ -66,19 +194,148 @@ class BaseSensor(ABC):
         """
         Read data from the sensor.
 
+        A stale API response served while the endpoint is failing is returned with
+        its age in `stale_age` and is not recorded in the history, monitor or sink again.
+
         Returns:
             Any: The data read by the sensor.
+
+        Raises:
+            CircuitOpenError: If the sensor's API endpoint is failing and there is no earlier response to serve.
         """
-        if self.status != "active":
+        if self._status is not Status.ACTIVE:
             raise RuntimeError(f"Sensor {self.sensor_id} is not active")
         
-        if self.source == "file":
+        self.stale_age = None
+        if registry.enabled:
+            registry.timed_read(type(self).__name__, self._location, self._source, self._read_source)
+        else:
+            self._read_source()
+        if self.stale_age is None:
+            self.record_reading(time.time())
+        return self.last_data
+
+    def _read_source(self) -> None:
+        """
+        Read data from the sensor's source into the last data.
+        """
+        source = self._source
+        if source is Source.FILE:
             self.read_data_from_file()
-        elif self.source == "api":
+        elif source is Source.API:
             self.read_data_from_api()
+        elif source is Source.STREAM:
+            self.read_data_from_stream()
         else:
-            raise ValueError(f"Invalid source: {self.source}")
+            raise ValueError(f"Invalid source: {source}")
+
+    def create_history(self, capacity: int) -> Optional[ReadingHistory]:
+        """
+        Create the ring buffer keeping the sensor's past readings.
+
+        Args:
+            capacity (int): Number of readings kept.
+
+        Returns:
+            Optional[ReadingHistory]: The history of the sensor.
+        """
+        return ReadingHistory(capacity)
+
+    def record_reading(self, timestamp: float) -> None:
+        """
+        Append the last data to the history, if the history is enabled, and pass it to the attached monitor and sink.
+
+        Args:
+            timestamp (float): Time of the reading as a Unix timestamp.
+        """
+        if self.history is not None and self.last_data is not None:
+            self.history.append(timestamp, self.last_data)
+        if self.monitor is not None:
+            self.monitor.observe(self, timestamp)
+        if self.sink is not None:
+            self.sink.write(self, timestamp)
+
+    def readings(self) -> List[Tuple[str, Any]]:
+        """
+        Get the last data as (metric, value) pairs named after the 'city_data' keys.
+
+        Returns:
+            List[Tuple[str, Any]]: The metrics of the last data, empty if there is no data.
+        """
+        if self.last_data is None or not self.FILE_KEYS:
+            return []
+        return [(self.FILE_KEYS[0], self.last_data)]
+
+    async def read_data_async(self, executor: Optional["Executor"] = None) -> Any:
+        """
+        Read data from the sensor without blocking the event loop.
+
+        The blocking read runs in `executor`, so many sensors can be read concurrently.
+
+        Args:
+            executor (Optional[Executor]): Executor running the blocking read. Default is the loop's default executor.
+
+        Returns:
+            Any: The data read by the sensor.
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.read_data)
         
+    def load_city_data(self) -> dict:
+        """
+        Load the record of the sensor's location from its data file.
+
+        With `use_index`, only the record is decoded; otherwise the whole file is parsed once and cached.
+
+        Returns:
+            dict: Record of the location from the 'city_data' object.
+
+        Raises:
+            KeyError: If the location is not present in the data file.
+        """
+        if self.use_index:
+            city_data = location_index.lookup(self._data_file_path, self._location)
+        else:
+            city_data = file_cache.load(self._data_file_path)["city_data"].get(self._location)
+        if city_data is None:
+            self.last_data = None
+            raise KeyError(f"Location {self.location} not found in data file")
+        return city_data
+
+    def load_api_data(self) -> dict:
+        """
+        Load the decoded API response for the sensor's URL, setting `stale_age` if it is stale.
+
+        Returns:
+            dict: Decoded API response, shared with other sensors of the same URL.
+
+        Raises:
+            CircuitOpenError: If the API endpoint is failing and there is no response young enough to serve; the last data is cleared.
+        """
+        try:
+            payload, self.stale_age = response_cache.lookup(self.api_url)
+        except CircuitOpenError:
+            self.last_data = None
+            raise
+        return payload
+
+    def read_data_from_stream(self) -> None:
+        """
+        Read sensor data from the newest observation of the sensor's location in a newline-delimited JSON log.
+
+        The log is indexed incrementally, so a read only decodes the lines appended since the previous one.
+        """
+        try:
+            record = latest_observation(self.data_file_path, self.location, self.FILE_KEYS or None)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            self.last_data = None
+            raise RuntimeError(f"Error reading data from stream: {e}")
+        if record is None:
+            self.last_data = None
+            raise KeyError(f"Location {self.location} not found in stream")
+        self.parse_city_data(record)
+
     @abstractmethod
     def read_data_from_file(self) -> Any:
         """
@@ -92,3 +349,17 @@ class BaseSensor(ABC):
         Abstract method to read sensor data from an API.
         """
         pass
+
+    @abstractmethod
+    def parse_city_data(self, city_data: dict) -> None:
+        """
+        Abstract method to set the last data from the record of the sensor's location in a data file.
+        """
+        pass
+
+    @abstractmethod
+    def parse_api_data(self, all_data: dict) -> None:
+        """
+        Abstract method to set the last data from a decoded API response.
+        """
+        pass
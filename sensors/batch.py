@@ -0,0 +1,221 @@
+import math
+from typing import Any, Iterable, Optional, Sequence
+from sensors.base_sensor import BaseSensor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+def _use_numpy(use_numpy: Optional[bool]) -> bool:
+    """
+    Decide whether a batch operation runs on NumPy.
+
+    Args:
+        use_numpy (Optional[bool]): Explicit choice, None to use NumPy when it is installed.
+
+    Returns:
+        bool: True if NumPy should be used.
+    """
+    if use_numpy is None:
+        return HAS_NUMPY
+    if use_numpy and not HAS_NUMPY:
+        raise ImportError("NumPy is not installed")
+    return use_numpy
+
+def fleet_values(sensors: Iterable[BaseSensor], channel: Optional[str] = None, use_numpy: Optional[bool] = None) -> Any:
+    """
+    Collect the last data of a fleet into one array of floats.
+
+    Args:
+        sensors (Iterable[BaseSensor]): Sensors to collect the data from.
+        channel (Optional[str]): Key of the value for sensors with dict data, e.g. 'speed' for WindSensor.
+        use_numpy (Optional[bool]): Return a NumPy array. Default is to use NumPy when it is installed.
+
+    Returns:
+        Any: numpy.ndarray or list of floats, missing readings are NaN.
+    """
+    values = []
+    for sensor in sensors:
+        value = sensor.last_data
+        if channel is not None and value is not None:
+            value = value.get(channel)
+        values.append(math.nan if value is None else float(value))
+    if _use_numpy(use_numpy):
+        return np.array(values, dtype=np.float64)
+    return values
+
+def _as_floats(values: Any, use_numpy: bool) -> Any:
+    """
+    Convert readings to floats with missing readings as NaN.
+
+    Args:
+        values (Any): Sequence of numbers or None, or a NumPy array.
+        use_numpy (bool): Return a NumPy array instead of a list.
+
+    Returns:
+        Any: numpy.ndarray or list of floats.
+    """
+    if use_numpy:
+        if isinstance(values, np.ndarray) and values.dtype == np.float64:
+            return values
+        return np.array([math.nan if value is None else value for value in values], dtype=np.float64)
+    return [math.nan if value is None else float(value) for value in values]
+
+def to_fahrenheit(values: Sequence[Optional[float]], use_numpy: Optional[bool] = None) -> Any:
+    """
+    Convert temperatures from Celsius to Fahrenheit.
+
+    Args:
+        values (Sequence[Optional[float]]): Temperatures in Celsius, None for missing readings.
+        use_numpy (Optional[bool]): Compute with NumPy. Default is to use NumPy when it is installed.
+
+    Returns:
+        Any: Temperatures in Fahrenheit as numpy.ndarray or list, missing readings are NaN.
+    """
+    if _use_numpy(use_numpy):
+        return _as_floats(values, True) * 9 / 5 + 32
+    return [value * 9 / 5 + 32 for value in _as_floats(values, False)]
+
+def to_psi(values: Sequence[Optional[float]], use_numpy: Optional[bool] = None) -> Any:
+    """
+    Convert pressures from hPa to PSI.
+
+    Args:
+        values (Sequence[Optional[float]]): Pressures in hPa, None for missing readings.
+        use_numpy (Optional[bool]): Compute with NumPy. Default is to use NumPy when it is installed.
+
+    Returns:
+        Any: Pressures in PSI as numpy.ndarray or list, missing readings are NaN.
+    """
+    if _use_numpy(use_numpy):
+        return _as_floats(values, True) / 68.947572932
+    return [value / 68.947572932 for value in _as_floats(values, False)]
+
+def to_kmh(values: Sequence[Optional[float]], use_numpy: Optional[bool] = None) -> Any:
+    """
+    Convert wind speeds from m/s to km/h.
+
+    Args:
+        values (Sequence[Optional[float]]): Wind speeds in m/s, None for missing readings.
+        use_numpy (Optional[bool]): Compute with NumPy. Default is to use NumPy when it is installed.
+
+    Returns:
+        Any: Wind speeds in km/h as numpy.ndarray or list, missing readings are NaN.
+    """
+    if _use_numpy(use_numpy):
+        return _as_floats(values, True) * 3.6
+    return [value * 3.6 for value in _as_floats(values, False)]
+
+def above_threshold(values: Sequence[Optional[float]], threshold: float, use_numpy: Optional[bool] = None) -> Any:
+    """
+    Check which readings are above a threshold.
+
+    Args:
+        values (Sequence[Optional[float]]): Readings, None for missing ones.
+        threshold (float): Threshold value to compare the readings against.
+        use_numpy (Optional[bool]): Compute with NumPy. Default is to use NumPy when it is installed.
+
+    Returns:
+        Any: Boolean mask as numpy.ndarray or list, False for missing readings.
+    """
+    if _use_numpy(use_numpy):
+        return _as_floats(values, True) > threshold
+    return [value > threshold for value in _as_floats(values, False)]
+
+def humid_mask(values: Sequence[Optional[float]], thresold: float = 70.0, use_numpy: Optional[bool] = None) -> Any:
+    """
+    Batch counterpart of HumiditySensor.is_humid.
+
+    Args:
+        values (Sequence[Optional[float]]): Humidities in percent, None for missing readings.
+        thresold (float): Thresold value to compare the data against. Default is 70.
+        use_numpy (Optional[bool]): Compute with NumPy. Default is to use NumPy when it is installed.
+
+    Returns:
+        Any: Boolean mask as numpy.ndarray or list, False for missing readings.
+    """
+    return above_threshold(values, thresold, use_numpy)
+
+def raining_mask(values: Sequence[Optional[float]], threshold: float = 50.0, use_numpy: Optional[bool] = None) -> Any:
+    """
+    Batch counterpart of RainfallSensor.is_raining.
+
+    Args:
+        values (Sequence[Optional[float]]): Rainfall readings, None for missing ones.
+        threshold (float): Threshold value to compare the data against. Default is 50.
+        use_numpy (Optional[bool]): Compute with NumPy. Default is to use NumPy when it is installed.
+
+    Returns:
+        Any: Boolean mask as numpy.ndarray or list, False for missing readings.
+    """
+    return above_threshold(values, threshold, use_numpy)
+
+def fleet_fahrenheit(sensors: Iterable[BaseSensor], use_numpy: Optional[bool] = None) -> Any:
+    """
+    Convert the last temperature of every sensor of a fleet to Fahrenheit.
+
+    Args:
+        sensors (Iterable[BaseSensor]): Temperature sensors.
+        use_numpy (Optional[bool]): Compute with NumPy. Default is to use NumPy when it is installed.
+
+    Returns:
+        Any: Temperatures in Fahrenheit, NaN for sensors without data.
+    """
+    return to_fahrenheit(fleet_values(sensors, use_numpy=use_numpy), use_numpy)
+
+def fleet_psi(sensors: Iterable[BaseSensor], use_numpy: Optional[bool] = None) -> Any:
+    """
+    Convert the last pressure of every sensor of a fleet to PSI.
+
+    Args:
+        sensors (Iterable[BaseSensor]): Pressure sensors.
+        use_numpy (Optional[bool]): Compute with NumPy. Default is to use NumPy when it is installed.
+
+    Returns:
+        Any: Pressures in PSI, NaN for sensors without data.
+    """
+    return to_psi(fleet_values(sensors, use_numpy=use_numpy), use_numpy)
+
+def fleet_kmh(sensors: Iterable[BaseSensor], use_numpy: Optional[bool] = None) -> Any:
+    """
+    Convert the last wind speed of every sensor of a fleet to km/h.
+
+    Args:
+        sensors (Iterable[BaseSensor]): Wind sensors.
+        use_numpy (Optional[bool]): Compute with NumPy. Default is to use NumPy when it is installed.
+
+    Returns:
+        Any: Wind speeds in km/h, NaN for sensors without data.
+    """
+    return to_kmh(fleet_values(sensors, "speed", use_numpy), use_numpy)
+
+def fleet_humid(sensors: Iterable[BaseSensor], thresold: float = 70.0, use_numpy: Optional[bool] = None) -> Any:
+    """
+    Check which humidity sensors of a fleet are above a thresold.
+
+    Args:
+        sensors (Iterable[BaseSensor]): Humidity sensors.
+        thresold (float): Thresold value to compare the data against. Default is 70.
+        use_numpy (Optional[bool]): Compute with NumPy. Default is to use NumPy when it is installed.
+
+    Returns:
+        Any: Boolean mask, False for sensors without data.
+    """
+    return humid_mask(fleet_values(sensors, use_numpy=use_numpy), thresold, use_numpy)
+
+def fleet_raining(sensors: Iterable[BaseSensor], threshold: float = 50.0, use_numpy: Optional[bool] = None) -> Any:
+    """
+    Check which rainfall sensors of a fleet are above a threshold.
+
+    Args:
+        sensors (Iterable[BaseSensor]): Rainfall sensors.
+        threshold (float): Threshold value to compare the data against. Default is 50.
+        use_numpy (Optional[bool]): Compute with NumPy. Default is to use NumPy when it is installed.
+
+    Returns:
+        Any: Boolean mask, False for sensors without data.
+    """
+    return raining_mask(fleet_values(sensors, use_numpy=use_numpy), threshold, use_numpy)
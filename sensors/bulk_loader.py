@@ -0,0 +1,222 @@
+import json
+import math
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sensors.base_sensor import BaseSensor
+from sensors.decoder import get_decoder
+from sensors.fleet import FleetResult
+from sensors.station import METRIC_SENSORS
+
+METRICS: Tuple[str, ...] = tuple(key for sensor_class in METRIC_SENSORS.values() for key in sensor_class.FILE_KEYS)
+
+def _as_float(value: Any) -> float:
+    if value is None or isinstance(value, bool):
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+def load_shard(path: str, metrics: Sequence[str] = METRICS) -> Tuple[List[str], Dict[str, array]]:
+    """
+    Parse one data file into per-metric columns.
+
+    Runs in the worker processes; the columns are arrays of doubles, which are sent
+    back to the parent as raw bytes instead of one pickled dict per location.
+
+    Args:
+        path (str): Path to a data file shaped like data/data.json.
+        metrics (Sequence[str]): Keys of the 'city_data' records to extract. Default is every sensor's keys.
+
+    Returns:
+        Tuple[List[str], Dict[str, array]]: The locations in file order and one column per metric, missing values are NaN.
+            A record that is not an object, like null, has NaN for every metric.
+
+    Raises:
+        RuntimeError: If the file cannot be read, is not valid JSON or its 'city_data' is not an object.
+    """
+    try:
+        city_data = get_decoder().load(path)["city_data"]
+        locations = list(city_data)
+        records = [record if isinstance(record, dict) else {} for record in city_data.values()]
+    except (OSError, KeyError, TypeError, AttributeError, json.JSONDecodeError) as e:
+        raise RuntimeError(f"Error loading shard {path}: {e!r}")
+    columns = {metric: array("d", [_as_float(record.get(metric)) for record in records]) for metric in metrics}
+    return locations, columns
+
+
+class FleetSnapshot:
+    """
+    Merged readings of many data files, stored as one column of doubles per metric.
+
+    Every location has one row; a location present in several files takes the
+    values of the last one. Sensors of any type read from the snapshot through
+    the same `parse_city_data` they use for data files; all values are floats.
+
+    Attributes:
+        locations (List[str]): Location of every row.
+        columns (Dict[str, array]): Values of every metric by row, missing values are NaN.
+        files (int): Number of data files merged.
+    """
+
+    def __init__(self, metrics: Sequence[str] = METRICS) -> None:
+        """
+        Initialize an empty snapshot.
+
+        Args:
+            metrics (Sequence[str]): Metrics stored in the snapshot. Default is every sensor's keys.
+        """
+        self.locations: List[str] = []
+        self.columns: Dict[str, array] = {metric: array("d") for metric in metrics}
+        self.files = 0
+        self._rows: Dict[str, int] = {}
+
+    def merge(self, locations: List[str], columns: Dict[str, array]) -> None:
+        """
+        Append the rows of one data file, replacing locations already present.
+
+        Args:
+            locations (List[str]): Locations of the file in file order.
+            columns (Dict[str, array]): Column of every metric of the file.
+        """
+        self.files += 1
+        rows = self._rows
+        duplicates = []
+        for index, location in enumerate(locations):
+            row = rows.get(location)
+            if row is None:
+                rows[location] = len(self.locations)
+                self.locations.append(location)
+            else:
+                duplicates.append((index, row))
+        if not duplicates:
+            for metric, column in self.columns.items():
+                column.extend(columns[metric])
+            return
+        skip = {index for index, _ in duplicates}
+        for metric, column in self.columns.items():
+            values = columns[metric]
+            column.extend(value for index, value in enumerate(values) if index not in skip)
+            for index, row in duplicates:
+                column[row] = values[index]
+
+    def __len__(self) -> int:
+        """
+        Return the number of locations.
+        """
+        return len(self.locations)
+
+    def __contains__(self, location: str) -> bool:
+        return location in self._rows
+
+    def column(self, metric: str, use_numpy: bool = False) -> Any:
+        """
+        Get the values of one metric of all locations.
+
+        Args:
+            metric (str): Key of the metric, e.g. 'temp'.
+            use_numpy (bool): Return a NumPy view of the column instead of the array. Default is False.
+
+        Returns:
+            Any: array of doubles or numpy.ndarray in row order, missing values are NaN.
+        """
+        values = self.columns[metric]
+        if use_numpy:
+            import numpy as np
+            return np.frombuffer(values, dtype=np.float64)
+        return values
+
+    def record(self, location: str) -> Dict[str, Any]:
+        """
+        Rebuild the 'city_data' record of a location.
+
+        Args:
+            location (str): Location to look up.
+
+        Returns:
+            Dict[str, Any]: The record with the metrics that have a value.
+
+        Raises:
+            KeyError: If the location is not in the snapshot.
+        """
+        row = self._rows.get(location)
+        if row is None:
+            raise KeyError(f"Location {location} not found in snapshot")
+        record = {}
+        for metric, column in self.columns.items():
+            value = column[row]
+            if value == value:
+                record[metric] = value
+        return record
+
+    def apply(self, sensor: BaseSensor) -> Any:
+        """
+        Set the last data of a sensor from the snapshot, as a file read would.
+
+        Args:
+            sensor (BaseSensor): Sensor of any type.
+
+        Returns:
+            Any: The last data of the sensor.
+
+        Raises:
+            KeyError: If the location or the sensor's metric is missing.
+        """
+        try:
+            sensor.parse_city_data(self.record(sensor.location))
+        except KeyError:
+            sensor.last_data = None
+            raise
+        sensor.record_reading(time.time())
+        return sensor.last_data
+
+    def apply_all(self, sensors: Iterable[BaseSensor]) -> List[FleetResult]:
+        """
+        Set the last data of many sensors from the snapshot.
+
+        Args:
+            sensors (Iterable[BaseSensor]): Sensors of any type.
+
+        Returns:
+            List[FleetResult]: Outcome of every sensor in order.
+        """
+        results = []
+        for sensor in sensors:
+            try:
+                results.append(FleetResult(sensor, self.apply(sensor)))
+            except KeyError as e:
+                results.append(FleetResult(sensor, error=e))
+        return results
+
+
+def load_shards(paths: Iterable[str], workers: Optional[int] = None, metrics: Sequence[str] = METRICS) -> FleetSnapshot:
+    """
+    Parse many data files in parallel processes and merge them into one snapshot.
+
+    Files are merged in the order of `paths`, so a location in several files keeps the values of the last one.
+
+    Args:
+        paths (Iterable[str]): Paths to data files shaped like data/data.json.
+        workers (Optional[int]): Number of worker processes, 1 to parse in this process. Default is the number of CPUs.
+        metrics (Sequence[str]): Metrics to load. Default is every sensor's keys.
+
+    Returns:
+        FleetSnapshot: The merged readings.
+
+    Raises:
+        RuntimeError: If a file cannot be read or is not valid JSON.
+    """
+    paths = list(paths)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    snapshot = FleetSnapshot(metrics)
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            snapshot.merge(*load_shard(path, metrics))
+        return snapshot
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+        for locations, columns in executor.map(load_shard, paths, [metrics] * len(paths)):
+            snapshot.merge(locations, columns)
+    return snapshot
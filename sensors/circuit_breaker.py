@@ -0,0 +1,187 @@
+import sys
+import threading
+import time
+from typing import Callable
+from urllib.parse import urlsplit
+from sensors.enums import _StrEnum
+
+class State(_StrEnum):
+    """
+    State of a circuit breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised instead of sending a request to an endpoint whose circuit breaker is open.
+
+    Attributes:
+        endpoint (str): The endpoint that is failing.
+        retry_after (float): Seconds until the breaker lets a probe request through.
+    """
+
+    def __init__(self, endpoint: str, retry_after: float) -> None:
+        super().__init__(f"Circuit open for {endpoint}, retry in {retry_after:.1f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+def endpoint_of(url: str) -> str:
+    """
+    Get the endpoint of a URL, i.e. the URL without its query string and fragment.
+
+    Args:
+        url (str): The URL, e.g. 'https://api.openweathermap.org/data/2.5/weather?q=Nitra'.
+
+    Returns:
+        str: The endpoint, e.g. 'https://api.openweathermap.org/data/2.5/weather'.
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+def is_outage(error: BaseException) -> bool:
+    """
+    Check if a failed request means that its endpoint is down, rather than that the request itself was wrong.
+
+    Connection errors, timeouts and 5xx responses are outages. Client errors
+    such as 401 or 404, which other URLs of the endpoint do not share, and
+    undecodable bodies are not.
+
+    Args:
+        error (BaseException): Exception raised by the request.
+
+    Returns:
+        bool: True if the failure should count against the endpoint's circuit breaker.
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    # Only errors of an HTTP stack that is already loaded can be its exceptions.
+    requests = sys.modules.get("requests")
+    if requests is None:
+        return False
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+    return False
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one endpoint.
+
+    The breaker starts closed and lets every request through. After
+    `failure_threshold` consecutive failures it opens and rejects requests for
+    `reset_timeout` seconds, so callers fail fast instead of waiting on timeouts
+    and retries of a server that is down. It then turns half-open and lets up to
+    `half_open_probes` requests through: a success closes it, a failure opens it
+    again for another `reset_timeout`.
+
+    Attributes:
+        failure_threshold (int): Consecutive failures that open the breaker.
+        reset_timeout (float): Seconds the breaker stays open before probing.
+        half_open_probes (int): Requests let through while half-open.
+        failures (int): Current number of consecutive failures.
+        opened (int): Number of times the breaker opened.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, half_open_probes: int = 1, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize a closed breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the breaker. Default is 5.
+            reset_timeout (float): Seconds the breaker stays open before probing. Default is 30.
+            half_open_probes (int): Requests let through while half-open. Default is 1.
+            clock (Callable[[], float]): Monotonic time source. Default is time.monotonic.
+        """
+        if failure_threshold < 1 or half_open_probes < 1:
+            raise ValueError("failure_threshold and half_open_probes must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.clock = clock
+        self.failures = 0
+        self.opened = 0
+        self._state = State.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> State:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> State:
+        """
+        Get the state, turning an open breaker half-open once its reset timeout has passed.
+        """
+        if self._state is State.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            self._state = State.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def retry_after(self) -> float:
+        """
+        Get the seconds until an open breaker lets a probe through.
+
+        Returns:
+            float: Remaining seconds, 0 if the breaker is not open.
+        """
+        with self._lock:
+            if self._current_state() is not State.OPEN:
+                return 0.0
+            return max(self._opened_at + self.reset_timeout - self.clock(), 0.0)
+
+    def allow(self) -> bool:
+        """
+        Check if a request may be sent, counting it as a probe while half-open.
+
+        Returns:
+            bool: True if the request may be sent, False if it should fail fast.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state is State.CLOSED:
+                return True
+            if state is State.HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """
+        Record a successful request, closing the breaker.
+        """
+        with self._lock:
+            self._state = State.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """
+        Record a failed request, opening the breaker after too many or on a failed probe.
+        """
+        with self._lock:
+            self.failures += 1
+            if self._current_state() is State.HALF_OPEN or (self._state is State.CLOSED and self.failures >= self.failure_threshold):
+                self._state = State.OPEN
+                self._opened_at = self.clock()
+                self.opened += 1
+
+    def reset(self) -> None:
+        """
+        Close the breaker and forget its failures.
+        """
+        with self._lock:
+            self._state = State.CLOSED
+            self.failures = 0
+            self._probes = 0
+
+    def __repr__(self) -> str:
+        return f"CircuitBreaker(state={self.state}, failures={self.failures})"
@@ -0,0 +1,423 @@
+import math
+import struct
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+from sensors.base_sensor import BaseSensor
+
+_DOUBLE = struct.Struct(">d")
+_BITS = struct.Struct(">Q")
+_MASK64 = (1 << 64) - 1
+_WINDOW = 20
+
+# Delta-of-delta buckets: (control bits, control length, value bits, smallest value).
+_DOD_BUCKETS = ((0b10, 2, 7, -63), (0b110, 3, 9, -255), (0b1110, 4, 12, -2047))
+
+def _float_bits(value: float) -> int:
+    return _BITS.unpack(_DOUBLE.pack(value))[0]
+
+def _bits_float(bits: int) -> float:
+    return _DOUBLE.unpack(_BITS.pack(bits))[0]
+
+
+class _BitWriter:
+    """
+    Append-only bit stream flushing whole bytes into a bytearray.
+    """
+
+    __slots__ = ("data", "_acc", "_nbits")
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self._acc = 0
+        self._nbits = 0
+
+    def write(self, value: int, bits: int) -> None:
+        self._acc = (self._acc << bits) | value
+        self._nbits += bits
+        if self._nbits >= 64:
+            spare = self._nbits & 7
+            self.data += (self._acc >> spare).to_bytes(self._nbits >> 3, "big")
+            self._acc &= (1 << spare) - 1
+            self._nbits = spare
+
+    def getvalue(self) -> bytes:
+        """
+        Get the bytes written so far, padding the last byte with zero bits.
+        """
+        if not self._nbits:
+            return bytes(self.data)
+        padding = -self._nbits & 7
+        return bytes(self.data) + (self._acc << padding).to_bytes((self._nbits + padding) >> 3, "big")
+
+    def __len__(self) -> int:
+        return len(self.data) + (self._nbits + 7 >> 3)
+
+
+class _BlockEncoder:
+    """
+    Gorilla encoder of one block: the first sample raw, then delta-of-delta timestamps and XOR-ed values.
+    """
+
+    __slots__ = ("stream", "count", "_ticks", "_delta", "_bits", "_leading", "_trailing")
+
+    def __init__(self) -> None:
+        self.stream = _BitWriter()
+        self.count = 0
+        self._ticks = 0
+        self._delta = 0
+        self._bits = 0
+        self._leading = -1
+        self._trailing = 0
+
+    def append(self, ticks: int, value: float) -> None:
+        stream = self.stream
+        bits = _float_bits(value)
+        if self.count == 0:
+            stream.write(ticks & _MASK64, 64)
+            stream.write(bits, 64)
+        else:
+            delta = ticks - self._ticks
+            self._write_dod(delta - self._delta)
+            self._delta = delta
+            self._write_xor(bits ^ self._bits)
+        self._ticks = ticks
+        self._bits = bits
+        self.count += 1
+
+    def _write_dod(self, dod: int) -> None:
+        if dod == 0:
+            self.stream.write(0, 1)
+            return
+        for control, control_bits, value_bits, low in _DOD_BUCKETS:
+            if low <= dod <= -low + 1:
+                self.stream.write((control << value_bits) | (dod - low), control_bits + value_bits)
+                return
+        self.stream.write(0b1111, 4)
+        self.stream.write(dod & _MASK64, 64)
+
+    def _write_xor(self, xor: int) -> None:
+        stream = self.stream
+        if xor == 0:
+            stream.write(0, 1)
+            return
+        leading = min(64 - xor.bit_length(), 31)
+        trailing = (xor & -xor).bit_length() - 1
+        if self._leading >= 0 and leading >= self._leading and trailing >= self._trailing:
+            length = 64 - self._leading - self._trailing
+            stream.write((0b10 << length) | (xor >> self._trailing), 2 + length)
+            return
+        length = 64 - leading - trailing
+        stream.write((((0b11 << 5 | leading) << 6 | length - 1) << length) | (xor >> trailing), 13 + length)
+        self._leading = leading
+        self._trailing = trailing
+
+
+def _decode_block(data: bytes, count: int) -> Iterator[Tuple[int, float]]:
+    """
+    Decode the (ticks, value) samples of a block.
+
+    Every sample takes at most 145 bits, so it is read from a 20-byte window
+    starting at its first byte instead of shifting the whole block; reads are
+    inlined because this loop dominates decoding.
+
+    Args:
+        data (bytes): The encoded block.
+        count (int): Number of samples in the block.
+
+    Yields:
+        Tuple[int, float]: Timestamp in ticks and value of every sample.
+    """
+    if not count:
+        return
+    ticks = int.from_bytes(data[:8], "big")
+    if ticks >> 63:
+        ticks -= 1 << 64
+    bits = int.from_bytes(data[8:16], "big")
+    yield ticks, _bits_float(bits)
+    data += bytes(_WINDOW)
+    position = 128
+    delta = 0
+    leading = trailing = 0
+    from_bytes = int.from_bytes
+    for _ in range(count - 1):
+        start = position >> 3
+        window = from_bytes(data[start:start + _WINDOW], "big")
+        left = _WINDOW * 8 - (position & 7) - 1
+        if (window >> left) & 1:
+            for _, _, value_bits, low in _DOD_BUCKETS:
+                left -= 1
+                if not (window >> left) & 1:
+                    left -= value_bits
+                    delta += ((window >> left) & ((1 << value_bits) - 1)) + low
+                    break
+            else:
+                left -= 64
+                dod = (window >> left) & _MASK64
+                delta += dod - (1 << 64) if dod >> 63 else dod
+        ticks += delta
+        left -= 1
+        if (window >> left) & 1:
+            left -= 1
+            if (window >> left) & 1:
+                left -= 11
+                header = (window >> left) & 0x7FF
+                leading = header >> 6
+                trailing = 63 - leading - (header & 0x3F)
+            length = 64 - leading - trailing
+            left -= length
+            bits ^= ((window >> left) & ((1 << length) - 1)) << trailing
+        position = (start + _WINDOW) * 8 - left
+        yield ticks, _bits_float(bits)
+
+
+class CompressedSeries:
+    """
+    Append-only time series of float readings compressed with the Gorilla encoding.
+
+    Samples are grouped into blocks of `block_size`. Inside a block, timestamps
+    are stored as the difference between consecutive deltas (delta-of-delta) in
+    1 to 68 bits, so regular polling costs one bit per sample, and values are
+    XOR-ed with the previous value and only the changed bits are stored, so a
+    repeated value costs one bit and a slowly changing one a few bits. Every
+    block starts with its first sample uncompressed and its first timestamp is
+    kept as a checkpoint, so random access and time ranges decode one block
+    instead of the whole series.
+
+    Timestamps are stored as integer ticks of 1/`ticks_per_second` seconds and
+    must not decrease. Values are stored exactly; missing values are NaN.
+
+    Attributes:
+        block_size (int): Number of samples per block.
+        ticks_per_second (int): Resolution of the stored timestamps.
+    """
+
+    def __init__(self, block_size: int = 256, ticks_per_second: int = 1000) -> None:
+        """
+        Initialize an empty series.
+
+        Args:
+            block_size (int): Number of samples per block. Default is 256.
+            ticks_per_second (int): Resolution of the stored timestamps. Default is 1000, i.e. milliseconds.
+        """
+        if block_size < 1 or ticks_per_second < 1:
+            raise ValueError("block_size and ticks_per_second must be at least 1")
+        self.block_size = block_size
+        self.ticks_per_second = ticks_per_second
+        self._blocks: List[bytes] = []
+        self._starts = array("d")
+        self._open = _BlockEncoder()
+        self._last_ticks: Optional[int] = None
+
+    def __len__(self) -> int:
+        """
+        Return the number of samples.
+        """
+        return len(self._blocks) * self.block_size + self._open.count
+
+    def append(self, timestamp: float, value: Optional[float]) -> None:
+        """
+        Add a sample.
+
+        Args:
+            timestamp (float): Time of the reading as a Unix timestamp, not earlier than the previous one.
+            value (Optional[float]): Value of the reading, None if it is missing.
+
+        Raises:
+            ValueError: If the timestamp is earlier than the previous one.
+        """
+        ticks = round(timestamp * self.ticks_per_second)
+        if self._last_ticks is not None and ticks < self._last_ticks:
+            raise ValueError(f"Timestamp {timestamp} is earlier than the previous sample")
+        self._last_ticks = ticks
+        if self._open.count == 0:
+            self._starts.append(ticks / self.ticks_per_second)
+        self._open.append(ticks, math.nan if value is None else float(value))
+        if self._open.count == self.block_size:
+            self._blocks.append(self._open.stream.getvalue())
+            self._open = _BlockEncoder()
+
+    def _block(self, index: int) -> Iterator[Tuple[float, float]]:
+        """
+        Decode the samples of a block.
+        """
+        if index < len(self._blocks):
+            data, count = self._blocks[index], self.block_size
+        else:
+            data, count = self._open.stream.getvalue(), self._open.count
+        tps = self.ticks_per_second
+        return ((ticks / tps, value) for ticks, value in _decode_block(data, count))
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        """
+        Iterate over the (timestamp, value) samples from the oldest to the newest, decoding one block at a time.
+        """
+        for index in range(len(self._starts)):
+            yield from self._block(index)
+
+    def __getitem__(self, index: int) -> Tuple[float, float]:
+        """
+        Get a sample by position, decoding only its block.
+
+        Args:
+            index (int): Position of the sample, negative from the end.
+
+        Returns:
+            Tuple[float, float]: The timestamp and value of the sample.
+
+        Raises:
+            IndexError: If the position is out of range.
+        """
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("series index out of range")
+        block, offset = divmod(index, self.block_size)
+        for position, sample in enumerate(self._block(block)):
+            if position == offset:
+                return sample
+
+    def range(self, start: float = float("-inf"), end: float = float("inf")) -> Iterator[Tuple[float, float]]:
+        """
+        Iterate over the samples within a time range, starting at the checkpoint of the first block that may contain it.
+
+        Args:
+            start (float): Earliest timestamp, inclusive. Default is no limit.
+            end (float): Latest timestamp, inclusive. Default is no limit.
+
+        Yields:
+            Tuple[float, float]: The (timestamp, value) samples in time order.
+        """
+        first = max(bisect_left(self._starts, start) - 1, 0)
+        last = bisect_right(self._starts, end)
+        for index in range(first, last):
+            for timestamp, value in self._block(index):
+                if timestamp > end:
+                    return
+                if timestamp >= start:
+                    yield timestamp, value
+
+    def timestamps(self) -> array:
+        """
+        Get all timestamps.
+
+        Returns:
+            array: The timestamps as an array('d').
+        """
+        return array("d", (timestamp for timestamp, _ in self))
+
+    def values(self) -> array:
+        """
+        Get all values.
+
+        Returns:
+            array: The values as an array('d'), NaN for missing ones.
+        """
+        return array("d", (value for _, value in self))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Get the size of the encoded samples and block checkpoints in bytes.
+
+        Returns:
+            int: Number of bytes.
+        """
+        return sum(map(len, self._blocks)) + len(self._open.stream) + self._starts.itemsize * len(self._starts)
+
+    def bytes_per_sample(self) -> float:
+        """
+        Get the average encoded size of a sample.
+
+        Returns:
+            float: Bytes per sample, 0 for an empty series.
+        """
+        return self.nbytes / len(self) if len(self) else 0.0
+
+
+class CompressedStore:
+    """
+    Compressed series of many sensors, one per (sensor id, metric).
+
+    Attributes:
+        block_size (int): Number of samples per block of every series.
+        ticks_per_second (int): Resolution of the stored timestamps.
+    """
+
+    def __init__(self, block_size: int = 256, ticks_per_second: int = 1000) -> None:
+        """
+        Initialize an empty store.
+
+        Args:
+            block_size (int): Number of samples per block of every series. Default is 256.
+            ticks_per_second (int): Resolution of the stored timestamps. Default is 1000.
+        """
+        self.block_size = block_size
+        self.ticks_per_second = ticks_per_second
+        self._series: Dict[Tuple[Hashable, str], CompressedSeries] = {}
+
+    def append(self, timestamp: float, sensor_id: Hashable, metric: str, value: Optional[float]) -> None:
+        """
+        Add a reading to the series of a sensor's metric, creating it if needed.
+
+        Args:
+            timestamp (float): Time of the reading as a Unix timestamp.
+            sensor_id (Hashable): Identifier of the sensor.
+            metric (str): Name of the metric.
+            value (Optional[float]): Value of the reading, None if it is missing.
+        """
+        series = self._series.get((sensor_id, metric))
+        if series is None:
+            series = self._series[sensor_id, metric] = CompressedSeries(self.block_size, self.ticks_per_second)
+        series.append(timestamp, value)
+
+    def append_sensor(self, sensor: BaseSensor, timestamp: Optional[float] = None) -> int:
+        """
+        Add the last data of a sensor, one reading per metric.
+
+        Args:
+            sensor (BaseSensor): Sensor of any type, including stations.
+            timestamp (Optional[float]): Time of the reading. Default is the current time.
+
+        Returns:
+            int: Number of readings added.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        readings = sensor.readings()
+        for metric, value in readings:
+            self.append(timestamp, sensor.sensor_id, metric, value)
+        return len(readings)
+
+    def series(self, sensor_id: Hashable, metric: str) -> CompressedSeries:
+        """
+        Get the series of a sensor's metric.
+
+        Args:
+            sensor_id (Hashable): Identifier of the sensor.
+            metric (str): Name of the metric.
+
+        Returns:
+            CompressedSeries: The series.
+
+        Raises:
+            KeyError: If the sensor has no readings of the metric.
+        """
+        return self._series[sensor_id, metric]
+
+    def __len__(self) -> int:
+        """
+        Return the number of series.
+        """
+        return len(self._series)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Get the encoded size of all series in bytes.
+
+        Returns:
+            int: Number of bytes.
+        """
+        return sum(series.nbytes for series in self._series.values())
@@ -0,0 +1,137 @@
+import json
+from typing import Any, Callable, List, Optional, Union
+
+BACKENDS = ("orjson", "ujson", "json")
+
+def _load_backend(name: str) -> Callable[[Union[bytes, str]], Any]:
+    """
+    Import a JSON backend and get its decoding function.
+
+    Args:
+        name (str): One of BACKENDS.
+
+    Returns:
+        Callable[[Union[bytes, str]], Any]: Function decoding bytes or text.
+
+    Raises:
+        ImportError: If the backend is not installed.
+        ValueError: If the backend is unknown.
+    """
+    if name == "orjson":
+        import orjson
+        return orjson.loads
+    if name == "ujson":
+        import ujson
+        return ujson.loads
+    if name == "json":
+        return json.loads
+    raise ValueError(f"Unknown JSON backend: {name}")
+
+def available_backends() -> List[str]:
+    """
+    Get the JSON backends installed in this environment, fastest first.
+
+    Returns:
+        List[str]: Names of the usable backends; 'json' is always available.
+    """
+    names = []
+    for name in BACKENDS:
+        try:
+            _load_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+class JsonDecoder:
+    """
+    Decodes the JSON documents read by sensors with the fastest available backend.
+
+    orjson is used when installed, then ujson, then the standard library. Every
+    backend accepts bytes, so files and HTTP bodies are decoded without first
+    being turned into text, and every decoding error is raised as
+    json.JSONDecodeError regardless of the backend.
+
+    Documents are always decoded whole: skipping members with a Python-level
+    scanner is several times slower than a C backend decoding them, so records
+    of large data files are read through the location index instead.
+
+    Attributes:
+        backend (str): Name of the backend in use.
+    """
+
+    def __init__(self, backend: Optional[str] = None) -> None:
+        """
+        Initialize the decoder.
+
+        Args:
+            backend (Optional[str]): One of BACKENDS. Default is the fastest installed one.
+
+        Raises:
+            ImportError: If the requested backend is not installed.
+        """
+        self.backend = available_backends()[0] if backend is None else backend
+        self._loads = _load_backend(self.backend)
+
+    def loads(self, data: Union[bytes, bytearray, str]) -> Any:
+        """
+        Decode a JSON document.
+
+        Args:
+            data (Union[bytes, bytearray, str]): The document.
+
+        Returns:
+            Any: The decoded document.
+
+        Raises:
+            json.JSONDecodeError: If the document is not valid JSON.
+        """
+        try:
+            return self._loads(data)
+        except json.JSONDecodeError:
+            raise
+        except (ValueError, TypeError) as e:
+            raise json.JSONDecodeError(str(e), data if isinstance(data, str) else "", 0) from None
+
+    def load(self, path: str) -> Any:
+        """
+        Read and decode a JSON file.
+
+        Args:
+            path (str): Path to the file.
+
+        Returns:
+            Any: The decoded document.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            json.JSONDecodeError: If the file is not valid JSON.
+        """
+        with open(path, "rb") as file:
+            return self.loads(file.read())
+
+
+_decoder: Optional[JsonDecoder] = None
+
+def get_decoder() -> JsonDecoder:
+    """
+    Get the shared decoder, creating it with the fastest installed backend on first use.
+
+    Returns:
+        JsonDecoder: The shared decoder.
+    """
+    global _decoder
+    if _decoder is None:
+        _decoder = JsonDecoder()
+    return _decoder
+
+def set_decoder(decoder: JsonDecoder) -> None:
+    """
+    Replace the shared decoder used by all sensors.
+
+    Args:
+        decoder (JsonDecoder): The decoder to use from now on.
+    """
+    global _decoder
+    _decoder = decoder
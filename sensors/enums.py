@@ -0,0 +1,14 @@
+from enum import Enum
+
+class _StrEnum(str, Enum):
+    """
+    Enum whose members are their string values, so they compare, hash and format like plain strings.
+    """
+
+    __hash__ = str.__hash__
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.value, format_spec)
@@ -0,0 +1,267 @@
+import json
+import math
+import os
+import struct
+from itertools import chain, islice
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from sensors.base_sensor import BaseSensor
+from sensors.bulk_loader import METRICS
+from sensors.registry import SENSOR_TYPES
+
+FORMATS: Dict[str, str] = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".bin": "binary"}
+HEADER: Tuple[str, ...] = ("sensor_id", "location", "type")
+MAGIC = b"MSEX"
+VERSION = 1
+CHUNK_ROWS = 8192
+BUFFER_SIZE = 1 << 20
+
+_TYPE_NAMES = {sensor_class: name for name, sensor_class in SENSOR_TYPES.items()}
+_PREFIX = struct.Struct("<4sHI")
+_SUFFIX = struct.Struct("<I4s")
+
+def iter_rows(sensors: Iterable[BaseSensor], metrics: Sequence[str] = METRICS) -> Iterator[tuple]:
+    """
+    Walk a fleet once, yielding one flat row per sensor.
+
+    A row is (sensor_id, location, type, value of every metric). A metric the
+    sensor does not measure, has no data for, or whose value is not a finite
+    number is None.
+
+    Args:
+        sensors (Iterable[BaseSensor]): Sensors of any type, including stations, e.g. a SensorRegistry.
+        metrics (Sequence[str]): Metric columns. Default is every sensor's 'city_data' keys.
+
+    Yields:
+        tuple: The row of every sensor, in fleet order.
+    """
+    return _rows(sensors, metrics)
+
+def _rows(sensors: Iterable[BaseSensor], metrics: Sequence[str], missing: Any = None, encode: Optional[Callable[[Any], Any]] = None, encode_id: Optional[Callable[[Any], Any]] = None) -> Iterator[tuple]:
+    """
+    Yield the rows of `iter_rows` with `missing` for missing values and, if `encode` is given, encoded strings.
+
+    `encode` is applied once per distinct location and type name, `encode_id`
+    to every sensor id that is not an integer. Sensors that read a single metric through
+    the generic `readings` take a fast path with a precomputed row layout.
+    """
+    columns = {metric: index for index, metric in enumerate(metrics)}
+    empty = (missing,) * len(metrics)
+    layouts: Dict[type, tuple] = {}
+    encoded: Dict[str, Any] = {}
+    generic_readings = BaseSensor.readings
+    for sensor in sensors:
+        sensor_type = type(sensor)
+        layout = layouts.get(sensor_type)
+        if layout is None:
+            name = _TYPE_NAMES.get(sensor_type) or sensor_type.__name__
+            name = name if encode is None else encode(name)
+            index = columns.get(sensor_type.FILE_KEYS[0]) if sensor_type.readings is generic_readings and sensor_type.FILE_KEYS else None
+            head = None if index is None else (name, *empty[:index])
+            layout = layouts[sensor_type] = (name, head, None if index is None else empty[index + 1:])
+        name, head, tail = layout
+        sensor_id = sensor.sensor_id
+        location = sensor.location
+        if encode is not None:
+            if type(sensor_id) is not int:
+                sensor_id = encode_id(sensor_id)
+            text = encoded.get(location)
+            if text is None:
+                text = encoded[location] = encode(location)
+            location = text
+        if head is not None:
+            value = sensor.last_data
+            # value - value is 0 for finite numbers and NaN for NaN and infinities.
+            if type(value) in (int, float) and value - value == 0:
+                yield (sensor_id, location, *head, value, *tail)
+            else:
+                yield (sensor_id, location, name, *empty)
+            continue
+        values = list(empty)
+        for metric, value in sensor.readings():
+            index = columns.get(metric)
+            if index is not None and type(value) in (int, float) and value - value == 0:
+                values[index] = value
+        yield (sensor_id, location, name, *values)
+
+def _chunks(rows: Iterator[tuple], chunk_rows: int) -> Iterator[List[tuple]]:
+    """
+    Split rows into lists of up to `chunk_rows` rows.
+    """
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return
+        yield chunk
+
+def _write_text(rows: Iterator[tuple], file: IO[str], line: str, chunk_rows: int) -> int:
+    """
+    Format every chunk of rows with one %-operation over a repeated line template and write it.
+    """
+    count = 0
+    for chunk in _chunks(rows, chunk_rows):
+        file.write((line * len(chunk)) % tuple(chain.from_iterable(chunk)))
+        count += len(chunk)
+    return count
+
+def _csv_field(value: Any) -> str:
+    text = str(value)
+    if any(char in text for char in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+def write_csv(sensors: Iterable[BaseSensor], file: IO[str], metrics: Sequence[str] = METRICS, chunk_rows: int = CHUNK_ROWS) -> int:
+    """
+    Write the rows of a fleet as CSV with a header line; missing values are empty fields.
+
+    Args:
+        sensors (Iterable[BaseSensor]): Sensors of any type, including stations.
+        file (IO[str]): Text file opened with newline=''.
+        metrics (Sequence[str]): Metric columns. Default is every sensor's 'city_data' keys.
+        chunk_rows (int): Rows formatted per write. Default is 8192.
+
+    Returns:
+        int: Number of rows written.
+    """
+    names = (*HEADER, *metrics)
+    file.write(",".join(_csv_field(name) for name in names) + "\n")
+    line = ",".join(["%s"] * len(names)) + "\n"
+    return _write_text(_rows(sensors, metrics, "", _csv_field, _csv_field), file, line, chunk_rows)
+
+def write_ndjson(sensors: Iterable[BaseSensor], file: IO[str], metrics: Sequence[str] = METRICS, chunk_rows: int = CHUNK_ROWS) -> int:
+    """
+    Write the rows of a fleet as newline-delimited JSON objects; missing values are null.
+
+    Lines are formatted from one template instead of serializing a dictionary
+    per row, and every distinct location is escaped once.
+
+    Args:
+        sensors (Iterable[BaseSensor]): Sensors of any type, including stations.
+        file (IO[str]): Text file.
+        metrics (Sequence[str]): Metric columns. Default is every sensor's 'city_data' keys.
+        chunk_rows (int): Rows formatted per write. Default is 8192.
+
+    Returns:
+        int: Number of rows written.
+    """
+    line = "{" + ",".join(json.dumps(name).replace("%", "%%") + ":%s" for name in (*HEADER, *metrics)) + "}\n"
+    return _write_text(_rows(sensors, metrics, "null", json.dumps, json.dumps), file, line, chunk_rows)
+
+def write_binary(sensors: Iterable[BaseSensor], file: IO[bytes], metrics: Sequence[str] = METRICS, chunk_rows: int = CHUNK_ROWS) -> int:
+    """
+    Write the rows of a fleet as fixed-width little-endian records.
+
+    The file starts with the magic b'MSEX', a uint16 version and a uint32 length
+    followed by a JSON header listing the metrics. Every record is an int64
+    sensor id, the uint32 codes of its location and type, and one float64 per
+    metric, NaN for missing values. The file ends with a JSON footer holding the
+    strings the codes refer to and the number of rows, its uint32 length and the
+    magic again. Every chunk of records is packed with a single `struct` call.
+
+    Args:
+        sensors (Iterable[BaseSensor]): Sensors of any type, including stations, with integer ids.
+        file (IO[bytes]): Binary file.
+        metrics (Sequence[str]): Metric columns. Default is every sensor's 'city_data' keys.
+        chunk_rows (int): Records packed per write. Default is 8192.
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        ValueError: If a sensor id is not an integer.
+    """
+    header = json.dumps({"metrics": list(metrics)}).encode()
+    file.write(_PREFIX.pack(MAGIC, VERSION, len(header)))
+    file.write(header)
+    strings: Dict[str, int] = {}
+
+    def encode(value: str) -> int:
+        return strings.setdefault(value, len(strings))
+
+    def reject_id(sensor_id: Any) -> int:
+        raise ValueError(f"Binary export needs integer sensor ids, got {sensor_id!r}")
+
+    record = _record_format(len(metrics))
+    packers: Dict[int, struct.Struct] = {}
+    count = 0
+    for chunk in _chunks(_rows(sensors, metrics, math.nan, encode, reject_id), chunk_rows):
+        packer = packers.get(len(chunk))
+        if packer is None:
+            packer = packers[len(chunk)] = struct.Struct("<" + record * len(chunk))
+        file.write(packer.pack(*chain.from_iterable(chunk)))
+        count += len(chunk)
+    footer = json.dumps({"strings": list(strings), "rows": count}).encode()
+    file.write(footer)
+    file.write(_SUFFIX.pack(len(footer), MAGIC))
+    return count
+
+def _record_format(metric_count: int) -> str:
+    return "qII" + "d" * metric_count
+
+def read_binary(path: str) -> Tuple[List[str], Iterator[tuple]]:
+    """
+    Read a file written by `write_binary`.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        Tuple[List[str], Iterator[tuple]]: The metrics and the rows in the form of `iter_rows`, NaN values as None.
+
+    Raises:
+        ValueError: If the file is not a binary export.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < _PREFIX.size + _SUFFIX.size or data[:4] != MAGIC or data[-4:] != MAGIC:
+        raise ValueError(f"{path} is not a binary fleet export")
+    _, version, header_length = _PREFIX.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary export version {version}")
+    body_start = _PREFIX.size + header_length
+    metrics = json.loads(data[_PREFIX.size:body_start])["metrics"]
+    footer_length, _ = _SUFFIX.unpack_from(data, len(data) - _SUFFIX.size)
+    footer_start = len(data) - _SUFFIX.size - footer_length
+    footer = json.loads(data[footer_start:footer_start + footer_length])
+    record = struct.Struct("<" + _record_format(len(metrics)))
+    if footer_start - body_start != footer["rows"] * record.size:
+        raise ValueError(f"{path} is truncated")
+
+    def rows() -> Iterator[tuple]:
+        strings = footer["strings"]
+        for sensor_id, location_code, type_code, *values in record.iter_unpack(data[body_start:footer_start]):
+            yield (sensor_id, strings[location_code], strings[type_code], *[None if value != value else value for value in values])
+
+    return metrics, rows()
+
+def export_fleet(sensors: Iterable[BaseSensor], path: str, fmt: Optional[str] = None, metrics: Sequence[str] = METRICS, chunk_rows: int = CHUNK_ROWS) -> int:
+    """
+    Export the last data of a fleet to a file, one row per sensor.
+
+    The fleet is walked once and rows are streamed to the file in chunks through
+    a large write buffer, so memory stays bounded regardless of the fleet size.
+
+    Args:
+        sensors (Iterable[BaseSensor]): Sensors of any type, including stations, e.g. a SensorRegistry.
+        path (str): Path to the output file.
+        fmt (Optional[str]): 'csv', 'ndjson' or 'binary'. Default is inferred from the extension of `path`.
+        metrics (Sequence[str]): Metric columns. Default is every sensor's 'city_data' keys.
+        chunk_rows (int): Rows formatted per write. Default is 8192.
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        ValueError: If the format is unknown, or a sensor id is not an integer in the binary format.
+    """
+    if fmt is None:
+        fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise ValueError(f"Cannot infer the export format of {path}, use one of {', '.join(FORMATS)} or pass fmt")
+    if fmt == "binary":
+        with open(path, "wb", buffering=BUFFER_SIZE) as file:
+            return write_binary(sensors, file, metrics, chunk_rows)
+    writers = {"csv": write_csv, "ndjson": write_ndjson}
+    if fmt not in writers:
+        raise ValueError(f"Unknown export format: {fmt}")
+    with open(path, "w", newline="", encoding="utf-8", buffering=BUFFER_SIZE) as file:
+        return writers[fmt](sensors, file, metrics, chunk_rows)
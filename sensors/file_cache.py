@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+from sensors import metrics
+from sensors.decoder import get_decoder
+
+class FileCache:
+    """
+    Process-wide cache of parsed JSON data files.
+
+    Files are decoded by the shared JSON decoder.
+
+    Entries are keyed by the absolute file path and validated against the file's
+    (mtime, size, inode) on every lookup, so a changed file is parsed again while
+    an unchanged one is served from memory. At most `max_files` distinct files are
+    kept resident; the least recently used one is evicted first.
+
+    Attributes:
+        max_files (int): Maximum number of files kept in the cache.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that had to parse the file.
+        evictions (int): Number of entries dropped because of the LRU cap.
+    """
+
+    def __init__(self, max_files: int = 16) -> None:
+        """
+        Initialize an empty file cache.
+
+        Args:
+            max_files (int): Maximum number of files kept in the cache. Default is 16.
+        """
+        if max_files < 1:
+            raise ValueError("max_files must be at least 1")
+        self.max_files = max_files
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int, int], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> Tuple[int, int, int]:
+        """
+        Build the validation key of a file from its stat result.
+
+        Args:
+            stat (os.stat_result): Result of os.stat on the file.
+
+        Returns:
+            Tuple[int, int, int]: The (mtime_ns, size, inode) of the file.
+        """
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def load(self, path: str) -> Any:
+        """
+        Return the parsed content of a JSON file, parsing it only if needed.
+
+        The returned object is shared between all callers and must not be modified.
+
+        Args:
+            path (str): Path to the JSON file.
+
+        Returns:
+            Any: The parsed JSON document.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            json.JSONDecodeError: If the file is not valid JSON.
+        """
+        key = os.path.abspath(path)
+        signature = self._signature(os.stat(key))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        if metrics.registry.enabled:
+            start = time.perf_counter()
+            with open(key, "rb") as file:
+                signature = self._signature(os.fstat(file.fileno()))
+                raw = file.read()
+            decode_start = time.perf_counter()
+            data = get_decoder().loads(raw)
+            metrics.add_phase("io", decode_start - start)
+            metrics.add_phase("decode", time.perf_counter() - decode_start)
+        else:
+            with open(key, "rb") as file:
+                signature = self._signature(os.fstat(file.fileno()))
+                data = get_decoder().loads(file.read())
+
+        with self._lock:
+            self._entries[key] = (signature, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_files:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return data
+
+    def invalidate(self, path: str) -> None:
+        """
+        Drop the cached entry of a file, if any.
+
+        Args:
+            path (str): Path to the JSON file.
+        """
+        with self._lock:
+            self._entries.pop(os.path.abspath(path), None)
+
+    def clear(self) -> None:
+        """
+        Drop all cached entries and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+
+        Returns:
+            Dict[str, int]: Hits, misses, evictions and the number of resident files.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "files": len(self._entries),
+            }
+
+    def __len__(self) -> int:
+        """
+        Return the number of resident files.
+        """
+        return len(self._entries)
+
+
+file_cache = FileCache()
@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional
+from sensors.base_sensor import BaseSensor
+
+class FleetResult:
+    """
+    Outcome of reading one sensor of a fleet.
+
+    Attributes:
+        sensor (BaseSensor): The sensor that was read.
+        data (Any): The data read by the sensor, None if the read failed.
+        error (Optional[BaseException]): The exception raised by the read, None on success.
+        elapsed (float): Seconds the read took, including time spent waiting for a slot.
+    """
+
+    def __init__(self, sensor: BaseSensor, data: Any = None, error: Optional[BaseException] = None, elapsed: float = 0.0) -> None:
+        self.sensor = sensor
+        self.data = data
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        """
+        Check if the read succeeded.
+
+        Returns:
+            bool: True if the read did not raise, False otherwise.
+        """
+        return self.error is None
+
+    def __repr__(self) -> str:
+        outcome = f"data={self.data!r}" if self.ok else f"error={self.error!r}"
+        return f"FleetResult(sensor_id={self.sensor.sensor_id!r}, {outcome}, elapsed={self.elapsed:.3f})"
+
+
+class _Attempt:
+    """
+    State of one read shared between the event loop and the worker thread running it.
+    """
+
+    __slots__ = ("lock", "done", "timed_out", "previous")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.done = False
+        self.timed_out = False
+        self.previous: Any = None
+
+
+def _run_read(sensor: BaseSensor, attempt: _Attempt, started: Callable[[], None]) -> Any:
+    """
+    Read a sensor on a worker thread, discarding its data if the read already timed out.
+    """
+    started()
+    attempt.previous = sensor.last_data
+    try:
+        return sensor.read_data()
+    finally:
+        with attempt.lock:
+            attempt.done = True
+            if attempt.timed_out:
+                sensor.last_data = attempt.previous
+
+async def read_fleet(sensors: Iterable[BaseSensor], concurrency: int = 64, timeout: Optional[float] = None) -> List[FleetResult]:
+    """
+    Read many sensors concurrently.
+
+    At most `concurrency` reads run at the same time. A read that raises or does
+    not finish within `timeout` seconds is reported in its result and does not
+    affect the other reads. The deadline of a read starts when a worker thread
+    starts it, so reads queued behind slow ones are not charged for the wait.
+
+    A timed out read cannot be interrupted, so it keeps its worker thread until
+    the underlying HTTP timeout fires; configure the shared HttpClient with a
+    pool size matching `concurrency` for large fleets. When such a read finishes
+    late, its data is dropped: the sensor's last data is restored to the value
+    it had before the read, so it never contradicts the reported timeout.
+    Readings the sensor recorded into its history, monitor or sink during the
+    late read are kept.
+
+    Args:
+        sensors (Iterable[BaseSensor]): Sensors to read.
+        concurrency (int): Maximum number of reads in progress. Default is 64.
+        timeout (Optional[float]): Deadline of every single read in seconds, counted from its start. Default is no deadline.
+
+    Returns:
+        List[FleetResult]: One result per sensor, in the order of `sensors`.
+    """
+    import asyncio
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fleet")
+
+    async def read_one(sensor: BaseSensor) -> FleetResult:
+        start = time.perf_counter()
+        async with semaphore:
+            attempt = _Attempt()
+            started = loop.create_future()
+
+            def signal() -> None:
+                loop.call_soon_threadsafe(started.set_result, None)
+
+            future = loop.run_in_executor(executor, _run_read, sensor, attempt, signal)
+            try:
+                await asyncio.wait({started, future}, return_when=asyncio.FIRST_COMPLETED)
+                data = await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError as e:
+                with attempt.lock:
+                    if not attempt.done:
+                        attempt.timed_out = True
+                        return FleetResult(sensor, error=e, elapsed=time.perf_counter() - start)
+                try:
+                    data = await future
+                except Exception as e:
+                    return FleetResult(sensor, error=e, elapsed=time.perf_counter() - start)
+            except Exception as e:
+                return FleetResult(sensor, error=e, elapsed=time.perf_counter() - start)
+        return FleetResult(sensor, data=data, elapsed=time.perf_counter() - start)
+
+    try:
+        return list(await asyncio.gather(*(read_one(sensor) for sensor in sensors)))
+    finally:
+        executor.shutdown(wait=False)
@@ -0,0 +1,236 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from sensors.api_cache import ResponseCache, response_cache
+from sensors.base_sensor import BaseSensor
+from sensors.fleet import FleetResult
+
+GROUP_LIMIT = 20
+
+def split_city_url(url: str) -> Optional[Tuple[Hashable, int]]:
+    """
+    Split a current weather URL selecting a city by ID into its group endpoint and the ID.
+
+    For example `.../data/2.5/weather?id=3060835&units=metric&appid=KEY` belongs to
+    the group `.../data/2.5/group` with `units=metric&appid=KEY` and has the ID 3060835.
+    URLs selecting a city by name or coordinates cannot be grouped.
+
+    Args:
+        url (str): API URL of a sensor.
+
+    Returns:
+        Optional[Tuple[Hashable, int]]: The group key and the city ID, None if the URL cannot be grouped.
+    """
+    parts = urlsplit(url)
+    if not parts.path.endswith("/weather"):
+        return None
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    ids = [value for name, value in query if name == "id"]
+    if len(ids) != 1 or not ids[0].isdigit():
+        return None
+    base = urlunsplit((parts.scheme, parts.netloc, parts.path[:-len("weather")] + "group", "", ""))
+    return (base, tuple(sorted((name, value) for name, value in query if name != "id"))), int(ids[0])
+
+def group_url(key: Hashable, city_ids: Sequence[int]) -> str:
+    """
+    Build the group endpoint URL of a batch of city IDs.
+
+    Args:
+        key (Hashable): Group key returned by split_city_url.
+        city_ids (Sequence[int]): IDs of the cities, at most GROUP_LIMIT.
+
+    Returns:
+        str: The group request URL.
+    """
+    base, params = key
+    return base + "?" + urlencode([("id", ",".join(str(city_id) for city_id in city_ids))] + list(params), safe=",")
+
+
+class GroupBatcher:
+    """
+    Reads API-sourced sensors through OpenWeatherMap's group endpoint.
+
+    Sensors whose URL selects a city by ID (`weather?id=...`) are grouped by
+    endpoint and the remaining query parameters, and up to `max_ids` distinct
+    cities are fetched with one group request. Every city of the response is
+    then parsed into the sensors of that city. Group responses go through a
+    response cache, so they share its TTL and single-flight behaviour. Sensors
+    that cannot be grouped are read one by one as usual.
+
+    Reads can be batched explicitly with `read`, or collected across callers with
+    `submit`, which waits up to `linger` seconds for more reads before sending.
+
+    Attributes:
+        max_ids (int): Maximum number of city IDs per group request.
+        linger (float): Seconds `submit` waits for more reads before sending a batch.
+        requests (int): Number of group requests made, including ones answered by the cache.
+    """
+
+    def __init__(self, max_ids: int = GROUP_LIMIT, cache: Optional[ResponseCache] = None, workers: int = 4, linger: float = 0.05) -> None:
+        """
+        Initialize the batcher.
+
+        Args:
+            max_ids (int): Maximum number of city IDs per group request. Default is the provider's limit of 20.
+            cache (Optional[ResponseCache]): Cache of group responses. Default is the shared response cache.
+            workers (int): Number of group requests sent concurrently. Default is 4.
+            linger (float): Seconds `submit` waits for more reads before sending a batch. Default is 0.05.
+        """
+        if not 1 <= max_ids <= GROUP_LIMIT:
+            raise ValueError(f"max_ids must be between 1 and {GROUP_LIMIT}")
+        self.max_ids = max_ids
+        self.cache = response_cache if cache is None else cache
+        self.workers = workers
+        self.linger = linger
+        self.requests = 0
+        self._pending: List[Tuple[BaseSensor, Future]] = []
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def read(self, sensors: Sequence[BaseSensor]) -> List[FleetResult]:
+        """
+        Read sensors with as few group requests as possible.
+
+        Args:
+            sensors (Sequence[BaseSensor]): Sensors to read.
+
+        Returns:
+            List[FleetResult]: Outcome of every sensor, in the order of `sensors`.
+        """
+        start = time.perf_counter()
+        results: List[Optional[FleetResult]] = [None] * len(sensors)
+        groups: Dict[Hashable, Dict[int, List[int]]] = {}
+        for index, sensor in enumerate(sensors):
+            split = split_city_url(sensor.api_url) if sensor.source == "api" and sensor.status == "active" else None
+            if split is None:
+                results[index] = self._read_one(sensor)
+                continue
+            key, city_id = split
+            groups.setdefault(key, {}).setdefault(city_id, []).append(index)
+
+        batches = []
+        for key, cities in groups.items():
+            city_ids = list(cities)
+            for offset in range(0, len(city_ids), self.max_ids):
+                batches.append((key, city_ids[offset:offset + self.max_ids]))
+        if len(batches) > 1 and self.workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(batches)), thread_name_prefix="group-api") as executor:
+                fetched = list(executor.map(lambda batch: self._fetch(*batch), batches))
+        else:
+            fetched = [self._fetch(*batch) for batch in batches]
+
+        for (key, city_ids), (items, age, error) in zip(batches, fetched):
+            for city_id in city_ids:
+                for index in groups[key][city_id]:
+                    results[index] = self._fan_out(sensors[index], city_id, items, age, error, start)
+        return results
+
+    def _read_one(self, sensor: BaseSensor) -> FleetResult:
+        start = time.perf_counter()
+        try:
+            return FleetResult(sensor, sensor.read_data(), elapsed=time.perf_counter() - start)
+        except Exception as e:
+            return FleetResult(sensor, error=e, elapsed=time.perf_counter() - start)
+
+    def _fetch(self, key: Hashable, city_ids: List[int]) -> Tuple[Dict[int, Any], Optional[float], Optional[Exception]]:
+        """
+        Send one group request.
+
+        Args:
+            key (Hashable): Group key of the cities.
+            city_ids (List[int]): IDs of the cities.
+
+        Returns:
+            Tuple[Dict[int, Any], Optional[float], Optional[Exception]]: Weather of every returned city keyed by ID,
+                the age of the response if it was served stale in place of a failing endpoint, and the exception if the request failed.
+        """
+        with self._lock:
+            self.requests += 1
+        try:
+            payload, age = self.cache.lookup(group_url(key, city_ids))
+            return {item["id"]: item for item in payload.get("list", [])}, age, None
+        except Exception as e:
+            return {}, None, e
+
+    def _fan_out(self, sensor: BaseSensor, city_id: int, items: Dict[int, Any], age: Optional[float], error: Optional[Exception], start: float) -> FleetResult:
+        """
+        Parse the weather of a city into one of its sensors.
+
+        Errors are reported as the sensor's own API read would report them. Data
+        of a stale response sets the sensor's `stale_age` and is not recorded as a new reading.
+        """
+        sensor.stale_age = None
+        try:
+            if error is not None:
+                raise RuntimeError(f"Error reading data from API: {error}")
+            if city_id not in items:
+                raise RuntimeError(f"Error reading data from API: city ID {city_id} missing from group response")
+            try:
+                sensor.parse_api_data(items[city_id])
+            except KeyError as e:
+                raise RuntimeError(f"Error reading data from API: {e}")
+        except RuntimeError as e:
+            sensor.last_data = None
+            return FleetResult(sensor, error=e, elapsed=time.perf_counter() - start)
+        sensor.stale_age = age
+        if age is None:
+            sensor.record_reading(time.time())
+        return FleetResult(sensor, sensor.last_data, elapsed=time.perf_counter() - start)
+
+    def submit(self, sensor: BaseSensor) -> "Future[Any]":
+        """
+        Queue a read to be sent with other pending reads.
+
+        The batch is sent as soon as `max_ids` reads are pending, or `linger` seconds after the first one.
+        It is always sent from a background thread, so `submit` never waits on a request.
+
+        Args:
+            sensor (BaseSensor): Sensor to read.
+
+        Returns:
+            Future[Any]: Resolves to the data read by the sensor, or to the exception of the read.
+        """
+        future: Future = Future()
+        with self._lock:
+            self._pending.append((sensor, future))
+            batch = None
+            if len(self._pending) >= self.max_ids:
+                batch = self._take_pending()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.linger, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch:
+            threading.Thread(target=self._send, args=(batch,), name="group-api-send", daemon=True).start()
+        return future
+
+    def _take_pending(self) -> List[Tuple[BaseSensor, Future]]:
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def flush(self) -> None:
+        """
+        Send all pending reads now.
+        """
+        with self._lock:
+            batch = self._take_pending()
+        if batch:
+            self._send(batch)
+
+    def _send(self, batch: List[Tuple[BaseSensor, Future]]) -> None:
+        try:
+            results = self.read([sensor for sensor, _ in batch])
+        except BaseException as e:
+            for _, future in batch:
+                future.set_exception(e)
+            raise
+        for (_, future), result in zip(batch, results):
+            if result.ok:
+                future.set_result(result.data)
+            else:
+                future.set_exception(result.error)
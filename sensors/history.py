@@ -0,0 +1,352 @@
+import math
+from array import array
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+class _MonotonicRing:
+    """
+    Monotonic queue of the sequence numbers of a window's values, kept in a fixed array('q') ring.
+
+    The values are looked up in the window's own buffer, so every entry costs
+    8 bytes instead of a (seq, value) tuple. A queue never holds more entries
+    than the window has slots.
+    """
+
+    __slots__ = ("_seqs", "_capacity", "_largest", "_head", "_tail")
+
+    def __init__(self, capacity: int, largest: bool) -> None:
+        self._seqs = array("q", bytes(8 * capacity))
+        self._capacity = capacity
+        self._largest = largest
+        self._head = 0
+        self._tail = 0
+
+    def push(self, seq: int, value: float, values: array) -> None:
+        """
+        Add the value at `seq`, dropping the queued values it dominates.
+        """
+        seqs, capacity = self._seqs, self._capacity
+        while self._tail > self._head:
+            last = values[seqs[(self._tail - 1) % capacity] % capacity]
+            if (last > value) if self._largest else (last < value):
+                break
+            self._tail -= 1
+        seqs[self._tail % capacity] = seq
+        self._tail += 1
+
+    def expire(self, seq: int) -> None:
+        """
+        Drop the value at `seq` if it is at the front of the queue.
+        """
+        if self._tail > self._head and self._seqs[self._head % self._capacity] == seq:
+            self._head += 1
+
+    def front(self, values: array) -> Optional[float]:
+        """
+        Get the extreme value of the window, None if the queue is empty.
+        """
+        if self._tail == self._head:
+            return None
+        return values[self._seqs[self._head % self._capacity] % self._capacity]
+
+
+class RollingWindow:
+    """
+    Fixed-capacity ring buffer of floats with incrementally maintained statistics.
+
+    Values are stored in a compact `array('d')`. Mean and variance are updated with
+    Welford's algorithm when a value enters or leaves the window, and min/max are
+    kept in monotonic queues of sequence numbers stored in array('q') rings, so
+    every statistic is available in O(1) without
+    rescanning the buffer. Missing values (None or NaN) are stored as NaN and
+    ignored by the statistics.
+
+    Attributes:
+        capacity (int): Maximum number of values kept in the window.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Initialize an empty window.
+
+        Args:
+            capacity (int): Maximum number of values kept in the window.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._values = array("d", bytes(8 * capacity))
+        self._seq = 0
+        self._valid = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = _MonotonicRing(capacity, largest=False)
+        self._max = _MonotonicRing(capacity, largest=True)
+
+    def __len__(self) -> int:
+        """
+        Return the number of values in the window, including missing ones.
+        """
+        return min(self._seq, self.capacity)
+
+    def append(self, value: Optional[float]) -> None:
+        """
+        Add a value to the window, evicting the oldest one if the window is full.
+
+        Args:
+            value (Optional[float]): Value to add, None if the reading is missing.
+        """
+        value = math.nan if value is None else float(value)
+        slot = self._seq % self.capacity
+        if self._seq >= self.capacity:
+            self._remove(self._values[slot], self._seq - self.capacity)
+        self._values[slot] = value
+        if not math.isnan(value):
+            self._add(value, self._seq)
+        self._seq += 1
+
+    def _add(self, value: float, seq: int) -> None:
+        self._valid += 1
+        delta = value - self._mean
+        self._mean += delta / self._valid
+        self._m2 += delta * (value - self._mean)
+        self._min.push(seq, value, self._values)
+        self._max.push(seq, value, self._values)
+
+    def _remove(self, value: float, seq: int) -> None:
+        self._min.expire(seq)
+        self._max.expire(seq)
+        if math.isnan(value):
+            return
+        self._valid -= 1
+        if self._valid == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / self._valid
+        self._m2 = max(self._m2 - delta * (value - self._mean), 0.0)
+
+    def __iter__(self) -> Iterator[float]:
+        """
+        Iterate over the values from the oldest to the newest.
+        """
+        for seq in range(self._seq - len(self), self._seq):
+            yield self._values[seq % self.capacity]
+
+    def values(self) -> array:
+        """
+        Get a copy of the values from the oldest to the newest.
+
+        Returns:
+            array: The values as an array('d').
+        """
+        return array("d", self)
+
+    def latest(self) -> Optional[float]:
+        """
+        Get the newest value.
+
+        Returns:
+            Optional[float]: The newest value, None if the window is empty.
+        """
+        if self._seq == 0:
+            return None
+        return self._values[(self._seq - 1) % self.capacity]
+
+    def count(self) -> int:
+        """
+        Get the number of non-missing values in the window.
+
+        Returns:
+            int: The number of values the statistics are computed from.
+        """
+        return self._valid
+
+    def min(self) -> Optional[float]:
+        """
+        Get the smallest value in the window.
+
+        Returns:
+            Optional[float]: The smallest value, None if there are no values.
+        """
+        return self._min.front(self._values)
+
+    def max(self) -> Optional[float]:
+        """
+        Get the largest value in the window.
+
+        Returns:
+            Optional[float]: The largest value, None if there are no values.
+        """
+        return self._max.front(self._values)
+
+    def mean(self) -> Optional[float]:
+        """
+        Get the mean of the values in the window.
+
+        Returns:
+            Optional[float]: The mean, None if there are no values.
+        """
+        return self._mean if self._valid else None
+
+    def variance(self) -> Optional[float]:
+        """
+        Get the population variance of the values in the window.
+
+        Returns:
+            Optional[float]: The variance, None if there are no values.
+        """
+        return self._m2 / self._valid if self._valid else None
+
+    def stdev(self) -> Optional[float]:
+        """
+        Get the population standard deviation of the values in the window.
+
+        Returns:
+            Optional[float]: The standard deviation, None if there are no values.
+        """
+        variance = self.variance()
+        return None if variance is None else math.sqrt(variance)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """
+        Get all window statistics.
+
+        Returns:
+            Dict[str, Optional[float]]: Count, min, max, mean and variance of the window.
+        """
+        return {"count": self._valid, "min": self.min(), "max": self.max(), "mean": self.mean(), "variance": self.variance()}
+
+
+class ReadingHistory:
+    """
+    Fixed-capacity history of (timestamp, value) readings of a scalar sensor.
+
+    Attributes:
+        capacity (int): Maximum number of readings kept.
+        window (RollingWindow): Values of the readings with their rolling statistics.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Initialize an empty history.
+
+        Args:
+            capacity (int): Maximum number of readings kept.
+        """
+        self.window = RollingWindow(capacity)
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._seq = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of readings kept.
+        """
+        return min(self._seq, self.capacity)
+
+    def append(self, timestamp: float, value: Optional[float]) -> None:
+        """
+        Add a reading, evicting the oldest one if the history is full.
+
+        Args:
+            timestamp (float): Time of the reading as a Unix timestamp.
+            value (Optional[float]): Value of the reading, None if it is missing.
+        """
+        self._timestamps[self._seq % self.capacity] = timestamp
+        self.window.append(value)
+        self._seq += 1
+
+    def timestamps(self) -> array:
+        """
+        Get a copy of the timestamps from the oldest to the newest.
+
+        Returns:
+            array: The timestamps as an array('d').
+        """
+        return array("d", (self._timestamps[i % self.capacity] for i in range(self._seq - len(self), self._seq)))
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        """
+        Iterate over the (timestamp, value) readings from the oldest to the newest.
+        """
+        return zip(self.timestamps(), self.window)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """
+        Get the rolling statistics of the values.
+
+        Returns:
+            Dict[str, Optional[float]]: Count, min, max, mean and variance of the values.
+        """
+        return self.window.stats()
+
+
+class MultiChannelHistory:
+    """
+    Fixed-capacity history of readings with several values each, like wind speed, direction and gust.
+
+    All channels share one timestamp buffer and keep their own rolling statistics.
+
+    Attributes:
+        capacity (int): Maximum number of readings kept.
+        channels (Dict[str, RollingWindow]): Rolling window of every channel.
+    """
+
+    def __init__(self, channels: Iterable[str], capacity: int) -> None:
+        """
+        Initialize an empty history.
+
+        Args:
+            channels (Iterable[str]): Names of the channels.
+            capacity (int): Maximum number of readings kept.
+        """
+        self.capacity = capacity
+        self.channels: Dict[str, RollingWindow] = {name: RollingWindow(capacity) for name in channels}
+        if not self.channels:
+            raise ValueError("at least one channel is required")
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._seq = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of readings kept.
+        """
+        return min(self._seq, self.capacity)
+
+    def append(self, timestamp: float, values: Dict[str, Optional[float]]) -> None:
+        """
+        Add a reading, evicting the oldest one if the history is full.
+
+        Args:
+            timestamp (float): Time of the reading as a Unix timestamp.
+            values (Dict[str, Optional[float]]): Value of every channel; missing channels are stored as missing values.
+        """
+        self._timestamps[self._seq % self.capacity] = timestamp
+        for name, window in self.channels.items():
+            window.append(values.get(name))
+        self._seq += 1
+
+    def timestamps(self) -> array:
+        """
+        Get a copy of the timestamps from the oldest to the newest.
+
+        Returns:
+            array: The timestamps as an array('d').
+        """
+        return array("d", (self._timestamps[i % self.capacity] for i in range(self._seq - len(self), self._seq)))
+
+    def __getitem__(self, channel: str) -> RollingWindow:
+        """
+        Get the rolling window of a channel.
+        """
+        return self.channels[channel]
+
+    def stats(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Get the rolling statistics of every channel.
+
+        Returns:
+            Dict[str, Dict[str, Optional[float]]]: Statistics keyed by channel name.
+        """
+        return {name: window.stats() for name, window in self.channels.items()}
@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+from typing import Any, Iterable, Optional, Tuple
+from sensors import metrics
+from sensors.decoder import get_decoder
+
+def __getattr__(name: str) -> Any:
+    """
+    Import the HTTP stack on first use of `requests` or `RequestException`, so deployments without API sources never load it.
+    """
+    if name == "requests":
+        import requests
+        return requests
+    if name == "RequestException":
+        from requests import RequestException
+        return RequestException
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class HttpClient:
+    """
+    Pooled HTTP client used by API-sourced sensors.
+
+    Connections are kept alive in one pool per host, every request has a connect
+    and a read timeout, and failed requests are retried a bounded number of times
+    with exponential backoff.
+
+    Attributes:
+        session (requests.Session): Session holding the connection pools.
+        timeout (Tuple[float, float]): Connect and read timeout in seconds.
+    """
+
+    def __init__(self, pool_size: int = 10, max_hosts: int = 10, connect_timeout: float = 3.05, read_timeout: float = 10.0, retries: int = 3, backoff_factor: float = 0.5, retry_statuses: Iterable[int] = (429, 500, 502, 503, 504)) -> None:
+        """
+        Initialize the client and its connection pools.
+
+        Args:
+            pool_size (int): Maximum number of kept-alive connections per host. Default is 10.
+            max_hosts (int): Maximum number of per-host pools kept open. Default is 10.
+            connect_timeout (float): Seconds to wait for a connection. Default is 3.05.
+            read_timeout (float): Seconds to wait for the server to send data. Default is 10.
+            retries (int): Maximum number of retries of a failed request. Default is 3.
+            backoff_factor (float): Base of the exponential backoff between retries in seconds. Default is 0.5.
+            retry_statuses (Iterable[int]): HTTP statuses that are retried. Default is 429 and 5xx gateway errors.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=tuple(retry_statuses),
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url: str) -> "requests.Response":
+        """
+        Send a GET request and check its status.
+
+        Args:
+            url (str): URL to fetch.
+
+        Returns:
+            requests.Response: The successful response.
+
+        Raises:
+            requests.RequestException: If the request fails or returns an error status.
+        """
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def get_json(self, url: str) -> Any:
+        """
+        Send a GET request and decode its JSON body with the shared decoder.
+
+        Args:
+            url (str): URL to fetch.
+
+        Returns:
+            Any: The decoded JSON payload.
+
+        Raises:
+            requests.RequestException: If the request fails or the body is not valid JSON.
+        """
+        if not metrics.registry.enabled:
+            return self._decode(self.get(url))
+        start = time.perf_counter()
+        response = self.get(url)
+        decode_start = time.perf_counter()
+        data = self._decode(response)
+        metrics.add_phase("io", decode_start - start)
+        metrics.add_phase("decode", time.perf_counter() - decode_start)
+        return data
+
+    @staticmethod
+    def _decode(response: "requests.Response") -> Any:
+        """
+        Decode a response body, reporting invalid JSON as requests does.
+        """
+        try:
+            return get_decoder().loads(response.content)
+        except json.JSONDecodeError as e:
+            from requests.exceptions import JSONDecodeError
+            raise JSONDecodeError(e.msg, e.doc, e.pos, response=response)
+
+    def close(self) -> None:
+        """
+        Close all pooled connections.
+        """
+        self.session.close()
+
+
+_http_client: Optional[HttpClient] = None
+_http_client_lock = threading.Lock()
+
+def get_http_client() -> HttpClient:
+    """
+    Get the shared HTTP client, creating it with default settings on first use.
+
+    Creation is guarded by a lock, so concurrent first reads share one client.
+
+    Returns:
+        HttpClient: The shared HTTP client.
+    """
+    global _http_client
+    client = _http_client
+    if client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = HttpClient()
+            client = _http_client
+    return client
+
+def set_http_client(client: HttpClient) -> None:
+    """
+    Replace the shared HTTP client, closing the previous one.
+
+    Args:
+        client (HttpClient): The client all sensors should use from now on.
+    """
+    global _http_client
+    with _http_client_lock:
+        previous, _http_client = _http_client, client
+    if previous is not None and previous is not client:
+        previous.close()
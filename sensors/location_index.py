@@ -0,0 +1,361 @@
+import json
+import mmap
+import os
+import re
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from sensors import metrics
+from sensors.decoder import get_decoder
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_KEY = re.compile(rb'[ \t\n\r]*("[^"\\]*(?:\\.[^"\\]*)*")[ \t\n\r]*:[ \t\n\r]*', re.DOTALL)
+_FLAT_OBJECT = re.compile(rb'\{(?:[^{}\[\]"]+|"[^"\\]*(?:\\.[^"\\]*)*")*\}', re.DOTALL)
+_STRUCTURE = re.compile(rb'["{}\[\]]')
+_SCALAR = re.compile(rb"[^,}\] \t\n\r]+")
+
+def _error(message: str, pos: int) -> json.JSONDecodeError:
+    return json.JSONDecodeError(message, "", pos)
+
+def _skip_whitespace(data: Any, pos: int) -> int:
+    return _WHITESPACE.match(data, pos).end()
+
+def _expect(data: Any, pos: int, char: bytes) -> int:
+    pos = _skip_whitespace(data, pos)
+    if data[pos:pos + 1] != char:
+        raise _error(f"Expected {char.decode()!r}", pos)
+    return pos + 1
+
+def _read_key(data: Any, pos: int) -> Tuple[str, int]:
+    """
+    Decode the object key and the colon starting at a position.
+
+    Args:
+        data (Any): The document bytes.
+        pos (int): Offset of the key, possibly preceded by whitespace.
+
+    Returns:
+        Tuple[str, int]: The key and the offset of its value.
+    """
+    match = _KEY.match(data, pos)
+    if match is None:
+        raise _error("Expected a string key followed by ':'", pos)
+    raw = match.group(1)
+    key = json.loads(raw) if b"\\" in raw else raw[1:-1].decode("utf-8")
+    return key, match.end()
+
+def _skip_value(data: Any, pos: int) -> int:
+    """
+    Find the end of the JSON value starting at a position without decoding it.
+
+    Args:
+        data (Any): The document bytes.
+        pos (int): Offset of the first byte of the value.
+
+    Returns:
+        int: Offset after the last byte of the value.
+    """
+    first = data[pos:pos + 1]
+    if first == b'"':
+        match = _STRING.match(data, pos)
+        if match is None:
+            raise _error("Unterminated string", pos)
+        return match.end()
+    if first not in (b"{", b"["):
+        match = _SCALAR.match(data, pos)
+        if match is None:
+            raise _error("Expected a value", pos)
+        return match.end()
+    if first == b"{":
+        match = _FLAT_OBJECT.match(data, pos)
+        if match is not None:
+            return match.end()
+    depth = 0
+    while True:
+        match = _STRUCTURE.search(data, pos)
+        if match is None:
+            raise _error("Unterminated object or array", pos)
+        char = match.group()
+        if char == b'"':
+            string = _STRING.match(data, match.start())
+            if string is None:
+                raise _error("Unterminated string", match.start())
+            pos = string.end()
+            continue
+        depth += 1 if char in (b"{", b"[") else -1
+        pos = match.end()
+        if depth == 0:
+            return pos
+
+def _parse_object(data: Any, pos: int, visit: Callable[[str, int], int]) -> int:
+    """
+    Walk the members of the JSON object starting at a position.
+
+    Args:
+        data (Any): The document bytes.
+        pos (int): Offset of the opening brace, possibly preceded by whitespace.
+        visit (Callable[[str, int], int]): Called with the key and value offset of every member; returns the offset after the value.
+
+    Returns:
+        int: Offset after the closing brace.
+    """
+    pos = _skip_whitespace(data, _expect(data, pos, b"{"))
+    if data[pos:pos + 1] == b"}":
+        return pos + 1
+    while True:
+        key, pos = _read_key(data, pos)
+        pos = _skip_whitespace(data, visit(key, pos))
+        char = data[pos:pos + 1]
+        if char == b"}":
+            return pos + 1
+        if char != b",":
+            raise _error("Expected ',' or '}'", pos)
+        pos += 1
+
+def scan_locations(data: Any) -> Dict[str, Tuple[int, int]]:
+    """
+    Find the byte range of every record of the 'city_data' object in a data file.
+
+    Only the structure of the document is scanned; the records themselves are not decoded.
+
+    Args:
+        data (Any): Bytes or memory map of the data file.
+
+    Returns:
+        Dict[str, Tuple[int, int]]: Start and end offset of every location's record.
+
+    Raises:
+        json.JSONDecodeError: If the document is not a valid JSON object.
+    """
+    locations: Dict[str, Tuple[int, int]] = {}
+
+    def visit_location(location: str, start: int) -> int:
+        end = _skip_value(data, start)
+        locations[location] = (start, end)
+        return end
+
+    def visit_top(key: str, start: int) -> int:
+        if key == "city_data" and data[start:start + 1] == b"{":
+            locations.clear()
+            return _parse_object(data, start, visit_location)
+        return _skip_value(data, start)
+
+    _parse_object(data, 0, visit_top)
+    return locations
+
+
+class LocationIndex:
+    """
+    Byte-offset index of the location records of data files.
+
+    The first lookup in a data file scans its structure once and stores the byte
+    range of every location in a sidecar file next to it (`data.json.idx`). Later
+    lookups, also from other processes, read the sidecar, seek to the record and
+    decode only that record, so a single city is read from a file of any size in
+    about the same time. The sidecar stores the (mtime, size, inode) of the data
+    file it describes and is rebuilt as soon as the data file changes. Loaded
+    indexes are kept in memory for at most `max_files` files.
+
+    Attributes:
+        suffix (str): Suffix appended to the data file path to name its sidecar.
+        max_files (int): Maximum number of indexes kept in memory.
+        builds (int): Number of indexes built by scanning a data file.
+    """
+
+    def __init__(self, suffix: str = ".idx", max_files: int = 16) -> None:
+        """
+        Initialize an empty index cache.
+
+        Args:
+            suffix (str): Suffix of the sidecar files. Default is '.idx'.
+            max_files (int): Maximum number of indexes kept in memory. Default is 16.
+        """
+        if max_files < 1:
+            raise ValueError("max_files must be at least 1")
+        self.suffix = suffix
+        self.max_files = max_files
+        self.builds = 0
+        self._indexes: "OrderedDict[str, Tuple[Tuple[int, int, int], Dict[str, Tuple[int, int]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> Tuple[int, int, int]:
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _read_sidecar(self, key: str, signature: Tuple[int, int, int]) -> Optional[Dict[str, Tuple[int, int]]]:
+        """
+        Load the sidecar of a data file if it describes the file's current version.
+
+        The sidecar is a JSON header line, a JSON array of the location names and
+        the start and end offset of every location as 64-bit integers.
+
+        Args:
+            key (str): Absolute path to the data file.
+            signature (Tuple[int, int, int]): Current (mtime_ns, size, inode) of the data file.
+
+        Returns:
+            Optional[Dict[str, Tuple[int, int]]]: The index, None if the sidecar is missing, stale or unreadable.
+        """
+        try:
+            with open(key + self.suffix, "rb") as file:
+                header = json.loads(file.readline())
+                if tuple(header["signature"]) != signature or header["byteorder"] != sys.byteorder:
+                    return None
+                names = json.loads(file.read(header["names_bytes"]))
+                offsets = array("q")
+                offsets.frombytes(file.read())
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if len(offsets) != 2 * len(names):
+            return None
+        return dict(zip(names, zip(offsets[0::2], offsets[1::2])))
+
+    def _write_sidecar(self, key: str, signature: Tuple[int, int, int], locations: Dict[str, Tuple[int, int]]) -> None:
+        """
+        Atomically write the sidecar of a data file, ignoring unwritable directories.
+
+        Args:
+            key (str): Absolute path to the data file.
+            signature (Tuple[int, int, int]): (mtime_ns, size, inode) of the indexed version of the data file.
+            locations (Dict[str, Tuple[int, int]]): The index.
+        """
+        names = json.dumps(list(locations), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        offsets = array("q", (offset for span in locations.values() for offset in span))
+        header = {"signature": list(signature), "byteorder": sys.byteorder, "names_bytes": len(names)}
+        temporary = f"{key}{self.suffix}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporary, "wb") as file:
+                file.write(json.dumps(header).encode() + b"\n")
+                file.write(names)
+                offsets.tofile(file)
+            os.replace(temporary, key + self.suffix)
+        except OSError:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+
+    def build(self, path: str) -> Dict[str, Tuple[int, int]]:
+        """
+        Scan a data file and write its sidecar, regardless of an existing one.
+
+        If the sidecar cannot be written, the index is still kept in memory.
+
+        Args:
+            path (str): Path to the data file.
+
+        Returns:
+            Dict[str, Tuple[int, int]]: Start and end offset of every location's record.
+
+        Raises:
+            FileNotFoundError: If the data file does not exist.
+            json.JSONDecodeError: If the data file is not a valid JSON object.
+        """
+        key = os.path.abspath(path)
+        with open(key, "rb") as file:
+            signature = self._signature(os.fstat(file.fileno()))
+            if signature[1] == 0:
+                raise _error("Empty data file", 0)
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                locations = scan_locations(data)
+        self._write_sidecar(key, signature, locations)
+        with self._lock:
+            self.builds += 1
+            self._store(key, signature, locations)
+        return locations
+
+    def _store(self, key: str, signature: Tuple[int, int, int], locations: Dict[str, Tuple[int, int]]) -> None:
+        self._indexes[key] = (signature, locations)
+        self._indexes.move_to_end(key)
+        while len(self._indexes) > self.max_files:
+            self._indexes.popitem(last=False)
+
+    def locations(self, path: str) -> Dict[str, Tuple[int, int]]:
+        """
+        Get the index of a data file, loading or rebuilding it if needed.
+
+        Args:
+            path (str): Path to the data file.
+
+        Returns:
+            Dict[str, Tuple[int, int]]: Start and end offset of every location's record.
+        """
+        key = os.path.abspath(path)
+        signature = self._signature(os.stat(key))
+        with self._lock:
+            entry = self._indexes.get(key)
+            if entry is not None and entry[0] == signature:
+                self._indexes.move_to_end(key)
+                return entry[1]
+        locations = self._read_sidecar(key, signature)
+        if locations is None:
+            return self.build(key)
+        with self._lock:
+            self._store(key, signature, locations)
+        return locations
+
+    def lookup(self, path: str, location: str) -> Optional[dict]:
+        """
+        Decode the record of one location from a data file.
+
+        Args:
+            path (str): Path to the data file.
+            location (str): Location to look up.
+
+        Returns:
+            Optional[dict]: The record of the location, None if the file has no such location.
+
+        Raises:
+            FileNotFoundError: If the data file does not exist.
+            json.JSONDecodeError: If the data file or the record is not valid JSON.
+        """
+        key = os.path.abspath(path)
+        for _ in range(3):
+            span = self.locations(key).get(location)
+            if span is None:
+                return None
+            timed = metrics.registry.enabled
+            if timed:
+                start = time.perf_counter()
+            with open(key, "rb") as file:
+                signature = self._signature(os.fstat(file.fileno()))
+                file.seek(span[0])
+                raw = file.read(span[1] - span[0])
+            with self._lock:
+                entry = self._indexes.get(key)
+                current = entry is not None and entry[0] == signature
+            if not current:
+                continue
+            if not timed:
+                return get_decoder().loads(raw)
+            decode_start = time.perf_counter()
+            record = get_decoder().loads(raw)
+            metrics.add_phase("io", decode_start - start)
+            metrics.add_phase("decode", time.perf_counter() - decode_start)
+            return record
+        raise RuntimeError(f"Data file {path} kept changing while it was read")
+
+    def invalidate(self, path: str) -> None:
+        """
+        Drop the in-memory index of a data file; the sidecar is validated again on the next lookup.
+
+        Args:
+            path (str): Path to the data file.
+        """
+        with self._lock:
+            self._indexes.pop(os.path.abspath(path), None)
+
+    def clear(self) -> None:
+        """
+        Drop all in-memory indexes and reset the build counter.
+        """
+        with self._lock:
+            self._indexes.clear()
+            self.builds = 0
+
+
+location_index = LocationIndex()
@@ -0,0 +1,245 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_local = threading.local()
+
+def add_phase(phase: str, seconds: float) -> None:
+    """
+    Add time spent in a phase to the read in progress on the current thread.
+
+    Callers check `registry.enabled` first, so nothing is done when metrics are off.
+
+    Args:
+        phase (str): Name of the phase, 'io' or 'decode'.
+        seconds (float): Time spent in the phase.
+    """
+    phases = getattr(_local, "phases", None)
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+class Histogram:
+    """
+    Cumulative latency histogram in the Prometheus layout.
+
+    Attributes:
+        buckets (Tuple[float, ...]): Upper bounds of the buckets in seconds.
+        counts (List[int]): Number of observations per bucket, the last one being +Inf.
+        sum (float): Sum of all observations.
+        count (int): Number of observations.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value (float): Observed value in seconds.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}"
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """
+    Read latency histograms and counters of all sensors.
+
+    When enabled, every `BaseSensor.read_data` call is timed and split into the
+    'io' (file read or HTTP round trip), 'decode' (JSON parsing) and 'extract'
+    (everything else, mostly picking values out of the decoded data) phases.
+    Histograms are labelled by sensor type, source and phase; counters of reads
+    and errors are also labelled by location and, for errors, exception class.
+    When disabled, the read path only checks the `enabled` attribute.
+
+    Attributes:
+        enabled (bool): Whether reads are instrumented.
+        buckets (Tuple[float, ...]): Upper bounds of the histogram buckets in seconds.
+    """
+
+    def __init__(self, enabled: bool = False, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.enabled = enabled
+        self.buckets = buckets
+        self._histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self._reads: Dict[Tuple[str, str, str], int] = {}
+        self._errors: Dict[Tuple[str, str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        """
+        Start instrumenting reads.
+        """
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Stop instrumenting reads.
+        """
+        self.enabled = False
+
+    def reset(self) -> None:
+        """
+        Drop all recorded metrics.
+        """
+        with self._lock:
+            self._histograms.clear()
+            self._reads.clear()
+            self._errors.clear()
+
+    def timed_read(self, sensor_type: str, location: str, source: str, read: Callable[[], Any]) -> Any:
+        """
+        Run a read and record its phase latencies and outcome.
+
+        Args:
+            sensor_type (str): Class name of the sensor.
+            location (str): Location of the sensor.
+            source (str): Source of the read.
+            read (Callable[[], Any]): The read to run.
+
+        Returns:
+            Any: The result of the read.
+        """
+        outer = getattr(_local, "phases", None)
+        phases: Dict[str, float] = {}
+        _local.phases = phases
+        error: Optional[BaseException] = None
+        start = time.perf_counter()
+        try:
+            return read()
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            total = time.perf_counter() - start
+            _local.phases = outer
+            phases["extract"] = max(total - phases.get("io", 0.0) - phases.get("decode", 0.0), 0.0)
+            phases["total"] = total
+            self._record(sensor_type, location, source, phases, error)
+
+    def _record(self, sensor_type: str, location: str, source: str, phases: Dict[str, float], error: Optional[BaseException]) -> None:
+        with self._lock:
+            for phase, seconds in phases.items():
+                key = (sensor_type, source, phase)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(self.buckets)
+                histogram.observe(seconds)
+            key = (sensor_type, location, source)
+            self._reads[key] = self._reads.get(key, 0) + 1
+            if error is not None:
+                error_key = key + (type(error).__name__,)
+                self._errors[error_key] = self._errors.get(error_key, 0) + 1
+
+    def histogram(self, sensor_type: str, source: str, phase: str) -> Optional[Histogram]:
+        """
+        Get the latency histogram of a phase.
+
+        Args:
+            sensor_type (str): Class name of the sensor.
+            source (str): Source of the reads.
+            phase (str): 'io', 'decode', 'extract' or 'total'.
+
+        Returns:
+            Optional[Histogram]: The histogram, None if nothing was recorded.
+        """
+        return self._histograms.get((sensor_type, source, phase))
+
+    def reads(self, sensor_type: str, location: str, source: str) -> int:
+        """
+        Get the number of recorded reads.
+        """
+        return self._reads.get((sensor_type, location, source), 0)
+
+    def errors(self, sensor_type: str, location: str, source: str, error: str) -> int:
+        """
+        Get the number of recorded failed reads of one exception class.
+        """
+        return self._errors.get((sensor_type, location, source, error), 0)
+
+    def render(self) -> str:
+        """
+        Export all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines: List[str] = []
+        with self._lock:
+            lines.append("# HELP sensor_read_duration_seconds Time spent reading sensors by phase.")
+            lines.append("# TYPE sensor_read_duration_seconds histogram")
+            names = ("sensor_type", "source", "phase")
+            for key, histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                    lines.append(f"sensor_read_duration_seconds_bucket{_labels(names, key, le)} {cumulative}")
+                lines.append(f"sensor_read_duration_seconds_sum{_labels(names, key)} {histogram.sum!r}")
+                lines.append(f"sensor_read_duration_seconds_count{_labels(names, key)} {histogram.count}")
+            lines.append("# HELP sensor_reads_total Sensor reads.")
+            lines.append("# TYPE sensor_reads_total counter")
+            for key, count in sorted(self._reads.items()):
+                lines.append(f"sensor_reads_total{_labels(('sensor_type', 'location', 'source'), key)} {count}")
+            lines.append("# HELP sensor_read_errors_total Failed sensor reads by exception class.")
+            lines.append("# TYPE sensor_read_errors_total counter")
+            for key, count in sorted(self._errors.items()):
+                lines.append(f"sensor_read_errors_total{_labels(('sensor_type', 'location', 'source', 'error'), key)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+def start_metrics_server(port: int = 9108, host: str = "127.0.0.1", metrics: Optional[MetricsRegistry] = None) -> "ThreadingHTTPServer":
+    """
+    Serve the metrics in the Prometheus text format on /metrics from a background thread.
+
+    Args:
+        port (int): Port to listen on, 0 for a free one. Default is 9108.
+        host (str): Address to listen on. Default is 127.0.0.1.
+        metrics (Optional[MetricsRegistry]): Registry to export. Default is the shared registry.
+
+    Returns:
+        ThreadingHTTPServer: The running server; call shutdown() to stop it.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    metrics = registry if metrics is None else metrics
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -1,27 +1,22 @@
 from sensors.base_sensor import BaseSensor
 import json
-import requests
+from sensors import http_client
 
 class PressureSensor(BaseSensor):
     """
     Pressure sensor class that inherits from BaseSensor.
     """
 
+    __slots__ = ()
+
+    FILE_KEYS = ("pressure",)
+
     def read_data_from_file(self) -> None:
         """
         Read pressure data from a file.
         """
         try:
-            with open(self.data_file_path, "r") as file:
-                all_data = json.load(file)
-                city_data = all_data["city_data"].get(self.location)
-                if city_data is None:
-                    self.last_data = None
-                    raise KeyError(f"Location {self.location} not found in data file")
-                else:
-                    self.last_data = city_data.get("pressure", None)
-                    if self.last_data is None:
-                        raise KeyError(f"No 'pressure' key for location {self.location}")
+            self.parse_city_data(self.load_city_data())
         except (FileNotFoundError, json.JSONDecodeError) as e:
             self.last_data = None
             raise RuntimeError(f"Error reading data from file: {e}")
@@ -31,18 +26,35 @@ class PressureSensor(BaseSensor):
         Read pressure data from an API.
         """
         try:
-            response = requests.get(self.api_url)
-            response.raise_for_status()
-            all_data = response.json()
-            if "main" in all_data and "pressure" in all_data["main"]:
-                self.last_data = all_data["main"]["pressure"]
-            else:
-                self.last_data = None
-                raise KeyError("No 'main.pressure' key in API response")
-        except (requests.RequestException, KeyError) as e:
+            self.parse_api_data(self.load_api_data())
+        except (http_client.RequestException, KeyError) as e:
             self.last_data = None
             raise RuntimeError(f"Error reading data from API: {e}")
 
+    def parse_city_data(self, city_data: dict) -> None:
+        """
+        Set the last data from the record of the sensor's location in a data file.
+
+        Args:
+            city_data (dict): Record of the location from the 'city_data' object.
+        """
+        self.last_data = city_data.get("pressure", None)
+        if self.last_data is None:
+            raise KeyError(f"No 'pressure' key for location {self.location}")
+
+    def parse_api_data(self, all_data: dict) -> None:
+        """
+        Set the last data from a decoded API response.
+
+        Args:
+            all_data (dict): Decoded API response.
+        """
+        if "main" in all_data and "pressure" in all_data["main"]:
+            self.last_data = all_data["main"]["pressure"]
+        else:
+            self.last_data = None
+            raise KeyError("No 'main.pressure' key in API response")
+
     def convert_to_psi(self) -> float:
         """
         Convert the last data read by the sensor from hPa to PSI.
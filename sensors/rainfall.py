@@ -1,26 +1,22 @@
 from sensors.base_sensor import BaseSensor
 import json
-import requests
+from sensors import http_client
 
 class RainfallSensor(BaseSensor):
     """
     Rainfall sensor class that inherits from BaseSensor.
     """
 
+    __slots__ = ()
+
+    FILE_KEYS = ("rainfall",)
+
     def read_data_from_file(self) -> None:
         """
         Read rainfall data from a file.
         """
         try:
-            with open(self.data_file_path, "r") as file:
-                all_data = json.load(file)
-                city_data = all_data["city_data"].get(self.location)
-                if city_data is None:
-                    self.last_data = None
-                    raise KeyError(f"Location {self.location} not found in data file")
-                self.last_data = city_data.get("rainfall", None)
-                if self.last_data is None:
-                    raise KeyError(f"No 'rainfall' key for location {self.location}")
+            self.parse_city_data(self.load_city_data())
         except (FileNotFoundError, json.JSONDecodeError) as e:
             self.last_data = None
             raise RuntimeError(f"Error reading data from file: {e}")
@@ -30,18 +26,35 @@ class RainfallSensor(BaseSensor):
         Read rainfall data from an API (interpreting clouds.all as a rainfall indicator).
         """
         try:
-            response = requests.get(self.api_url)
-            response.raise_for_status()
-            all_data = response.json()
-            clouds_data = all_data.get("clouds", {})
-            if "all" not in clouds_data:
-                self.last_data = None
-                raise KeyError("No 'clouds.all' key in API response")
-            self.last_data = clouds_data["all"]
-        except (requests.RequestException, KeyError) as e:
+            self.parse_api_data(self.load_api_data())
+        except (http_client.RequestException, KeyError) as e:
             self.last_data = None
             raise RuntimeError(f"Error reading data from API: {e}")
 
+    def parse_city_data(self, city_data: dict) -> None:
+        """
+        Set the last data from the record of the sensor's location in a data file.
+
+        Args:
+            city_data (dict): Record of the location from the 'city_data' object.
+        """
+        self.last_data = city_data.get("rainfall", None)
+        if self.last_data is None:
+            raise KeyError(f"No 'rainfall' key for location {self.location}")
+
+    def parse_api_data(self, all_data: dict) -> None:
+        """
+        Set the last data from a decoded API response (interpreting clouds.all as a rainfall indicator).
+
+        Args:
+            all_data (dict): Decoded API response.
+        """
+        clouds_data = all_data.get("clouds", {})
+        if "all" not in clouds_data:
+            self.last_data = None
+            raise KeyError("No 'clouds.all' key in API response")
+        self.last_data = clouds_data["all"]
+
     def is_raining(self, threshold: float = 50.0) -> bool:
         """
         Check if the last data read by the sensor is above a certain threshold.
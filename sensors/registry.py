@@ -0,0 +1,252 @@
+import os
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Type, Union
+from sensors.base_sensor import BaseSensor
+from sensors.decoder import get_decoder
+from sensors.station import METRIC_SENSORS, Station
+
+SENSOR_TYPES: Dict[str, Type[BaseSensor]] = {**METRIC_SENSORS, "station": Station}
+
+_SENSOR_KEYS = frozenset(("id", "type", "location", "locations", "status", "source", "data_file_path", "api_url", "history_capacity", "use_index", "metrics"))
+
+class SensorRegistry:
+    """
+    Sensors of a fleet indexed by id, location and type.
+
+    Every lookup is a dictionary access instead of a scan of the fleet. The
+    registry keeps the order in which sensors were added, so iterating it or
+    one of its location or type groups yields sensors in configuration order.
+
+    Attributes:
+        sensors (Dict[Hashable, BaseSensor]): All sensors keyed by sensor_id.
+    """
+
+    def __init__(self, sensors: Iterable[BaseSensor] = ()) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            sensors (Iterable[BaseSensor]): Sensors to add. Default is none.
+        """
+        self.sensors: Dict[Hashable, BaseSensor] = {}
+        self._by_location: Dict[str, Dict[Hashable, BaseSensor]] = {}
+        self._by_type: Dict[Type[BaseSensor], Dict[Hashable, BaseSensor]] = {}
+        for sensor in sensors:
+            self.add(sensor)
+
+    def add(self, sensor: BaseSensor) -> None:
+        """
+        Add a sensor to all indexes.
+
+        Args:
+            sensor (BaseSensor): Sensor of any type.
+
+        Raises:
+            ValueError: If a sensor with the same sensor_id is already registered.
+        """
+        if sensor.sensor_id in self.sensors:
+            raise ValueError(f"Duplicate sensor id: {sensor.sensor_id!r}")
+        self.sensors[sensor.sensor_id] = sensor
+        self._by_location.setdefault(sensor.location, {})[sensor.sensor_id] = sensor
+        self._by_type.setdefault(type(sensor), {})[sensor.sensor_id] = sensor
+
+    def remove(self, sensor_id: Hashable) -> BaseSensor:
+        """
+        Remove a sensor from all indexes.
+
+        Args:
+            sensor_id (Hashable): Id of the sensor.
+
+        Returns:
+            BaseSensor: The removed sensor.
+
+        Raises:
+            KeyError: If no sensor has this id.
+        """
+        sensor = self.get(sensor_id)
+        del self.sensors[sensor_id]
+        for index, key in ((self._by_location, sensor.location), (self._by_type, type(sensor))):
+            group = index[key]
+            del group[sensor_id]
+            if not group:
+                del index[key]
+        return sensor
+
+    def get(self, sensor_id: Hashable) -> BaseSensor:
+        """
+        Get a sensor by id.
+
+        Args:
+            sensor_id (Hashable): Id of the sensor.
+
+        Returns:
+            BaseSensor: The sensor.
+
+        Raises:
+            KeyError: If no sensor has this id.
+        """
+        try:
+            return self.sensors[sensor_id]
+        except KeyError:
+            raise KeyError(f"Sensor {sensor_id!r} not found in registry") from None
+
+    def by_location(self, location: str) -> List[BaseSensor]:
+        """
+        Get the sensors deployed at a location.
+
+        Args:
+            location (str): Location name.
+
+        Returns:
+            List[BaseSensor]: The sensors in the order they were added, empty if there are none.
+        """
+        return list(self._by_location.get(location, {}).values())
+
+    def by_type(self, sensor_type: Union[str, Type[BaseSensor]]) -> List[BaseSensor]:
+        """
+        Get the sensors of one type.
+
+        Args:
+            sensor_type (Union[str, Type[BaseSensor]]): A name of SENSOR_TYPES such as 'wind', or the sensor class.
+
+        Returns:
+            List[BaseSensor]: The sensors in the order they were added, empty if there are none.
+
+        Raises:
+            ValueError: If the type name is unknown.
+        """
+        if isinstance(sensor_type, str):
+            if sensor_type not in SENSOR_TYPES:
+                raise ValueError(f"Unknown sensor type: {sensor_type}")
+            sensor_type = SENSOR_TYPES[sensor_type]
+        return list(self._by_type.get(sensor_type, {}).values())
+
+    def locations(self) -> List[str]:
+        """
+        Get the locations that have at least one sensor.
+
+        Returns:
+            List[str]: The locations in the order they were first added.
+        """
+        return list(self._by_location)
+
+    def __getitem__(self, sensor_id: Hashable) -> BaseSensor:
+        return self.get(sensor_id)
+
+    def __contains__(self, sensor_id: Hashable) -> bool:
+        return sensor_id in self.sensors
+
+    def __iter__(self) -> Iterator[BaseSensor]:
+        return iter(self.sensors.values())
+
+    def __len__(self) -> int:
+        """
+        Return the number of sensors.
+        """
+        return len(self.sensors)
+
+
+def _build_sensors(entry: Mapping[str, Any], position: int, base_dir: Optional[str]) -> List[BaseSensor]:
+    """
+    Build the sensors of one entry of the 'sensors' list.
+
+    Args:
+        entry (Mapping[str, Any]): The entry merged with the defaults.
+        position (int): Index of the entry in the list, for error messages.
+        base_dir (Optional[str]): Directory relative data file paths are resolved against.
+
+    Returns:
+        List[BaseSensor]: One sensor, or one per location with consecutive ids for a 'locations' entry.
+    """
+    def fail(message: str) -> ValueError:
+        return ValueError(f"Sensor entry {position} of fleet config: {message}")
+
+    unknown = sorted(set(entry) - _SENSOR_KEYS)
+    if unknown:
+        raise fail(f"unknown keys {', '.join(unknown)}")
+    sensor_type = entry.get("type")
+    if sensor_type not in SENSOR_TYPES:
+        raise fail(f"unknown type {sensor_type!r}, expected one of {', '.join(SENSOR_TYPES)}")
+    if "id" not in entry:
+        raise fail("missing 'id'")
+    if ("location" in entry) == ("locations" in entry):
+        raise fail("exactly one of 'location' and 'locations' is required")
+    if "metrics" in entry and sensor_type != "station":
+        raise fail("'metrics' is only valid for stations")
+
+    kwargs = {key: entry[key] for key in ("status", "source", "data_file_path", "api_url", "history_capacity", "use_index", "metrics") if key in entry}
+    if base_dir is not None and "data_file_path" in kwargs and not os.path.isabs(kwargs["data_file_path"]):
+        kwargs["data_file_path"] = os.path.join(base_dir, kwargs["data_file_path"])
+    sensor_class = SENSOR_TYPES[sensor_type]
+    if "location" in entry:
+        placements = [(entry["id"], entry["location"])]
+    else:
+        if not isinstance(entry["id"], int):
+            raise fail("'id' must be an integer with 'locations'")
+        placements = [(entry["id"] + offset, location) for offset, location in enumerate(entry["locations"])]
+    try:
+        return [sensor_class(sensor_id, location, **kwargs) for sensor_id, location in placements]
+    except (TypeError, ValueError) as e:
+        raise fail(str(e)) from None
+
+def build_fleet(config: Mapping[str, Any], base_dir: Optional[str] = None) -> SensorRegistry:
+    """
+    Build the sensors described by a decoded fleet config.
+
+    The config has an optional 'defaults' table applied to every entry and a
+    'sensors' list. An entry has a 'type' (a name of SENSOR_TYPES), an 'id' and
+    a 'location', or a 'locations' list creating one sensor per location with
+    ids counting up from 'id'. The other keys are the keyword arguments of the
+    sensor: 'status', 'source', 'data_file_path', 'api_url', 'history_capacity',
+    'use_index' and, for stations, 'metrics'.
+
+    Args:
+        config (Mapping[str, Any]): The decoded config.
+        base_dir (Optional[str]): Directory relative data file paths are resolved against. Default is to keep them as given.
+
+    Returns:
+        SensorRegistry: The registry of all sensors.
+
+    Raises:
+        ValueError: If an entry is invalid or two sensors share an id.
+    """
+    unknown = sorted(set(config) - {"defaults", "sensors"})
+    if unknown:
+        raise ValueError(f"Unknown fleet config sections: {', '.join(unknown)}")
+    defaults = config.get("defaults", {})
+    registry = SensorRegistry()
+    for position, entry in enumerate(config.get("sensors", [])):
+        for sensor in _build_sensors({**defaults, **entry}, position, base_dir):
+            registry.add(sensor)
+    return registry
+
+def load_fleet(path: str) -> SensorRegistry:
+    """
+    Build the sensors described by a TOML or JSON fleet config file.
+
+    Relative data file paths in the file are resolved against its directory, so
+    a config works regardless of the working directory. No HTTP code is imported
+    here; it is loaded on the first read of an API-sourced sensor.
+
+    Args:
+        path (str): Path to a '.toml' or '.json' file; see build_fleet for its layout.
+
+    Returns:
+        SensorRegistry: The registry of all sensors.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not valid TOML or JSON, or its content is invalid.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".toml":
+        try:
+            import tomllib
+        except ModuleNotFoundError:
+            import tomli as tomllib
+        with open(path, "rb") as file:
+            config = tomllib.load(file)
+    elif extension == ".json":
+        config = get_decoder().load(path)
+    else:
+        raise ValueError(f"Unsupported fleet config format: {path}")
+    return build_fleet(config, os.path.dirname(os.path.abspath(path)))
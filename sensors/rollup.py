@@ -0,0 +1,293 @@
+import heapq
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from sensors.base_sensor import BaseSensor
+
+CIRCULAR_METRICS: Dict[str, str] = {"wind_deg": "wind_speed"}
+
+class Rollup:
+    """
+    Aggregate of one metric of one sensor over one time bucket.
+
+    Attributes:
+        key (Hashable): Identifier of the sensor, its sensor_id for `add_sensor`.
+        metric (str): Name of the metric, e.g. 'temp' or 'wind_deg'.
+        resolution (float): Length of the bucket in seconds.
+        start (float): Start of the bucket as a Unix timestamp.
+        count (int): Number of readings in the bucket.
+        min (Optional[float]): Smallest reading, None for circular metrics.
+        max (Optional[float]): Largest reading, None for circular metrics.
+        mean (Optional[float]): Mean of the readings; for circular metrics the weighted vector mean in degrees, None if all weights were 0.
+        revision (int): 0 for the first emission, incremented every time late readings change the bucket.
+    """
+
+    __slots__ = ("key", "metric", "resolution", "start", "count", "min", "max", "mean", "revision")
+
+    def __init__(self, key: Hashable, metric: str, resolution: float, start: float, count: int, min: Optional[float], max: Optional[float], mean: Optional[float], revision: int) -> None:
+        self.key = key
+        self.metric = metric
+        self.resolution = resolution
+        self.start = start
+        self.count = count
+        self.min = min
+        self.max = max
+        self.mean = mean
+        self.revision = revision
+
+    def __repr__(self) -> str:
+        return f"Rollup(key={self.key!r}, metric={self.metric!r}, resolution={self.resolution!r}, start={self.start!r}, count={self.count}, min={self.min!r}, max={self.max!r}, mean={self.mean!r}, revision={self.revision})"
+
+
+class _Bucket:
+    """
+    Running aggregate of an open bucket; circular buckets sum weighted unit vectors instead of values.
+    """
+
+    __slots__ = ("count", "min", "max", "total", "x", "y", "revision", "dirty")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.total = 0.0
+        self.x = 0.0
+        self.y = 0.0
+        self.revision = -1
+        self.dirty = True
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.dirty = True
+
+    def add_direction(self, degrees: float, weight: float) -> None:
+        self.count += 1
+        radians = math.radians(degrees)
+        self.x += weight * math.cos(radians)
+        self.y += weight * math.sin(radians)
+        self.dirty = True
+
+    def rollup(self, key: Hashable, metric: str, resolution: float, start: float, circular: bool) -> Rollup:
+        self.revision += 1
+        self.dirty = False
+        if circular:
+            mean = None
+            if self.x or self.y:
+                mean = math.degrees(math.atan2(self.y, self.x)) % 360.0
+                mean = 0.0 if mean == 360.0 else mean
+            return Rollup(key, metric, resolution, start, self.count, None, None, mean, self.revision)
+        return Rollup(key, metric, resolution, start, self.count, self.min, self.max, self.total / self.count, self.revision)
+
+
+class RollupEngine:
+    """
+    Incremental per-bucket min/max/mean of sensor readings at several resolutions.
+
+    Every reading updates the open bucket of each resolution it falls into in
+    O(1); raw readings are never kept or rescanned. Event time drives the
+    buckets: the watermark is the newest reading time seen (or the time passed to
+    `advance`), and a bucket is finished and emitted once its end is `lateness`
+    seconds behind the watermark. Finished buckets are retained for `retention`
+    seconds, so a late reading updates only the buckets it falls into and those
+    are emitted again with an incremented revision. Readings older than the
+    retention are dropped and counted.
+
+    Direction metrics in CIRCULAR_METRICS, like a WindSensor's 'wind_deg', are
+    averaged as unit vectors weighted by the paired speed metric, so 350 and 10
+    degrees average to 0 degrees and calm readings barely count.
+
+    Attributes:
+        resolutions (Tuple[float, ...]): Bucket lengths in seconds.
+        lateness (float): Seconds a bucket stays open after its end.
+        retention (float): Seconds a finished bucket can still be updated by late readings.
+        watermark (float): Newest event time seen.
+        dropped (int): Number of readings older than the retention.
+    """
+
+    def __init__(self, resolutions: Iterable[float] = (60.0, 3600.0), lateness: float = 0.0, retention: float = 86400.0, on_rollup: Optional[Callable[[Rollup], None]] = None) -> None:
+        """
+        Initialize an empty engine.
+
+        Args:
+            resolutions (Iterable[float]): Bucket lengths in seconds. Default is one minute and one hour.
+            lateness (float): Seconds a bucket stays open after its end. Default is 0.
+            retention (float): Seconds a finished bucket can still be updated by late readings. Default is one day.
+            on_rollup (Optional[Callable[[Rollup], None]]): Called with every emitted rollup. Default is to queue them for `drain`.
+        """
+        self.resolutions = tuple(sorted(float(resolution) for resolution in resolutions))
+        if not self.resolutions or self.resolutions[0] <= 0:
+            raise ValueError("resolutions must be positive")
+        self.lateness = lateness
+        self.retention = retention
+        self.on_rollup = on_rollup
+        self.watermark = -math.inf
+        self.dropped = 0
+        self._buckets: Dict[float, Dict[float, Dict[Tuple[Hashable, str], _Bucket]]] = {resolution: {} for resolution in self.resolutions}
+        self._finished: Dict[float, Set[float]] = {resolution: set() for resolution in self.resolutions}
+        self._open_starts: Dict[float, List[float]] = {resolution: [] for resolution in self.resolutions}
+        self._finished_starts: Dict[float, List[float]] = {resolution: [] for resolution in self.resolutions}
+        self._late: Set[Tuple[float, float, Tuple[Hashable, str]]] = set()
+        self._ready: deque = deque()
+        self._lock = threading.Lock()
+
+    def add(self, key: Hashable, metric: str, timestamp: float, value: Optional[float], weight: Optional[float] = None) -> None:
+        """
+        Add one reading.
+
+        Args:
+            key (Hashable): Identifier of the sensor.
+            metric (str): Name of the metric.
+            timestamp (float): Time of the reading as a Unix timestamp.
+            value (Optional[float]): The reading, None or NaN if it is missing.
+            weight (Optional[float]): Weight of a circular reading, e.g. the wind speed. Default is 1.
+        """
+        if value is None or value != value:
+            return
+        with self._lock:
+            self._add(key, metric, timestamp, float(value), weight)
+            emitted = self._advance(timestamp)
+        self._emit(emitted)
+
+    def add_sensor(self, sensor: BaseSensor, timestamp: Optional[float] = None) -> None:
+        """
+        Add the last data of a sensor, keyed by its sensor_id.
+
+        Args:
+            sensor (BaseSensor): Sensor of any type, including stations.
+            timestamp (Optional[float]): Time of the reading. Default is now.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        readings = dict(sensor.readings())
+        with self._lock:
+            for metric, value in readings.items():
+                if value is None or value != value:
+                    continue
+                weight = readings.get(CIRCULAR_METRICS[metric]) if metric in CIRCULAR_METRICS else None
+                self._add(sensor.sensor_id, metric, timestamp, float(value), weight)
+            emitted = self._advance(timestamp)
+        self._emit(emitted)
+
+    def _add(self, key: Hashable, metric: str, timestamp: float, value: float, weight: Optional[float]) -> None:
+        if timestamp < self.watermark - self.retention:
+            self.dropped += 1
+            return
+        series = (key, metric)
+        circular = metric in CIRCULAR_METRICS
+        for resolution in self.resolutions:
+            start = math.floor(timestamp / resolution) * resolution
+            buckets = self._buckets[resolution].get(start)
+            if buckets is None:
+                buckets = self._buckets[resolution][start] = {}
+                heapq.heappush(self._open_starts[resolution], start)
+            bucket = buckets.get(series)
+            if bucket is None:
+                bucket = buckets[series] = _Bucket()
+            if circular:
+                bucket.add_direction(value, 1.0 if weight is None else float(weight))
+            else:
+                bucket.add(value)
+            if start in self._finished[resolution]:
+                self._late.add((resolution, start, series))
+
+    def _advance(self, watermark: float) -> List[Rollup]:
+        """
+        Move the watermark forward, finish due buckets, re-emit late-updated ones and evict expired ones.
+
+        Returns:
+            List[Rollup]: The rollups to emit.
+        """
+        self.watermark = max(self.watermark, watermark)
+        emitted = []
+        for resolution, starts in self._buckets.items():
+            open_starts = self._open_starts[resolution]
+            while open_starts and open_starts[0] + resolution + self.lateness <= self.watermark:
+                emitted.extend(self._finish(resolution, heapq.heappop(open_starts)))
+            finished_starts = self._finished_starts[resolution]
+            while finished_starts and finished_starts[0] + resolution + self.retention < self.watermark:
+                start = heapq.heappop(finished_starts)
+                del starts[start]
+                self._finished[resolution].discard(start)
+        for resolution, start, series in self._late:
+            bucket = self._buckets[resolution].get(start, {}).get(series)
+            if bucket is not None and bucket.dirty and start in self._finished[resolution]:
+                emitted.append(bucket.rollup(series[0], series[1], resolution, start, series[1] in CIRCULAR_METRICS))
+        self._late.clear()
+        return emitted
+
+    def _finish(self, resolution: float, start: float) -> List[Rollup]:
+        self._finished[resolution].add(start)
+        heapq.heappush(self._finished_starts[resolution], start)
+        return [bucket.rollup(key, metric, resolution, start, metric in CIRCULAR_METRICS) for (key, metric), bucket in self._buckets[resolution][start].items()]
+
+    def _emit(self, rollups: List[Rollup]) -> None:
+        if self.on_rollup is None:
+            self._ready.extend(rollups)
+            return
+        for rollup in rollups:
+            self.on_rollup(rollup)
+
+    def advance(self, now: Optional[float] = None) -> None:
+        """
+        Move the watermark to a wall-clock time, finishing buckets of sensors that went quiet.
+
+        Args:
+            now (Optional[float]): New watermark as a Unix timestamp. Default is now.
+        """
+        with self._lock:
+            emitted = self._advance(time.time() if now is None else now)
+        self._emit(emitted)
+
+    def flush(self) -> None:
+        """
+        Emit every open bucket, e.g. before shutting down. Flushed buckets count as finished.
+        """
+        with self._lock:
+            emitted = []
+            for resolution, open_starts in self._open_starts.items():
+                while open_starts:
+                    emitted.extend(self._finish(resolution, heapq.heappop(open_starts)))
+            self._late.clear()
+        self._emit(emitted)
+
+    def drain(self) -> List[Rollup]:
+        """
+        Take the emitted rollups queued since the last call, when no `on_rollup` callback is set.
+
+        Returns:
+            List[Rollup]: The rollups in emission order.
+        """
+        with self._lock:
+            rollups = list(self._ready)
+            self._ready.clear()
+        return rollups
+
+    def current(self, key: Hashable, metric: str, resolution: float, timestamp: float) -> Optional[Rollup]:
+        """
+        Peek at the bucket containing a time without emitting it.
+
+        Args:
+            key (Hashable): Identifier of the sensor.
+            metric (str): Name of the metric.
+            resolution (float): Bucket length in seconds.
+            timestamp (float): Any time within the bucket.
+
+        Returns:
+            Optional[Rollup]: The aggregate so far, None if the bucket has no readings.
+        """
+        resolution = float(resolution)
+        start = math.floor(timestamp / resolution) * resolution
+        with self._lock:
+            bucket = self._buckets[resolution].get(start, {}).get((key, metric))
+            if bucket is None:
+                return None
+            revision, dirty = bucket.revision, bucket.dirty
+            rollup = bucket.rollup(key, metric, resolution, start, metric in CIRCULAR_METRICS)
+            bucket.revision, bucket.dirty = revision, dirty
+        return rollup
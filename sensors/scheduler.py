@@ -0,0 +1,287 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import CancelledError, Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from sensors.base_sensor import BaseSensor
+from sensors.history import RollingWindow
+
+class ScheduledSensor:
+    """
+    Polling state of one sensor in a PollingScheduler.
+
+    Attributes:
+        sensor (BaseSensor): The polled sensor.
+        interval (float): Seconds between two reads.
+        jitter (float): Maximum random delay in seconds added to every read.
+        runs (int): Number of reads started.
+        errors (int): Number of reads that raised.
+        callback_errors (int): Number of times on_result or on_error raised.
+        skipped (int): Number of ticks dropped because the previous read was still running or the scheduler fell behind.
+        coalesced (int): Number of ticks merged into a follow-up read of a still running one.
+        last_error (Optional[BaseException]): Exception of the last failed read, callback or submission.
+    """
+
+    def __init__(self, sensor: BaseSensor, interval: float, jitter: float, due: float) -> None:
+        self.sensor = sensor
+        self.interval = interval
+        self.jitter = jitter
+        self.runs = 0
+        self.errors = 0
+        self.callback_errors = 0
+        self.skipped = 0
+        self.coalesced = 0
+        self.last_error: Optional[BaseException] = None
+        self._base_due = due
+        self._fire_at = due
+        self._in_flight = False
+        self._pending = False
+        self._removed = False
+
+
+class PollingScheduler:
+    """
+    Polls many sensors at their own intervals from a single timer thread.
+
+    Upcoming reads sit in a priority queue ordered by due time; the timer thread
+    sleeps until the earliest one and hands due reads to a worker pool. Ticks are
+    placed on a fixed grid (start + n * interval) plus random jitter, so they do not
+    drift and sensors with the same interval do not all hit the upstream at once.
+    When a tick comes while the previous read of the sensor is still running, it is
+    either skipped or coalesced into one follow-up read, so a slow sensor never
+    piles up work. The delay between a tick's due time and its dispatch is
+    recorded as scheduling lag.
+
+    Attributes:
+        backpressure (str): 'skip' to drop ticks of busy sensors, 'coalesce' to run one follow-up read.
+        lag (RollingWindow): Scheduling lag in seconds of the most recent dispatches.
+    """
+
+    def __init__(self, workers: int = 8, backpressure: str = "skip", on_result: Optional[Callable[[BaseSensor, Any], None]] = None, on_error: Optional[Callable[[BaseSensor, BaseException], None]] = None, executor: Optional[Executor] = None, clock: Callable[[], float] = time.monotonic, seed: Optional[int] = None) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            workers (int): Number of worker threads reading sensors. Default is 8.
+            backpressure (str): 'skip' or 'coalesce'. Default is 'skip'.
+            on_result (Optional[Callable[[BaseSensor, Any], None]]): Called with the sensor and its data after every successful read.
+            on_error (Optional[Callable[[BaseSensor, BaseException], None]]): Called with the sensor and the exception after every failed read.
+            executor (Optional[Executor]): Executor running the reads. Default is a thread pool of `workers` threads.
+            clock (Callable[[], float]): Monotonic time source. Default is time.monotonic.
+            seed (Optional[int]): Seed of the jitter generator. Default is random.
+        """
+        if backpressure not in ("skip", "coalesce"):
+            raise ValueError(f"Invalid backpressure policy: {backpressure}")
+        self.backpressure = backpressure
+        self.on_result = on_result
+        self.on_error = on_error
+        self.clock = clock
+        self.lag = RollingWindow(1024)
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._workers = workers
+        self._random = random.Random(seed)
+        self._heap: List = []
+        self._counter = itertools.count()
+        self._entries: Dict[int, ScheduledSensor] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._stopped = False
+
+    def add(self, sensor: BaseSensor, interval: float, jitter: float = 0.0, start_delay: Optional[float] = None) -> ScheduledSensor:
+        """
+        Start polling a sensor.
+
+        Args:
+            sensor (BaseSensor): Sensor to poll.
+            interval (float): Seconds between two reads.
+            jitter (float): Maximum random delay in seconds added to every read. Default is 0.
+            start_delay (Optional[float]): Seconds until the first read. Default is a random phase within the interval.
+
+        Returns:
+            ScheduledSensor: Polling state of the sensor.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if jitter < 0 or jitter >= interval:
+            raise ValueError("jitter must be between 0 and the interval")
+        with self._condition:
+            if id(sensor) in self._entries:
+                raise ValueError(f"Sensor {sensor.sensor_id} is already scheduled")
+            if start_delay is None:
+                start_delay = self._random.uniform(0, interval)
+            entry = ScheduledSensor(sensor, interval, jitter, self.clock() + start_delay)
+            self._entries[id(sensor)] = entry
+            self._push(entry)
+            self._condition.notify()
+        return entry
+
+    def remove(self, sensor: BaseSensor) -> None:
+        """
+        Stop polling a sensor. A read in progress is allowed to finish.
+
+        Args:
+            sensor (BaseSensor): Sensor to stop polling.
+        """
+        with self._condition:
+            entry = self._entries.pop(id(sensor), None)
+            if entry is not None:
+                entry._removed = True
+
+    def _push(self, entry: ScheduledSensor) -> None:
+        entry._fire_at = entry._base_due + (self._random.uniform(0, entry.jitter) if entry.jitter else 0.0)
+        heapq.heappush(self._heap, (entry._fire_at, next(self._counter), entry))
+
+    def run_pending(self) -> Optional[float]:
+        """
+        Dispatch every read that is due and reschedule its sensor.
+
+        Returns:
+            Optional[float]: Seconds until the next read is due, None if nothing is scheduled.
+        """
+        due: List[ScheduledSensor] = []
+        with self._condition:
+            now = self.clock()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, entry = heapq.heappop(self._heap)
+                if entry._removed:
+                    continue
+                self.lag.append(now - entry._fire_at)
+                entry._base_due += entry.interval
+                if entry._base_due <= now:
+                    missed = int((now - entry._base_due) // entry.interval) + 1
+                    entry.skipped += missed
+                    entry._base_due += missed * entry.interval
+                self._push(entry)
+                if entry._in_flight:
+                    if self.backpressure == "coalesce" and not entry._pending:
+                        entry._pending = True
+                        entry.coalesced += 1
+                    else:
+                        entry.skipped += 1
+                    continue
+                entry._in_flight = True
+                due.append(entry)
+            wait = self._heap[0][0] - now if self._heap else None
+        for entry in due:
+            self._dispatch(entry)
+        return wait
+
+    def _dispatch(self, entry: ScheduledSensor) -> None:
+        """
+        Submit a read, releasing the sensor for later ticks if the executor refuses it.
+        """
+        try:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="poll")
+            future = self._executor.submit(entry.sensor.read_data)
+        except RuntimeError as e:
+            # The executor was shut down; drop the tick instead of leaving the sensor in flight forever.
+            with self._condition:
+                entry.skipped += 1
+                entry.last_error = e
+                entry._pending = False
+                entry._in_flight = False
+            return
+        with self._condition:
+            entry.runs += 1
+        future.add_done_callback(lambda future: self._finish(entry, future))
+
+    def _finish(self, entry: ScheduledSensor, future: Future) -> None:
+        """
+        Report a finished read and release its sensor, even if a callback raises.
+        """
+        try:
+            error = CancelledError() if future.cancelled() else future.exception()
+            if error is not None:
+                with self._condition:
+                    entry.errors += 1
+                    entry.last_error = error
+            try:
+                if error is None:
+                    if self.on_result is not None:
+                        self.on_result(entry.sensor, future.result())
+                elif self.on_error is not None:
+                    self.on_error(entry.sensor, error)
+            except Exception as e:
+                with self._condition:
+                    entry.callback_errors += 1
+                    entry.last_error = e
+        finally:
+            with self._condition:
+                follow_up = entry._pending and not entry._removed and not self._stopped
+                entry._pending = False
+                entry._in_flight = follow_up
+        if follow_up:
+            self._dispatch(entry)
+
+    def _loop(self) -> None:
+        while True:
+            self.run_pending()
+            with self._condition:
+                if not self._running:
+                    return
+                wait = self._heap[0][0] - self.clock() if self._heap else None
+                if wait is None or wait > 0:
+                    self._condition.wait(wait)
+                if not self._running:
+                    return
+
+    def start(self) -> None:
+        """
+        Start the timer thread.
+        """
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._stopped = False
+        self._thread = threading.Thread(target=self._loop, name="poll-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """
+        Stop the timer thread and the worker pool.
+
+        Args:
+            wait (bool): Wait for reads in progress to finish. Default is True.
+        """
+        with self._condition:
+            self._running = False
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the counters of all sensors and the scheduling lag.
+
+        Returns:
+            Dict[str, Any]: Totals of runs, errors, callback errors, skipped and coalesced ticks, and lag statistics in seconds.
+        """
+        with self._condition:
+            entries = list(self._entries.values())
+            return {
+                "sensors": len(entries),
+                "runs": sum(entry.runs for entry in entries),
+                "errors": sum(entry.errors for entry in entries),
+                "callback_errors": sum(entry.callback_errors for entry in entries),
+                "skipped": sum(entry.skipped for entry in entries),
+                "coalesced": sum(entry.coalesced for entry in entries),
+                "lag_mean": self.lag.mean(),
+                "lag_max": self.lag.max(),
+            }
+
+    def __enter__(self) -> "PollingScheduler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
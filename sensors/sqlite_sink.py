@@ -0,0 +1,273 @@
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Hashable, List, Optional, Tuple
+from sensors.base_sensor import BaseSensor
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS readings (sensor_id, location TEXT, metric TEXT NOT NULL, ts REAL NOT NULL, value REAL)",
+    "CREATE INDEX IF NOT EXISTS readings_sensor_ts ON readings (sensor_id, ts)",
+)
+INSERT = "INSERT INTO readings (sensor_id, location, metric, ts, value) VALUES (?, ?, ?, ?, ?)"
+# Errors caused by the content of a row rather than by the database, like a NULL metric or a value SQLite cannot store.
+_ROW_ERRORS = (sqlite3.IntegrityError, sqlite3.InterfaceError, sqlite3.ProgrammingError)
+
+Row = Tuple[Hashable, Optional[str], str, float, Any]
+
+class _Flush:
+    """
+    Queue marker asking the writer thread to commit everything before it.
+    """
+
+    __slots__ = ("done",)
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class SqliteSink:
+    """
+    Write-behind persistence of sensor readings into a local SQLite database.
+
+    Readings are put on a bounded in-memory queue and returned to the caller
+    immediately. A background thread takes them off the queue and inserts them
+    with one `executemany` per batch of up to `batch_size` rows in a single
+    transaction; the insert statement is prepared once and reused from the
+    connection's statement cache. The database runs in WAL mode with
+    synchronous=NORMAL, so commits do not wait for a full fsync and readers
+    never block the writer. Rows are indexed by (sensor_id, ts).
+
+    When the queue is full, `write`, which runs on the read path of sensors,
+    drops the reading right away, and `add` waits up to `put_timeout` seconds
+    for the writer to catch up first; dropped readings are counted in
+    `dropped`. A batch that fails because of one of its rows is split in
+    halves until the bad rows are isolated, so only they are lost; a batch
+    that fails for another reason, e.g. a locked database, is retried once.
+    Every row that could not be committed is counted in `dropped` as well.
+    `close` (also registered with atexit) commits every queued reading and
+    checkpoints the WAL before returning.
+
+    Attributes:
+        path (str): Path to the database file.
+        batch_size (int): Maximum number of rows per transaction.
+        flush_interval (float): Seconds a partial batch waits for more rows before it is committed.
+        written (int): Number of rows committed.
+        dropped (int): Number of rows dropped because the queue was full, the sink was closed or they failed to commit.
+        batches (int): Number of transactions committed.
+        errors (int): Number of transactions that failed to commit.
+        last_error (Optional[BaseException]): Exception of the last failed transaction.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000, flush_interval: float = 1.0, max_queue: int = 100_000, put_timeout: float = 1.0) -> None:
+        """
+        Open the database, create the table and index if needed, and start the writer thread.
+
+        Args:
+            path (str): Path to the database file.
+            batch_size (int): Maximum number of rows per transaction. Default is 1000.
+            flush_interval (float): Seconds a partial batch waits for more rows before it is committed. Default is 1.
+            max_queue (int): Maximum number of rows waiting to be written. Default is 100000.
+            put_timeout (float): Seconds `add` waits for room in a full queue before dropping. Default is 1.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._connection.execute(statement)
+        self._thread = threading.Thread(target=self._run, name="sqlite-sink", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, sensor: BaseSensor, timestamp: Optional[float] = None) -> int:
+        """
+        Queue the last data of a sensor, one row per metric, without ever waiting for room in the queue.
+
+        Args:
+            sensor (BaseSensor): Sensor of any type, including stations.
+            timestamp (Optional[float]): Time of the reading. Default is now.
+
+        Returns:
+            int: Number of rows queued.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        queued = 0
+        for metric, value in sensor.readings():
+            if value is not None and self.add(sensor.sensor_id, sensor.location, metric, timestamp, value, block=False):
+                queued += 1
+        return queued
+
+    def add(self, sensor_id: Hashable, location: Optional[str], metric: str, timestamp: float, value: Any, block: bool = True) -> bool:
+        """
+        Queue one reading.
+
+        Args:
+            sensor_id (Hashable): Identifier of the sensor.
+            location (Optional[str]): Location of the sensor.
+            metric (str): Name of the metric.
+            timestamp (float): Time of the reading as a Unix timestamp.
+            value (Any): The reading.
+            block (bool): Wait up to `put_timeout` seconds for room in a full queue. Default is True.
+
+        Returns:
+            bool: True if the reading was queued, False if it was dropped.
+        """
+        if not self._closed:
+            row = (sensor_id, location, metric, timestamp, value)
+            try:
+                if block:
+                    self._queue.put(row, timeout=self.put_timeout)
+                else:
+                    self._queue.put_nowait(row)
+                return True
+            except queue.Full:
+                pass
+        with self._lock:
+            self.dropped += 1
+        return False
+
+    def _run(self) -> None:
+        """
+        Take rows off the queue and commit them in batches until the sink is closed.
+        """
+        batch: List[Row] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if type(item) is tuple:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+            self._commit(batch)
+            batch = []
+            deadline = None
+            if isinstance(item, _Flush):
+                item.done.set()
+                if self._closed:
+                    self._drain()
+                    return
+
+    def _drain(self) -> None:
+        """
+        Commit the rows queued by writers that raced with close.
+        """
+        batch: List[Row] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if type(item) is tuple:
+                batch.append(item)
+            else:
+                item.done.set()
+        self._commit(batch)
+
+    def _commit(self, batch: List[Row], retries: int = 1) -> None:
+        """
+        Insert a batch of rows in one transaction, isolating bad rows and retrying other failures.
+
+        Args:
+            batch (List[Row]): The rows.
+            retries (int): Times a batch failing for a reason other than its rows is retried. Default is 1.
+        """
+        if not batch:
+            return
+        try:
+            with self._connection:
+                self._connection.execute("BEGIN")
+                self._connection.executemany(INSERT, batch)
+        except sqlite3.Error as e:
+            with self._lock:
+                self.errors += 1
+                self.last_error = e
+            if isinstance(e, _ROW_ERRORS) and len(batch) > 1:
+                middle = len(batch) // 2
+                self._commit(batch[:middle], retries)
+                self._commit(batch[middle:], retries)
+            elif not isinstance(e, _ROW_ERRORS) and retries > 0:
+                self._commit(batch, retries - 1)
+            else:
+                with self._lock:
+                    self.dropped += len(batch)
+            return
+        with self._lock:
+            self.written += len(batch)
+            self.batches += 1
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Commit every reading queued so far.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait. Default is no limit.
+
+        Returns:
+            bool: True if the readings were committed within the timeout.
+        """
+        if not self._thread.is_alive():
+            return self._queue.empty()
+        marker = _Flush()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self) -> None:
+        """
+        Commit every queued reading, checkpoint the WAL into the database file and stop the writer thread.
+
+        Readings written after close are dropped. Calling close again does nothing.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        atexit.unregister(self.close)
+        marker = _Flush()
+        self._queue.put(marker)
+        self._thread.join()
+        self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._connection.close()
+
+    def query(self, sensor_id: Hashable, start: float = float("-inf"), end: float = float("inf")) -> List[Tuple[float, str, Any]]:
+        """
+        Read the committed readings of a sensor within a time range through the (sensor_id, ts) index.
+
+        Args:
+            sensor_id (Hashable): Identifier of the sensor.
+            start (float): Earliest timestamp, inclusive. Default is no limit.
+            end (float): Latest timestamp, inclusive. Default is no limit.
+
+        Returns:
+            List[Tuple[float, str, Any]]: (ts, metric, value) rows in time order.
+        """
+        with sqlite3.connect(self.path) as connection:
+            rows = connection.execute("SELECT ts, metric, value FROM readings WHERE sensor_id = ? AND ts BETWEEN ? AND ? ORDER BY ts, rowid", (sensor_id, start, end)).fetchall()
+        connection.close()
+        return rows
+
+    def __enter__(self) -> "SqliteSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,254 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from sensors.base_sensor import BaseSensor, Source, Status
+from sensors.temperature import TemperatureSensor
+from sensors.humidity import HumiditySensor
+from sensors.pressure import PressureSensor
+from sensors.wind import WindSensor
+from sensors.rainfall import RainfallSensor
+import json
+from sensors import http_client
+
+METRIC_SENSORS = {
+    "temperature": TemperatureSensor,
+    "humidity": HumiditySensor,
+    "pressure": PressureSensor,
+    "wind": WindSensor,
+    "rainfall": RainfallSensor,
+}
+
+class Station(BaseSensor):
+    """
+    Multi-metric sensor reading every metric of a location in one pass.
+
+    A single file lookup or API call fills all metric sensors of the station, which
+    stay available as attributes (`station.temperature`, `station.wind`, ...) and
+    keep their per-type methods. The last data of the station maps metric names to
+    the values read; a metric missing from the source is None and listed in `missing`.
+
+    Attributes:
+        sensors (Dict[str, BaseSensor]): Metric sensors of the station keyed by metric name.
+        missing (List[str]): Metrics that were not present in the last read.
+    """
+
+    __slots__ = ("sensors", "missing", "_file_keys")
+
+    def __init__(self, sensor_id: int, location: str, status: Union[Status, str] = "active", source: Union[Source, str] = "file", data_file_path: str = "data/data.json", api_url: str = "", metrics: Optional[Iterable[str]] = None, history_capacity: int = 0, use_index: bool = False) -> None:
+        """
+        Initialize the station and its metric sensors.
+
+        Args:
+            sensor_id (int): Unique identifier for the station.
+            location (str): Location where the station is deployed.
+            status (Union[Status, str]): Status of the station. Default is 'active'.
+            source (Union[Source, str]): Source of the station data. Default is 'file'.
+            data_file_path (str): Path to the file containing sensor data. Default is 'data/data.json'.
+            api_url (str): URL to fetch sensor data from an API. Default is an empty string.
+            metrics (Optional[Iterable[str]]): Metrics measured by the station. Default is all of METRIC_SENSORS.
+            history_capacity (int): Number of past readings kept by every metric sensor. Default is 0, which disables the history.
+            use_index (bool): Read only the location's record through the byte-offset index. Default is False.
+        """
+        super().__init__(sensor_id, location, status, source, data_file_path, api_url, use_index=use_index)
+        names = list(METRIC_SENSORS) if metrics is None else list(metrics)
+        unknown = [name for name in names if name not in METRIC_SENSORS]
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(unknown)}")
+        self.sensors: Dict[str, BaseSensor] = {
+            name: METRIC_SENSORS[name](sensor_id, location, status, source, data_file_path, api_url, history_capacity) for name in names
+        }
+        self.missing: List[str] = []
+        self._file_keys = tuple(key for sensor in self.sensors.values() for key in sensor.FILE_KEYS)
+
+    @property
+    def FILE_KEYS(self) -> Tuple[str, ...]:
+        """
+        Keys of the 'city_data' records read by all metric sensors.
+        """
+        return self._file_keys
+
+    def __getattr__(self, name: str) -> BaseSensor:
+        """
+        Give access to the metric sensors as attributes.
+        """
+        try:
+            sensors = object.__getattribute__(self, "sensors")
+        except AttributeError:
+            sensors = {}
+        if name in sensors:
+            return sensors[name]
+        raise AttributeError(f"{type(self).__name__} has no attribute or metric {name!r}")
+
+    def read_data_from_file(self) -> None:
+        """
+        Read all metrics from a file with a single lookup, clearing every metric if the read fails.
+        """
+        try:
+            self.parse_city_data(self.load_city_data())
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            self._clear()
+            raise RuntimeError(f"Error reading data from file: {e}")
+        except Exception:
+            self._clear()
+            raise
+
+    def read_data_from_api(self) -> None:
+        """
+        Read all metrics from a single API response, clearing every metric if the read fails.
+        """
+        try:
+            self.parse_api_data(self.load_api_data())
+        except http_client.RequestException as e:
+            self._clear()
+            raise RuntimeError(f"Error reading data from API: {e}")
+        except Exception:
+            self._clear()
+            raise
+
+    def read_data_from_stream(self) -> None:
+        """
+        Read all metrics from the newest observation in a stream log, clearing every metric if the read fails.
+        """
+        try:
+            super().read_data_from_stream()
+        except Exception:
+            self._clear()
+            raise
+
+    def parse_city_data(self, city_data: dict) -> None:
+        """
+        Fill every metric sensor from the record of the station's location in a data file.
+
+        Args:
+            city_data (dict): Record of the location from the 'city_data' object.
+        """
+        self._fill(lambda sensor: sensor.parse_city_data(city_data))
+
+    def parse_api_data(self, all_data: dict) -> None:
+        """
+        Fill every metric sensor from a decoded API response.
+
+        Args:
+            all_data (dict): Decoded API response.
+        """
+        self._fill(lambda sensor: sensor.parse_api_data(all_data))
+
+    def _clear(self) -> None:
+        """
+        Mark every metric as missing after a failed read, so no metric sensor keeps a value from an earlier read.
+        """
+        for sensor in self.sensors.values():
+            sensor.last_data = None
+        self.missing = list(self.sensors)
+        self.last_data = None
+
+    def _fill(self, parse) -> None:
+        """
+        Run a parse function on every metric sensor and collect their values.
+
+        Args:
+            parse: Function filling the last data of one metric sensor.
+        """
+        data = {}
+        missing = []
+        for name, sensor in self.sensors.items():
+            try:
+                parse(sensor)
+            except KeyError:
+                sensor.last_data = None
+                missing.append(name)
+            data[name] = sensor.last_data
+        self.missing = missing
+        self.last_data = data
+
+    def record_reading(self, timestamp: float) -> None:
+        """
+        Append the last data of every metric sensor to its history and pass the station's readings to the attached monitor and sink.
+
+        Args:
+            timestamp (float): Time of the reading as a Unix timestamp.
+        """
+        for sensor in self.sensors.values():
+            sensor.record_reading(timestamp)
+        if self.monitor is not None:
+            self.monitor.observe(self, timestamp)
+        if self.sink is not None:
+            self.sink.write(self, timestamp)
+
+    def readings(self) -> List[Tuple[str, Any]]:
+        """
+        Get the last data of every metric sensor as (metric, value) pairs.
+
+        Returns:
+            List[Tuple[str, Any]]: The metrics of all metric sensors with data.
+        """
+        return [reading for sensor in self.sensors.values() for reading in sensor.readings()]
+
+    def _metric(self, name: str) -> BaseSensor:
+        """
+        Get a metric sensor, raising a clear error if the station does not measure it.
+
+        Args:
+            name (str): Name of the metric.
+
+        Returns:
+            BaseSensor: The metric sensor.
+        """
+        if name not in self.sensors:
+            raise AttributeError(f"Station {self.sensor_id} does not measure {name}")
+        return self.sensors[name]
+
+    def convert_to_fahrenheit(self) -> float:
+        """
+        Convert the last temperature to Fahrenheit.
+
+        Returns:
+            float: The last temperature in Fahrenheit.
+        """
+        return self._metric("temperature").convert_to_fahrenheit()
+
+    def convert_to_psi(self) -> float:
+        """
+        Convert the last pressure from hPa to PSI.
+
+        Returns:
+            float: The last pressure in PSI.
+        """
+        return self._metric("pressure").convert_to_psi()
+
+    def is_humid(self, thresold: float = 70.0) -> bool:
+        """
+        Check if the last humidity is above a certain thresold.
+
+        Args:
+            thresold (float): Thresold value to compare the data against. Default is 70.
+
+        Returns:
+            bool: True if the last humidity is above the thresold, False otherwise.
+        """
+        return self._metric("humidity").is_humid(thresold)
+
+    def is_raining(self, threshold: float = 50.0) -> bool:
+        """
+        Check if the last rainfall is above a certain threshold.
+
+        Args:
+            threshold (float): Threshold value to compare the data against. Default is 50.
+
+        Returns:
+            bool: True if the last rainfall is above the threshold, False otherwise.
+        """
+        return self._metric("rainfall").is_raining(threshold)
+
+    def convert_speed_to_kmh(self) -> float:
+        """
+        Convert the last wind speed (m/s) to km/h.
+
+        Returns:
+            float: The last wind speed in km/h.
+        """
+        return self._metric("wind").convert_speed_to_kmh()
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the station.
+        """
+        return f"Station in {self.location} with last data: {self.last_data}"
@@ -0,0 +1,272 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from sensors.decoder import get_decoder
+
+def _select(record: Dict[str, Any], locations: Optional[frozenset], metrics: Optional[frozenset]) -> Optional[Dict[str, Any]]:
+    """
+    Filter one observation by location and metric.
+
+    Args:
+        record (Dict[str, Any]): Decoded observation.
+        locations (Optional[frozenset]): Accepted locations, None for all.
+        metrics (Optional[frozenset]): Metric keys to keep, None for all.
+
+    Returns:
+        Optional[Dict[str, Any]]: The observation with only the requested metrics, None if it is filtered out.
+    """
+    if locations is not None and record.get("location") not in locations:
+        return None
+    if metrics is None:
+        return record
+    selected = {key: value for key, value in record.items() if key in metrics}
+    if not selected:
+        return None
+    selected["location"] = record.get("location")
+    if "ts" in record:
+        selected["ts"] = record["ts"]
+    return selected
+
+def _as_set(values: Optional[Iterable[str]]) -> Optional[frozenset]:
+    return None if values is None else frozenset(values)
+
+def iter_observations(path: str, locations: Optional[Iterable[str]] = None, metrics: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily read observations from a newline-delimited JSON file.
+
+    Every line holds one observation such as
+    `{"ts": 1734345600, "location": "Bratislava", "temp": 7.0, "humidity": 60}`,
+    using the keys of the 'city_data' records. Only one line is held in memory at a
+    time, so memory stays constant regardless of the file size. Blank lines are skipped.
+
+    Args:
+        path (str): Path to the NDJSON file.
+        locations (Optional[Iterable[str]]): Only yield observations of these locations. Default is all.
+        metrics (Optional[Iterable[str]]): Only keep these metric keys and skip observations without any of them. Default is all.
+
+    Returns:
+        Iterator[Dict[str, Any]]: The matching observations in file order.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        json.JSONDecodeError: If a line is not valid JSON.
+    """
+    locations = _as_set(locations)
+    metrics = _as_set(metrics)
+    loads = get_decoder().loads
+    with open(path, "r") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = _select(loads(line), locations, metrics)
+            if record is not None:
+                yield record
+
+class _LogState:
+    """
+    Read position of one log and the newest observation of every location up to it.
+    """
+
+    __slots__ = ("inode", "offset", "seq", "latest")
+
+    def __init__(self, inode: int) -> None:
+        self.inode = inode
+        self.offset = 0
+        self.seq = 0
+        # location -> metric key (None for any) -> (line number, observation)
+        self.latest: Dict[Any, Dict[Optional[str], Tuple[int, Dict[str, Any]]]] = {}
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.seq += 1
+        entry = (self.seq, record)
+        keys = self.latest.setdefault(record.get("location"), {})
+        keys[None] = entry
+        for key in record:
+            keys[key] = entry
+
+
+class StreamIndex:
+    """
+    Process-wide index of the newest observation of every location in append-only NDJSON logs.
+
+    Every log is read incrementally: a lookup only decodes the lines appended
+    since the previous one, so reading the newest observation no longer scans the
+    whole log. Entries are keyed by the absolute path and validated against the
+    file's (inode, size); a replaced or truncated log is indexed again from its
+    beginning. A last line without its newline is only indexed once it decodes,
+    so a line that is still being written is picked up by a later lookup. At most
+    `max_files` logs are indexed; the least recently used one is dropped first.
+
+    Attributes:
+        max_files (int): Maximum number of logs kept in the index.
+    """
+
+    def __init__(self, max_files: int = 16) -> None:
+        """
+        Initialize an empty index.
+
+        Args:
+            max_files (int): Maximum number of logs kept in the index. Default is 16.
+        """
+        if max_files < 1:
+            raise ValueError("max_files must be at least 1")
+        self.max_files = max_files
+        self._logs: "OrderedDict[str, _LogState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def latest(self, path: str, location: str, metrics: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Find the newest observation of a location, reading only the lines appended since the last lookup.
+
+        Args:
+            path (str): Path to the NDJSON file.
+            location (str): Location to look for.
+            metrics (Optional[Iterable[str]]): Only consider observations with at least one of these metric keys. Default is all.
+
+        Returns:
+            Optional[Dict[str, Any]]: The last matching observation, None if there is none.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            json.JSONDecodeError: If a line is not valid JSON.
+        """
+        key = os.path.abspath(path)
+        with self._lock:
+            state = self._update(key)
+            keys = state.latest.get(location)
+            if keys is None:
+                return None
+            if metrics is None:
+                return keys[None][1]
+            metrics = _as_set(metrics)
+            entries = [keys[metric] for metric in metrics if metric in keys]
+        if not entries:
+            return None
+        return _select(max(entries, key=lambda entry: entry[0])[1], None, metrics)
+
+    def _update(self, key: str) -> _LogState:
+        """
+        Index the lines appended to a log since its last lookup.
+        """
+        with open(key, "rb") as file:
+            stat = os.fstat(file.fileno())
+            state = self._logs.get(key)
+            if state is None or state.inode != stat.st_ino or stat.st_size < state.offset:
+                state = self._logs[key] = _LogState(stat.st_ino)
+            self._logs.move_to_end(key)
+            while len(self._logs) > self.max_files:
+                self._logs.popitem(last=False)
+            if stat.st_size == state.offset:
+                return state
+            loads = get_decoder().loads
+            file.seek(state.offset)
+            for line in file:
+                if line.strip():
+                    if not line.endswith(b"\n"):
+                        try:
+                            record = loads(line)
+                        except ValueError:
+                            break
+                    else:
+                        record = loads(line)
+                    state.add(record)
+                state.offset += len(line)
+        return state
+
+    def invalidate(self, path: str) -> None:
+        """
+        Drop the index of a log, if any.
+
+        Args:
+            path (str): Path to the NDJSON file.
+        """
+        with self._lock:
+            self._logs.pop(os.path.abspath(path), None)
+
+    def clear(self) -> None:
+        """
+        Drop the index of every log.
+        """
+        with self._lock:
+            self._logs.clear()
+
+
+stream_index = StreamIndex()
+
+def latest_observation(path: str, location: str, metrics: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Find the newest observation of a location in a newline-delimited JSON file.
+
+    The log is indexed incrementally by the shared `stream_index`, so repeated
+    reads only decode the lines appended in between. The returned observation is
+    shared with other callers and must not be modified.
+
+    Args:
+        path (str): Path to the NDJSON file.
+        location (str): Location to look for.
+        metrics (Optional[Iterable[str]]): Only consider observations with at least one of these metric keys. Default is all.
+
+    Returns:
+        Optional[Dict[str, Any]]: The last matching observation, None if there is none.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        json.JSONDecodeError: If a line is not valid JSON.
+    """
+    return stream_index.latest(path, location, metrics)
+
+def tail_observations(path: str, locations: Optional[Iterable[str]] = None, metrics: Optional[Iterable[str]] = None, from_start: bool = False, poll_interval: float = 1.0, stop: Optional[threading.Event] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Follow an append-only newline-delimited JSON log and yield observations as they are written.
+
+    A line is yielded only once its terminating newline has been written, so
+    observations that are still being appended are never decoded half-way. If the
+    file is truncated or replaced by a new file, reading restarts from its beginning.
+
+    Args:
+        path (str): Path to the NDJSON file.
+        locations (Optional[Iterable[str]]): Only yield observations of these locations. Default is all.
+        metrics (Optional[Iterable[str]]): Only keep these metric keys. Default is all.
+        from_start (bool): Yield the observations already in the file first. Default is False.
+        poll_interval (float): Seconds to wait for new data when the end of the file is reached. Default is 1.
+        stop (Optional[threading.Event]): Event ending the iteration once set. Default is to follow forever.
+
+    Returns:
+        Iterator[Dict[str, Any]]: The matching observations in file order.
+    """
+    locations = _as_set(locations)
+    metrics = _as_set(metrics)
+    file = open(path, "r")
+    try:
+        if not from_start:
+            file.seek(0, os.SEEK_END)
+        pending = ""
+        while stop is None or not stop.is_set():
+            line = file.readline()
+            if line:
+                pending += line
+                if not pending.endswith("\n"):
+                    continue
+                line, pending = pending, ""
+                if line.strip():
+                    record = _select(get_decoder().loads(line), locations, metrics)
+                    if record is not None:
+                        yield record
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stat = None
+            if stat is not None and (stat.st_ino != os.fstat(file.fileno()).st_ino or stat.st_size < file.tell()):
+                file.close()
+                file = open(path, "r")
+                pending = ""
+                continue
+            if stop is not None:
+                stop.wait(poll_interval)
+            else:
+                time.sleep(poll_interval)
+    finally:
+        file.close()
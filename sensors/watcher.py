@@ -0,0 +1,370 @@
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sensors.base_sensor import BaseSensor
+from sensors.file_cache import file_cache
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+
+ChangeCallback = Callable[[BaseSensor, Any, Any], None]
+
+class Inotify:
+    """
+    Minimal ctypes binding of Linux inotify, watching directories for finished writes and renames.
+
+    Directories are watched rather than files, so a data file replaced by an
+    atomic rename keeps being followed.
+
+    Attributes:
+        fd (int): The inotify file descriptor, readable when events are pending.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create the inotify instance.
+
+        Raises:
+            OSError: If inotify is not available on this platform.
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._directories: Dict[int, str] = {}
+
+    def add_directory(self, directory: str) -> None:
+        """
+        Watch a directory for files written, renamed into it, deleted or touched.
+
+        Args:
+            directory (str): Absolute path of the directory.
+        """
+        if directory in self._directories.values():
+            return
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE | IN_ATTRIB)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), directory)
+        self._directories[wd] = directory
+
+    def read(self) -> Optional[List[str]]:
+        """
+        Drain the pending events.
+
+        Returns:
+            Optional[List[str]]: Absolute paths of the changed files, None if events were lost and everything must be checked.
+        """
+        paths: List[str] = []
+        while True:
+            try:
+                buffer = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return paths
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = _EVENT.unpack_from(buffer, offset)
+                offset += _EVENT.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                if wd in self._directories and name:
+                    paths.append(os.path.join(self._directories[wd], os.fsdecode(name)))
+
+    def close(self) -> None:
+        """
+        Close the inotify instance.
+        """
+        os.close(self.fd)
+
+
+class _Subscription:
+    """
+    A sensor following a data file, with the values it was last updated from.
+    """
+
+    __slots__ = ("sensor", "callback", "values")
+
+    def __init__(self, sensor: BaseSensor, callback: Optional[ChangeCallback]) -> None:
+        self.sensor = sensor
+        self.callback = callback
+        self.values: Any = None
+
+
+class FileWatcher:
+    """
+    Pushes data file changes to subscribed file-sourced sensors.
+
+    Instead of every sensor re-reading its data file on every poll, the watcher
+    waits for the file to change (inotify on Linux, polling the file's
+    modification time elsewhere), parses it once and updates only the sensors
+    whose values in the record of their location actually changed. Every updated
+    sensor gets its last data and history set as by `read_data`, and its callback
+    is called with the sensor, the old and the new last data. While no file
+    changes, the watcher does no file I/O at all with inotify and one stat per
+    file and poll interval otherwise.
+
+    Attributes:
+        poll_interval (float): Seconds between checks when polling.
+        debounce (float): Seconds to wait for more events after a change before reloading.
+        on_change (Optional[ChangeCallback]): Called for every updated sensor that has no callback of its own.
+        uses_inotify (bool): Whether changes are detected with inotify.
+        reloads (int): Number of times a data file was parsed.
+        updates (int): Number of sensor updates pushed.
+        errors (int): Number of reloads that failed, e.g. on a half-written file.
+        last_error (Optional[BaseException]): Exception of the last failed reload.
+    """
+
+    def __init__(self, poll_interval: float = 1.0, use_inotify: Optional[bool] = None, debounce: float = 0.05, on_change: Optional[ChangeCallback] = None) -> None:
+        """
+        Initialize the watcher.
+
+        Args:
+            poll_interval (float): Seconds between checks when polling. Default is 1.
+            use_inotify (Optional[bool]): Force inotify on or off. Default is to use it when available.
+            debounce (float): Seconds to wait for more events after a change before reloading. Default is 0.05.
+            on_change (Optional[ChangeCallback]): Default callback of updated sensors.
+        """
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.on_change = on_change
+        self.reloads = 0
+        self.updates = 0
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+        self._inotify: Optional[Inotify] = None
+        if use_inotify is not False:
+            try:
+                self._inotify = Inotify()
+            except OSError:
+                if use_inotify:
+                    raise
+        self.uses_inotify = self._inotify is not None
+        self._files: Dict[str, Dict[str, List[_Subscription]]] = {}
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._signatures: Dict[str, Optional[Tuple[int, int, int]]] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, sensor: BaseSensor, callback: Optional[ChangeCallback] = None) -> None:
+        """
+        Start pushing changes of a sensor's data file to the sensor.
+
+        The sensor is updated from the current content of the file right away, without a callback.
+
+        Args:
+            sensor (BaseSensor): File-sourced sensor to update.
+            callback (Optional[ChangeCallback]): Called with the sensor, its old and its new last data after every update. Default is `on_change`.
+
+        Raises:
+            ValueError: If the sensor does not read from a file.
+        """
+        if sensor.source != "file":
+            raise ValueError(f"Sensor {sensor.sensor_id} does not read from a file")
+        path = os.path.abspath(sensor.data_file_path)
+        subscription = _Subscription(sensor, callback)
+        changes: List[Tuple[_Subscription, Any, Any]] = []
+        with self._lock:
+            if self._inotify is not None:
+                self._inotify.add_directory(os.path.dirname(path))
+            if path not in self._records:
+                # Sensors that subscribed while the file could not be parsed are updated now.
+                changes = self._reload(path)
+            locations = self._files.setdefault(path, {})
+            locations.setdefault(sensor.location, []).append(subscription)
+            self._apply(subscription, self._records.get(path, {}).get(sensor.location), notify=False)
+        self._notify(changes)
+
+    def unsubscribe(self, sensor: BaseSensor) -> None:
+        """
+        Stop pushing changes to a sensor.
+
+        Args:
+            sensor (BaseSensor): Subscribed sensor.
+        """
+        with self._lock:
+            for path, locations in list(self._files.items()):
+                subscriptions = locations.get(sensor.location, [])
+                subscriptions[:] = [subscription for subscription in subscriptions if subscription.sensor is not sensor]
+                if not subscriptions:
+                    locations.pop(sensor.location, None)
+                if not locations:
+                    del self._files[path]
+                    self._records.pop(path, None)
+                    self._signatures.pop(path, None)
+
+    def _reload(self, path: str) -> List[Tuple[_Subscription, Any, Any]]:
+        """
+        Parse a data file if it changed or was never parsed successfully, and update the sensors whose values changed.
+
+        Args:
+            path (str): Absolute path to the data file.
+
+        Returns:
+            List[Tuple[_Subscription, Any, Any]]: Updated subscriptions with their old and new last data, for the callbacks.
+        """
+        try:
+            stat = os.stat(path)
+            signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except FileNotFoundError:
+            signature = None
+        if path in self._records and self._signatures.get(path) == signature:
+            return []
+        try:
+            records = {} if signature is None else file_cache.load(path)["city_data"]
+        except (OSError, KeyError, TypeError, json.JSONDecodeError) as e:
+            self.errors += 1
+            self.last_error = e
+            return []
+        self.reloads += 1
+        self._signatures[path] = signature
+        previous = self._records.get(path, {})
+        self._records[path] = records
+        changes = []
+        for location, subscriptions in self._files.get(path, {}).items():
+            record = records.get(location)
+            if record == previous.get(location):
+                continue
+            for subscription in subscriptions:
+                change = self._apply(subscription, record, notify=True)
+                if change is not None:
+                    changes.append(change)
+        return changes
+
+    def _apply(self, subscription: _Subscription, record: Optional[dict], notify: bool) -> Optional[Tuple[_Subscription, Any, Any]]:
+        """
+        Update a sensor from the record of its location if its values changed.
+
+        Args:
+            subscription (_Subscription): The subscribed sensor.
+            record (Optional[dict]): New record of the location, None if the location is gone.
+            notify (bool): Whether the update is reported for the callbacks.
+
+        Returns:
+            Optional[Tuple[_Subscription, Any, Any]]: The subscription with its old and new last data, None if nothing changed or `notify` is False.
+        """
+        sensor = subscription.sensor
+        keys = sensor.FILE_KEYS
+        if record is None:
+            values = None
+        elif keys:
+            values = tuple(record.get(key) for key in keys)
+        else:
+            values = record
+        if notify and values == subscription.values:
+            return None
+        subscription.values = values
+        old = sensor.last_data
+        if record is None:
+            sensor.last_data = None
+        else:
+            try:
+                sensor.parse_city_data(record)
+            except KeyError:
+                sensor.last_data = None
+        sensor.record_reading(time.time())
+        if not notify or old == sensor.last_data:
+            return None
+        self.updates += 1
+        return (subscription, old, sensor.last_data)
+
+    def _notify(self, changes: List[Tuple[_Subscription, Any, Any]]) -> None:
+        for subscription, old, new in changes:
+            callback = subscription.callback or self.on_change
+            if callback is not None:
+                callback(subscription.sensor, old, new)
+
+    def check(self, paths: Optional[List[str]] = None) -> int:
+        """
+        Reload changed data files now and run the callbacks of updated sensors.
+
+        Args:
+            paths (Optional[List[str]]): Data files to check. Default is all watched files.
+
+        Returns:
+            int: Number of sensors updated.
+        """
+        with self._lock:
+            watched = list(self._files) if paths is None else [path for path in paths if path in self._files]
+            changes = [change for path in watched for change in self._reload(path)]
+        self._notify(changes)
+        return len(changes)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            if self._inotify is None:
+                self._stop.wait(self.poll_interval)
+                self.check()
+                continue
+            ready, _, _ = select.select([self._inotify.fd], [], [], self.poll_interval)
+            if not ready:
+                continue
+            if self.debounce:
+                self._stop.wait(self.debounce)
+            paths = self._inotify.read()
+            self.check(None if paths is None else list(dict.fromkeys(paths)))
+
+    def start(self) -> None:
+        """
+        Start watching in a background thread.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="file-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background thread and release inotify.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the watcher counters.
+
+        Returns:
+            Dict[str, Any]: Watched files and sensors, reloads, updates and errors.
+        """
+        with self._lock:
+            sensors = sum(len(subscriptions) for locations in self._files.values() for subscriptions in locations.values())
+            return {
+                "files": len(self._files),
+                "sensors": sensors,
+                "inotify": self.uses_inotify,
+                "reloads": self.reloads,
+                "updates": self.updates,
+                "errors": self.errors,
+            }
+
+    def __enter__(self) -> "FileWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -1,28 +1,24 @@
+from typing import Any, List, Tuple
 from sensors.base_sensor import BaseSensor
+from sensors.history import MultiChannelHistory
 import json
-import requests
+from sensors import http_client
 
 class WindSensor(BaseSensor):
     """
     Wind sensor class that inherits from BaseSensor.
     """
 
+    __slots__ = ()
+
+    FILE_KEYS = ("wind_speed", "wind_deg", "wind_gust")
+
     def read_data_from_file(self) -> None:
         """
         Read wind data from a file.
         """
         try:
-            with open(self.data_file_path, "r") as file:
-                all_data = json.load(file)
-                city_data = all_data["city_data"].get(self.location)
-                if city_data is None:
-                    self.last_data = None
-                    raise KeyError(f"Location {self.location} not found in data file")
-                else:
-                    wind_speed = city_data.get("wind_speed", None)
-                    wind_deg = city_data.get("wind_deg", None)
-                    wind_gust = city_data.get("wind_gust", None)
-                    self.last_data = {"speed": wind_speed, "deg": wind_deg, "gust": wind_gust}
+            self.parse_city_data(self.load_city_data())
         except (FileNotFoundError, json.JSONDecodeError) as e:
             self.last_data = None
             raise RuntimeError(f"Error reading data from file: {e}")
@@ -32,18 +28,59 @@ class WindSensor(BaseSensor):
         Read wind data from an API.
         """
         try:
-            response = requests.get(self.api_url)
-            response.raise_for_status()
-            all_data = response.json()
-            wind_data = all_data.get("wind", {})
-            if "speed" not in wind_data or "deg" not in wind_data or "gust" not in wind_data:
-                self.last_data = None
-                raise KeyError("No 'wind.speed', 'wind.deg' or 'wind.gust' key in API response")
-            self.last_data = {"speed": wind_data["speed"], "deg": wind_data["deg"], "gust": wind_data["gust"]}
-        except (requests.RequestException, KeyError) as e:
+            self.parse_api_data(self.load_api_data())
+        except (http_client.RequestException, KeyError) as e:
             self.last_data = None
             raise RuntimeError(f"Error reading data from API: {e}")
 
+    def parse_city_data(self, city_data: dict) -> None:
+        """
+        Set the last data from the record of the sensor's location in a data file.
+
+        Args:
+            city_data (dict): Record of the location from the 'city_data' object.
+        """
+        wind_speed = city_data.get("wind_speed", None)
+        wind_deg = city_data.get("wind_deg", None)
+        wind_gust = city_data.get("wind_gust", None)
+        self.last_data = {"speed": wind_speed, "deg": wind_deg, "gust": wind_gust}
+
+    def parse_api_data(self, all_data: dict) -> None:
+        """
+        Set the last data from a decoded API response.
+
+        Args:
+            all_data (dict): Decoded API response.
+        """
+        wind_data = all_data.get("wind", {})
+        if "speed" not in wind_data or "deg" not in wind_data or "gust" not in wind_data:
+            self.last_data = None
+            raise KeyError("No 'wind.speed', 'wind.deg' or 'wind.gust' key in API response")
+        self.last_data = {"speed": wind_data["speed"], "deg": wind_data["deg"], "gust": wind_data["gust"]}
+
+    def create_history(self, capacity: int) -> MultiChannelHistory:
+        """
+        Create the ring buffer keeping past wind speed, direction and gust readings.
+
+        Args:
+            capacity (int): Number of readings kept.
+
+        Returns:
+            MultiChannelHistory: History with 'speed', 'deg' and 'gust' channels.
+        """
+        return MultiChannelHistory(("speed", "deg", "gust"), capacity)
+
+    def readings(self) -> List[Tuple[str, Any]]:
+        """
+        Get the last wind speed, direction and gust as (metric, value) pairs.
+
+        Returns:
+            List[Tuple[str, Any]]: The 'wind_speed', 'wind_deg' and 'wind_gust' values, empty if there is no data.
+        """
+        if not self.last_data:
+            return []
+        return [(key, self.last_data.get(channel)) for key, channel in zip(self.FILE_KEYS, ("speed", "deg", "gust"))]
+
     def convert_speed_to_kmh(self) -> float:
         """
         Convert wind speed (m/s) to km/h.
@@ -55,6 +92,7 @@ class WindSensor(BaseSensor):
 
     def __str__(self):
         """
-        Return a string representation of the sensor.
+        Return a string representation of the sensor, with None for missing data.
         """
-        return f"Wind sensor for location {self.location} with last data: Wind speed {self.last_data['speed']} m/s, Wind direction {self.last_data['deg']} degrees, Wind gust {self.last_data['gust']} m/s"
\ No newline at end of file
+        data = self.last_data or {}
+        return f"Wind sensor for location {self.location} with last data: Wind speed {data.get('speed')} m/s, Wind direction {data.get('deg')} degrees, Wind gust {data.get('gust')} m/s"
\ No newline at end of file
@@ -0,0 +1,12 @@
+from typing import Iterator
+import pytest
+from sensors.api_cache import response_cache
+
+@pytest.fixture(autouse=True)
+def clear_response_cache() -> Iterator[None]:
+    """
+    Start every test with an empty API response cache, so mocked responses do not leak between tests.
+    """
+    response_cache.clear()
+    yield
+    response_cache.clear()
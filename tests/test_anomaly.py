@@ -0,0 +1,92 @@
+import json
+import os
+import random
+import pytest
+from sensors.anomaly import AnomalyMonitor, Detector, EwmaDetector, FlatlineDetector, RateOfChangeDetector, Reason
+from sensors.humidity import HumiditySensor
+from sensors.pressure import PressureSensor
+from sensors.station import Station
+
+@pytest.fixture
+def monitor() -> AnomalyMonitor:
+    """
+    Fixture to create a monitor with the default detectors.
+    """
+    return AnomalyMonitor()
+
+def test_ewma_flags_spike() -> None:
+    """
+    Test if a reading far from the moving average is flagged after the warmup, and noise is not.
+    """
+    rng = random.Random(1)
+    detector = EwmaDetector(warmup=20)
+    flagged = [detector.update("p", "pressure", i, 1010 + rng.gauss(0, 1)) for i in range(200)]
+    assert not any(flagged)
+    anomaly = detector.update("p", "pressure", 200, 1030)
+    assert anomaly.reason is Reason.SPIKE and anomaly.score > 4
+    assert EwmaDetector().update("q", "pressure", 0, 1030) is None
+
+def test_flatline_detector() -> None:
+    """
+    Test if a metric that does not change for `min_duration` is flagged until it changes, however often it is read.
+    """
+    detector = FlatlineDetector(min_duration=3600, min_run=3)
+    assert not any(detector.update("h", "humidity", i, 60) for i in range(100)), "Rereading an unchanged value is not a flatline."
+    results = [detector.update("h", "humidity", t, 60) for t in (1800, 3600, 5400)]
+    assert results[0] is None
+    assert [(r.reason, r.score) for r in results[1:]] == [(Reason.FLATLINE, 3600), (Reason.FLATLINE, 5400)]
+    assert detector.update("h", "humidity", 7200, 61) is None
+    assert detector.update("h", "humidity", 10800, 61) is None, "Two readings are fewer than min_run."
+    assert not detector.watches("rainfall")
+
+def test_rate_of_change_detector() -> None:
+    """
+    Test if a jump faster than the hourly limit is flagged and fast polls are not over-penalised.
+    """
+    detector = RateOfChangeDetector()
+    assert detector.update("p", "pressure", 0, 1010) is None
+    assert detector.update("p", "pressure", 1, 1010.1) is None
+    anomaly = detector.update("p", "pressure", 600, 1050)
+    assert anomaly.reason is Reason.RATE_OF_CHANGE and anomaly.score == pytest.approx(39.9 * 3600 / 599)
+    assert not detector.watches("wind_deg")
+
+def test_attached_monitor_flags_reads(monitor: AnomalyMonitor, tmp_path) -> None:
+    """
+    Test if every read of an attached sensor is evaluated, rereading an unchanged file is not flagged, and flagged readings carry their reason code.
+    """
+    found = []
+    monitor.on_anomaly = found.append
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"city_data": {"Kosice": {"humidity": 60}}}))
+    sensor = HumiditySensor(3, "Kosice", source="file", data_file_path=str(path))
+    monitor.attach(sensor)
+    for _ in range(20):
+        sensor.read_data()
+    assert found == []
+    (tmp_path / "new.json").write_text(json.dumps({"city_data": {"Kosice": {"humidity": 99}}}))
+    os.replace(tmp_path / "new.json", path)
+    sensor.read_data()
+    assert {(a.key, a.metric, a.reason) for a in found} == {(3, "humidity", Reason.SPIKE), (3, "humidity", Reason.RATE_OF_CHANGE)}
+    assert monitor.counts[Reason.SPIKE] == 1 and monitor.counts[Reason.FLATLINE] == 0
+    monitor.detach(sensor)
+    sensor.read_data()
+    assert len(found) == 2 and sensor.monitor is None
+
+def test_detector_is_abstract() -> None:
+    """
+    Test if a detector without an update method cannot be created.
+    """
+    with pytest.raises(TypeError):
+        Detector(None)
+
+def test_fleet_batch_evaluation(monitor: AnomalyMonitor) -> None:
+    """
+    Test if the latest readings of a fleet are evaluated at once, per sensor and metric.
+    """
+    fleet = [PressureSensor(i, "Kosice") for i in range(3)] + [Station(10, "Zilina")]
+    for step in range(12):
+        for i, sensor in enumerate(fleet[:3]):
+            sensor.last_data = 1000 + step % 2 + (40 if i == 1 and step == 11 else 0)
+        fleet[3].last_data = None
+        anomalies = monitor.evaluate(fleet, timestamp=step * 600)
+    assert {(a.key, a.reason) for a in anomalies} == {(1, Reason.SPIKE), (1, Reason.RATE_OF_CHANGE)}
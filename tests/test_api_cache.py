@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from sensors.api_cache import ResponseCache
+from sensors.temperature import TemperatureSensor
+from sensors.humidity import HumiditySensor
+from sensors.wind import WindSensor
+from sensors.rainfall import RainfallSensor
+
+PAYLOAD = {
+    "main": {"temp": 4.2, "humidity": 81, "pressure": 1021},
+    "wind": {"speed": 2.1, "deg": 250, "gust": 3.4},
+    "clouds": {"all": 75},
+}
+
+def test_response_cache_ttl() -> None:
+    """
+    Test if a payload is reused while fresh and fetched again once expired.
+    """
+    now = [0.0]
+    fetch = MagicMock(return_value={"main": {"temp": 1.0}})
+    cache = ResponseCache(ttl=10.0, fetch=fetch, clock=lambda: now[0])
+    cache.get("https://fake.url")
+    now[0] = 9.0
+    cache.get("https://fake.url")
+    assert fetch.call_count == 1, "Fresh payload should be served from the cache."
+    now[0] = 10.5
+    cache.get("https://fake.url")
+    assert fetch.call_count == 2, "Expired payload should be fetched again."
+    assert cache.stats()["hits"] == 1
+
+def test_response_cache_single_flight() -> None:
+    """
+    Test if concurrent callers of the same URL share one fetch.
+    """
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(url: str) -> dict:
+        calls.append(url)
+        started.set()
+        release.wait(5)
+        return PAYLOAD
+
+    cache = ResponseCache(ttl=0, fetch=slow_fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("https://fake.url"))) for _ in range(8)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    while cache.coalesced < 7:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1, "Concurrent callers should coalesce onto one request."
+    assert all(result is PAYLOAD for result in results)
+
+def test_response_cache_errors_are_shared_and_not_cached() -> None:
+    """
+    Test if a failed fetch raises for its caller and is retried by the next one.
+    """
+    fetch = MagicMock(side_effect=[ConnectionError("down"), PAYLOAD])
+    cache = ResponseCache(fetch=fetch)
+    with pytest.raises(ConnectionError):
+        cache.get("https://fake.url")
+    assert cache.get("https://fake.url") is PAYLOAD
+    assert fetch.call_count == 2
+
+@patch("sensors.http_client.requests.Session.get")
+def test_sensor_types_share_one_request(mock_get: MagicMock) -> None:
+    """
+    Test if sensors of different types for the same URL cost a single request.
+
+    Args:
+        mock_get (MagicMock): Mocked requests.Session.get function.
+    """
+    mock_resp = MagicMock()
+    mock_resp.content = json.dumps(PAYLOAD).encode()
+    mock_resp.raise_for_status.return_value = None
+    mock_get.return_value = mock_resp
+
+    sensors = [
+        TemperatureSensor(0, "Dolny Kubin", source="api", api_url="https://fake.url"),
+        HumiditySensor(1, "Dolny Kubin", source="api", api_url="https://fake.url"),
+        WindSensor(2, "Dolny Kubin", source="api", api_url="https://fake.url"),
+        RainfallSensor(3, "Dolny Kubin", source="api", api_url="https://fake.url"),
+    ]
+    for sensor in sensors:
+        sensor.read_data()
+    assert mock_get.call_count == 1
+    assert [sensor.get_data() for sensor in sensors] == [4.2, 81, {"speed": 2.1, "deg": 250, "gust": 3.4}, 75]
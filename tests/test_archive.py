@@ -0,0 +1,114 @@
+import pytest
+from array import array
+from sensors.archive import ColumnStore
+from sensors.wind import WindSensor
+from sensors.temperature import TemperatureSensor
+
+@pytest.fixture
+def store(tmp_path) -> ColumnStore:
+    """
+    Create a store with readings of two sensors appended in time order.
+
+    Returns:
+        ColumnStore: The store.
+    """
+    store = ColumnStore(str(tmp_path / "archive"), buffer_rows=4)
+    for ts in range(10):
+        store.append(float(ts), "temp_ba", "temp", 20.0 + ts)
+        store.append(float(ts), 7, "pressure", 1000.0 + ts)
+    store.flush()
+    return store
+
+def test_scan_range_is_zero_copy(store: ColumnStore) -> None:
+    """
+    Test if an unfiltered scan of a sorted store returns memoryviews of the mapped files.
+    """
+    result = store.scan(2.0, 4.0)
+    assert isinstance(result.value, memoryview)
+    assert list(result) == [
+        (2.0, "temp_ba", "temp", 22.0),
+        (2.0, 7, "pressure", 1002.0),
+        (3.0, "temp_ba", "temp", 23.0),
+        (3.0, 7, "pressure", 1003.0),
+    ]
+
+def test_scan_filters(store: ColumnStore) -> None:
+    """
+    Test if scans can be restricted to one sensor and metric.
+    """
+    result = store.scan(5.0, sensor_id=7, metric="pressure")
+    assert list(result.value) == [1005.0, 1006.0, 1007.0, 1008.0, 1009.0]
+    assert len(store.scan(sensor_id="unknown")) == 0
+
+def test_store_reopen(store: ColumnStore, tmp_path) -> None:
+    """
+    Test if a reopened store sees the flushed rows and dictionaries.
+    """
+    store.append(10.0, "temp_ba", "temp", 30.0)
+    store.close()
+    reopened = ColumnStore(str(tmp_path / "archive"))
+    assert len(reopened) == 21
+    assert list(reopened.scan(10.0)) == [(10.0, "temp_ba", "temp", 30.0)]
+
+def test_reopen_drops_rows_of_interrupted_flush(store: ColumnStore, tmp_path, monkeypatch) -> None:
+    """
+    Test if rows written by a flush that crashed before updating the metadata are dropped on reopen.
+    """
+    store.append(10.0, "temp_ke", "temp", 30.0)
+    monkeypatch.setattr(store, "_write_meta", lambda: None)
+    store.flush()
+    reopened = ColumnStore(str(tmp_path / "archive"))
+    assert len(reopened) == 20
+    assert list(reopened.scan(9.0)) == [(9.0, "temp_ba", "temp", 29.0), (9.0, 7, "pressure", 1009.0)]
+
+def test_sensor_ids_must_survive_json(store: ColumnStore) -> None:
+    """
+    Test if sensor ids that would change after reopening are rejected without buffering a row.
+    """
+    with pytest.raises(TypeError):
+        store.append(10.0, ("temp", 1), "temp", 30.0)
+    with pytest.raises(TypeError):
+        store.append_many([10.0], object(), "temp", [30.0])
+    assert len(store) == 20
+    assert store.stats()["sensors"] == 2
+
+def test_out_of_order_rows_and_compaction(store: ColumnStore) -> None:
+    """
+    Test if late rows are scanned from the unsorted tail and sorted in by compaction.
+    """
+    store.append(3.5, "temp_ba", "temp", 99.0)
+    store.append(3.0, "temp_ba", "temp", 42.0)
+    store.flush()
+    assert store.stats()["sorted_rows"] == 20
+    assert list(store.scan(3.0, 4.0, sensor_id="temp_ba").value) == [23.0, 99.0, 42.0]
+    store.compact()
+    assert store.stats()["rows"] == store.stats()["sorted_rows"] == 21
+    result = store.scan(3.0, 4.0, sensor_id="temp_ba")
+    assert list(result.ts) == [3.0, 3.5]
+    assert list(result.value) == [42.0, 99.0], "Compaction should keep the last written duplicate."
+    assert isinstance(store.scan(3.0, 4.0).value, memoryview)
+
+def test_append_sensor_and_history(tmp_path) -> None:
+    """
+    Test if sensors write one row per metric and histories can be archived in bulk.
+    """
+    store = ColumnStore(str(tmp_path / "archive"))
+    wind = WindSensor("wind_ba", "Bratislava")
+    wind.last_data = {"speed": 3.5, "deg": 42, "gust": None}
+    assert store.append_sensor(wind, ts=1.0) == 2
+    temperature = TemperatureSensor(1, "Kosice", source="file", data_file_path="../data/data.json", history_capacity=8)
+    temperature.read_data()
+    temperature.read_data()
+    store.append_many(temperature.history.timestamps(), 1, "temp", temperature.history.window.values())
+    store.flush()
+    assert list(store.scan(metric="wind_deg").value) == [42.0]
+    assert list(store.scan(sensor_id=1).value) == [3.3, 3.3]
+
+def test_as_numpy(store: ColumnStore) -> None:
+    """
+    Test if scan results can be viewed as NumPy arrays.
+    """
+    np = pytest.importorskip("numpy")
+    columns = store.scan(0.0, 2.0).as_numpy()
+    assert columns["value"].dtype == np.float64
+    assert columns["value"].tolist() == [20.0, 1000.0, 21.0, 1001.0]
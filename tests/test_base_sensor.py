@@ -0,0 +1,54 @@
+import pytest
+from benchmarks.bench_memory import DictSensor, bytes_per_sensor
+from sensors.base_sensor import Source, Status
+from sensors.station import Station
+from sensors.temperature import TemperatureSensor
+from sensors.wind import WindSensor
+
+def test_sensors_have_no_instance_dict() -> None:
+    """
+    Test if sensors and stations are slotted and reject unknown attributes.
+    """
+    for sensor in (TemperatureSensor(1, "Bratislava"), WindSensor(2, "Bratislava"), Station(3, "Bratislava")):
+        assert not hasattr(sensor, "__dict__")
+    with pytest.raises(AttributeError):
+        TemperatureSensor(1, "Bratislava").unit = "C"
+
+def test_status_and_source_enums() -> None:
+    """
+    Test if status and source are stored as enum members that still behave like their strings.
+    """
+    sensor = TemperatureSensor(1, "Bratislava", status="inactive", source="api")
+    assert sensor.status is Status.INACTIVE
+    assert sensor.source is Source.API
+    assert sensor.status == "inactive" and f"{sensor.source}" == "api"
+    assert {"api": 1}[sensor.source] == 1
+    sensor.set_status("active")
+    assert sensor.get_status() is Status.ACTIVE
+
+def test_unknown_values_kept_as_strings() -> None:
+    """
+    Test if unknown status and source values are kept, making the sensor inactive or invalid.
+    """
+    sensor = TemperatureSensor(1, "Bratislava", status="calibrating")
+    assert sensor.status == "calibrating"
+    with pytest.raises(RuntimeError):
+        sensor.read_data()
+    sensor = TemperatureSensor(1, "Bratislava", source="ftp")
+    with pytest.raises(ValueError):
+        sensor.read_data()
+
+def test_strings_interned() -> None:
+    """
+    Test if sensors built from equal runtime strings share one string object.
+    """
+    first = TemperatureSensor(1, "".join(["Brati", "slava"]), data_file_path="/".join(["data", "data.json"]))
+    second = TemperatureSensor(2, "".join(["Bratis", "lava"]), data_file_path="/".join(["data", "data.json"]))
+    assert first.location is second.location
+    assert first.data_file_path is second.data_file_path
+
+def test_slotted_sensor_smaller() -> None:
+    """
+    Test if a slotted sensor uses less memory than the dictionary layout.
+    """
+    assert bytes_per_sensor(TemperatureSensor, 2000, 10) < bytes_per_sensor(DictSensor, 2000, 10) / 2
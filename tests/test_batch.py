@@ -0,0 +1,94 @@
+import math
+import pytest
+from sensors import batch
+from sensors.temperature import TemperatureSensor
+from sensors.humidity import HumiditySensor
+from sensors.pressure import PressureSensor
+from sensors.wind import WindSensor
+from sensors.rainfall import RainfallSensor
+
+BACKENDS = [False, pytest.param(True, marks=pytest.mark.skipif(not batch.HAS_NUMPY, reason="NumPy is not installed"))]
+
+def make_fleet(sensor_class, values: list) -> list:
+    """
+    Create sensors of one type with the given last data.
+
+    Args:
+        sensor_class: Sensor class to instantiate.
+        values (list): Last data of every sensor.
+
+    Returns:
+        list: The sensors.
+    """
+    sensors = []
+    for i, value in enumerate(values):
+        sensor = sensor_class(i, f"City {i}")
+        sensor.last_data = value
+        sensors.append(sensor)
+    return sensors
+
+def same(batch_values, scalar_values: list) -> bool:
+    """
+    Compare batch results with scalar results, treating NaN as matching None.
+
+    Args:
+        batch_values: Result of a batch conversion.
+        scalar_values (list): Results of the per-sensor method.
+
+    Returns:
+        bool: True if every value matches exactly.
+    """
+    batch_values = [float(value) for value in batch_values]
+    if len(batch_values) != len(scalar_values):
+        return False
+    for batch_value, scalar_value in zip(batch_values, scalar_values):
+        if scalar_value is None:
+            if not math.isnan(batch_value):
+                return False
+        elif batch_value != scalar_value:
+            return False
+    return True
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_batch_conversions_match_scalar_methods(use_numpy: bool) -> None:
+    """
+    Test if batch conversions give exactly the results of the per-sensor methods.
+    """
+    temps = make_fleet(TemperatureSensor, [0, 10, -40, 7.3, None])
+    assert same(batch.fleet_fahrenheit(temps, use_numpy), [s.convert_to_fahrenheit() for s in temps])
+    pressures = make_fleet(PressureSensor, [1013.25, 995, None])
+    assert same(batch.fleet_psi(pressures, use_numpy), [s.convert_to_psi() for s in pressures])
+    winds = make_fleet(WindSensor, [{"speed": 3.5, "deg": 42, "gust": 2.54}, None, {"speed": 5.5, "deg": 0, "gust": 1}])
+    assert same(batch.fleet_kmh(winds, use_numpy), [s.convert_speed_to_kmh() for s in winds])
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_batch_masks_match_scalar_methods(use_numpy: bool) -> None:
+    """
+    Test if batch threshold checks match the per-sensor methods, with missing readings as False.
+    """
+    humidities = make_fleet(HumiditySensor, [40, 60, 100, 0, None])
+    assert list(batch.fleet_humid(humidities, 50, use_numpy)) == [False, True, True, False, False]
+    rains = make_fleet(RainfallSensor, [0, 50, 51, None])
+    assert list(batch.fleet_raining(rains, use_numpy=use_numpy)) == [s.is_raining() is True for s in rains]
+
+@pytest.mark.skipif(not batch.HAS_NUMPY, reason="NumPy is not installed")
+def test_numpy_and_pure_python_identical() -> None:
+    """
+    Test if the NumPy path and the pure-Python fallback give bit-identical results.
+    """
+    values = [i * 0.37 - 50 for i in range(1000)] + [None]
+    for function in (batch.to_fahrenheit, batch.to_psi, batch.to_kmh):
+        fast = function(values, use_numpy=True).tolist()
+        slow = function(values, use_numpy=False)
+        assert fast[:-1] == slow[:-1]
+        assert math.isnan(fast[-1]) and math.isnan(slow[-1])
+    assert batch.humid_mask(values, use_numpy=True).tolist() == batch.humid_mask(values, use_numpy=False)
+
+def test_fleet_values_missing_readings() -> None:
+    """
+    Test if missing readings and missing channels become NaN.
+    """
+    winds = make_fleet(WindSensor, [{"speed": None, "deg": 1, "gust": 2}, None, {"speed": 4, "deg": 1, "gust": 2}])
+    values = list(batch.fleet_values(winds, "speed", use_numpy=False))
+    assert math.isnan(values[0]) and math.isnan(values[1])
+    assert values[2] == 4.0
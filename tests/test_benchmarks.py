@@ -0,0 +1,51 @@
+import pytest
+from benchmarks.suite import combine_runs, compare, measure, percentile
+
+def test_percentile() -> None:
+    """
+    Test if percentiles interpolate between samples.
+    """
+    samples = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert percentile(samples, 50) == 3.0
+    assert percentile(samples, 95) == pytest.approx(4.8)
+    assert percentile([7.0], 99) == 7.0
+
+def test_measure_reports_latency_percentiles() -> None:
+    """
+    Test if measure returns throughput and ordered percentiles.
+    """
+    result = measure(lambda: sum(range(100)), min_time=0.01, min_samples=10, batch_size=10)
+    assert result["samples"] >= 10
+    assert result["ops_per_sec"] > 0
+    assert result["p50_us"] <= result["p95_us"] <= result["p99_us"]
+
+def test_compare_flags_regressions() -> None:
+    """
+    Test if only cases slower than the tolerance are reported.
+    """
+    baseline = {"fast": {"p50_us": 10.0}, "slow": {"p50_us": 10.0}}
+    results = {"fast": {"p50_us": 12.0}, "slow": {"p50_us": 20.0}, "new": {"p50_us": 1.0}}
+    regressions = compare(results, baseline, tolerance=0.5)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("slow:")
+
+def test_compare_ignores_noise() -> None:
+    """
+    Test if slowdowns within the run-to-run spread or the minimum delta are not reported.
+    """
+    baseline = {"noisy": {"p50_us": 3.0, "p50_spread_us": 2.5}, "tiny": {"p50_us": 0.1, "p50_spread_us": 0.01}}
+    results = {"noisy": {"p50_us": 5.0, "p50_spread_us": 0.5}, "tiny": {"p50_us": 0.2, "p50_spread_us": 0.01}}
+    assert compare(results, baseline, tolerance=0.5, min_delta_us=0.25) == []
+    results["noisy"]["p50_us"] = 6.0
+    assert [line.split(":")[0] for line in compare(results, baseline, tolerance=0.5, min_delta_us=0.25)] == ["noisy"]
+
+def test_combine_runs_takes_medians() -> None:
+    """
+    Test if repeated runs are combined into median statistics and their spread.
+    """
+    runs = [{"case": {"ops_per_sec": ops, "p50_us": p50, "p95_us": p50, "p99_us": p50, "samples": 10}} for ops, p50 in ((100, 1.0), (50, 5.0), (90, 1.2))]
+    result = combine_runs(runs)["case"]
+    assert result["p50_us"] == 1.2
+    assert result["ops_per_sec"] == 90
+    assert result["p50_spread_us"] == 4.0
+    assert result["samples"] == 30 and result["runs"] == 3
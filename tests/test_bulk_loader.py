@@ -0,0 +1,103 @@
+import json
+import math
+from array import array
+import pytest
+from benchmarks.datagen import make_city_data, write_data_file
+from sensors.bulk_loader import FleetSnapshot, load_shard, load_shards
+from sensors.station import Station
+from sensors.temperature import TemperatureSensor
+from sensors.wind import WindSensor
+
+@pytest.fixture
+def shards(tmp_path) -> list:
+    """
+    Write four shards of 50 cities each with distinct names.
+
+    Returns:
+        list: Paths of the shards.
+    """
+    paths = []
+    for shard in range(4):
+        city_data = {f"Region {shard} {name}": record for name, record in make_city_data(50, seed=shard).items()}
+        path = tmp_path / f"shard_{shard}.json"
+        path.write_text(json.dumps({"city_data": city_data}))
+        paths.append(str(path))
+    return paths
+
+def test_load_shard_columns() -> None:
+    """
+    Test if a shard becomes per-metric columns with NaN for missing values.
+    """
+    locations, columns = load_shard("../data/data.json")
+    assert locations == ["Bratislava", "Zilina", "Kosice"]
+    assert list(columns["temp"]) == [7.0, 5.2, 3.3]
+    assert columns["temp"].typecode == "d"
+
+def test_parallel_matches_serial(shards: list) -> None:
+    """
+    Test if loading in worker processes gives the same snapshot as loading in this process.
+    """
+    serial = load_shards(shards, workers=1)
+    parallel = load_shards(shards, workers=2)
+    assert len(parallel) == 200 and parallel.files == 4
+    assert parallel.locations == serial.locations
+    for metric, column in serial.columns.items():
+        assert list(parallel.columns[metric]) == list(column)
+
+def test_duplicate_locations_take_last_file(tmp_path) -> None:
+    """
+    Test if a location in several files keeps the values of the last one and missing metrics are NaN.
+    """
+    first = tmp_path / "first.json"
+    second = tmp_path / "second.json"
+    first.write_text(json.dumps({"city_data": {"A": {"temp": 1.0}, "B": {"temp": 2.0, "humidity": 50}}}))
+    second.write_text(json.dumps({"city_data": {"B": {"temp": 3.0}, "C": {"temp": 4.0}}}))
+    snapshot = load_shards([str(first), str(second)], workers=1)
+    assert snapshot.locations == ["A", "B", "C"]
+    assert list(snapshot.column("temp")) == [1.0, 3.0, 4.0]
+    assert math.isnan(snapshot.column("humidity")[1])
+    assert snapshot.record("B") == {"temp": 3.0}
+
+def test_sensors_read_from_snapshot() -> None:
+    """
+    Test if every sensor type reads its values from the snapshot.
+    """
+    snapshot = load_shards(["../data/data.json"], workers=1)
+    sensors = [TemperatureSensor(0, "Kosice"), WindSensor(1, "Bratislava"), Station(2, "Zilina", metrics=("pressure", "rainfall")), TemperatureSensor(3, "Atlantis")]
+    results = snapshot.apply_all(sensors)
+    assert [result.data for result in results[:3]] == [3.3, {"speed": 3.5, "deg": 42.0, "gust": 2.54}, {"pressure": 1035.0, "rainfall": 0.0}]
+    assert isinstance(results[3].error, KeyError)
+
+def test_broken_shard_raises(tmp_path) -> None:
+    """
+    Test if an unreadable shard fails the load with a RuntimeError naming it.
+    """
+    good = write_data_file(str(tmp_path / "good.json"), 5)
+    broken = tmp_path / "broken.json"
+    broken.write_text("{")
+    with pytest.raises(RuntimeError, match="broken.json"):
+        load_shards([good, str(broken)], workers=2)
+
+def test_malformed_records(tmp_path) -> None:
+    """
+    Test if records that are not objects become NaN rows and a 'city_data' that is not an object fails the load.
+    """
+    shard = tmp_path / "shard.json"
+    shard.write_text(json.dumps({"city_data": {"Nitra": None, "Trnava": [1, 2], "Presov": {"temp": 4.5}}}))
+    good = write_data_file(str(tmp_path / "good.json"), 5)
+    snapshot = load_shards([good, str(shard)], workers=2)
+    assert snapshot.locations[-3:] == ["Nitra", "Trnava", "Presov"]
+    assert math.isnan(snapshot.columns["temp"][-3]) and math.isnan(snapshot.columns["temp"][-2])
+    assert snapshot.columns["temp"][-1] == 4.5
+    shard.write_text(json.dumps({"city_data": [1, 2]}))
+    with pytest.raises(RuntimeError, match="shard.json"):
+        load_shards([good, str(shard)], workers=2)
+
+def test_numpy_column() -> None:
+    """
+    Test if a column can be viewed as a NumPy array without copying.
+    """
+    np = pytest.importorskip("numpy")
+    snapshot = FleetSnapshot(("temp",))
+    snapshot.merge(["A", "B"], {"temp": array("d", [1.5, 2.5])})
+    assert np.array_equal(snapshot.column("temp", use_numpy=True), [1.5, 2.5])
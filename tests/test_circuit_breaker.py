@@ -0,0 +1,161 @@
+import json
+import threading
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+from sensors.api_cache import ResponseCache, response_cache
+from sensors.circuit_breaker import CircuitBreaker, CircuitOpenError, State, is_outage
+from sensors.temperature import TemperatureSensor
+
+URL = "https://fake.url/data/2.5/weather?q=Nitra"
+
+@pytest.fixture
+def clock() -> list:
+    """
+    Fixture to create a manually advanced clock, read as clock[0].
+    """
+    return [0.0]
+
+def test_breaker_opens_and_probes(clock: list) -> None:
+    """
+    Test if the breaker opens after the threshold, lets one probe through after the reset timeout and closes on success.
+    """
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=lambda: clock[0])
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state is State.OPEN and not breaker.allow()
+    assert breaker.retry_after() == 10
+    clock[0] = 10
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state is State.OPEN and breaker.opened == 2
+    clock[0] = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state is State.CLOSED and breaker.failures == 0
+
+def test_open_breaker_fails_fast_without_payload(clock: list) -> None:
+    """
+    Test if an endpoint with an open breaker is not fetched again, even for other URLs of the endpoint.
+    """
+    fetch = MagicMock(side_effect=ConnectionError("down"))
+    cache = ResponseCache(fetch=fetch, breaker_factory=lambda: CircuitBreaker(failure_threshold=2, clock=lambda: clock[0]))
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            cache.get(URL)
+    with pytest.raises(CircuitOpenError) as error:
+        cache.get("https://fake.url/data/2.5/weather?q=Zilina")
+    assert error.value.endpoint == "https://fake.url/data/2.5/weather"
+    assert fetch.call_count == 2 and cache.stats()["rejected"] == 1 and cache.stats()["open_circuits"] == 1
+
+def test_stale_served_while_open_and_refreshed_in_background(clock: list) -> None:
+    """
+    Test if the last good payload is served with its age while the breaker is open, and replaced by a background probe.
+    """
+    release = threading.Event()
+    responses = [{"v": 1}, ConnectionError("down"), ConnectionError("down")]
+
+    def fetch(url: str) -> dict:
+        response = responses.pop(0) if responses else (release.wait(5), {"v": 2})[1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    cache = ResponseCache(ttl=10, fetch=fetch, clock=lambda: clock[0], breaker_factory=lambda: CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: clock[0]))
+    assert cache.lookup(URL) == ({"v": 1}, None)
+    clock[0] = 15
+    assert cache.lookup(URL) == ({"v": 1}, 15)
+    clock[0] = 20
+    assert cache.lookup(URL) == ({"v": 1}, 20)
+    assert cache.breaker(URL).state is State.OPEN
+    clock[0] = 50
+    assert cache.lookup(URL) == ({"v": 1}, 50)
+    assert cache.lookup(URL) == ({"v": 1}, 50)
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == "response-cache-refresh":
+            thread.join(5)
+    assert cache.lookup(URL) == ({"v": 2}, None)
+    assert cache.breaker(URL).state is State.CLOSED and cache.stats()["stale"] == 4
+
+@patch("sensors.http_client.requests.Session.get")
+def test_sensor_keeps_last_value_when_api_fails(mock_get: MagicMock) -> None:
+    """
+    Test if a sensor keeps its last good value, tagged with its age and not recorded again, while its API fails.
+
+    Args:
+        mock_get (MagicMock): Mocked requests.Session.get function.
+    """
+    import requests
+    mock_resp = MagicMock()
+    mock_resp.content = json.dumps({"main": {"temp": 4.2}}).encode()
+    mock_resp.raise_for_status.return_value = None
+    mock_get.return_value = mock_resp
+    sensor = TemperatureSensor(0, "Nitra", source="api", api_url=URL, history_capacity=5)
+    assert sensor.read_data() == 4.2 and sensor.stale_age is None
+
+    mock_get.side_effect = requests.ConnectionError("down")
+    with patch("sensors.api_cache.response_cache.ttl", 0.0):
+        assert sensor.read_data() == 4.2
+    assert sensor.stale_age is not None and sensor.stale_age >= 0
+    assert len(sensor.history) == 1
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+def test_only_outages_open_the_breaker(clock: list) -> None:
+    """
+    Test if client errors of single URLs do not open the breaker of their endpoint, while 5xx responses and timeouts do.
+    """
+    assert not is_outage(http_error(404)) and not is_outage(http_error(401)) and not is_outage(ValueError("bad json"))
+    assert is_outage(http_error(503)) and is_outage(requests.Timeout()) and is_outage(requests.ConnectionError())
+    fetch = MagicMock(side_effect=http_error(404))
+    cache = ResponseCache(fetch=fetch, breaker_factory=lambda: CircuitBreaker(failure_threshold=2, clock=lambda: clock[0]))
+    for _ in range(5):
+        with pytest.raises(requests.HTTPError):
+            cache.get("https://fake.url/data/2.5/weather?q=Atlantis")
+    assert cache.breaker(URL).state is State.CLOSED
+    fetch.side_effect = http_error(503)
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            cache.get(URL)
+    assert cache.breaker(URL).state is State.OPEN
+
+def test_stale_served_only_for_outages(clock: list) -> None:
+    """
+    Test if a failed fetch is answered with the last payload only for outages, also when caching is disabled.
+    """
+    payload = {"main": {"temp": 4.2}}
+    fetch = MagicMock(return_value=payload)
+    cache = ResponseCache(ttl=0, fetch=fetch, clock=lambda: clock[0])
+    assert cache.get(URL) is payload
+    clock[0] = 5
+    fetch.side_effect = http_error(404)
+    with pytest.raises(requests.HTTPError):
+        cache.get(URL)
+    fetch.side_effect = requests.Timeout("slow")
+    assert cache.lookup(URL) == (payload, 5)
+    assert fetch.call_count == 3
+
+def test_sensor_cleared_when_rejected(clock: list) -> None:
+    """
+    Test if a sensor drops its last value once its payload is too old to be served in place of an open circuit.
+    """
+    fetch = MagicMock(return_value={"main": {"temp": 4.2}})
+
+    def breaker_factory() -> CircuitBreaker:
+        return CircuitBreaker(failure_threshold=1, reset_timeout=1e9, clock=lambda: clock[0])
+
+    with patch.object(response_cache, "fetch", fetch), patch.object(response_cache, "clock", lambda: clock[0]), patch.object(response_cache, "breaker_factory", breaker_factory):
+        sensor = TemperatureSensor(0, "Nitra", source="api", api_url=URL)
+        assert sensor.read_data() == 4.2
+        fetch.side_effect = requests.ConnectionError("down")
+        clock[0] = 100
+        assert sensor.read_data() == 4.2 and sensor.stale_age == 100
+        clock[0] = 100 + response_cache.max_stale
+        with pytest.raises(CircuitOpenError):
+            sensor.read_data()
+        assert sensor.get_data() is None
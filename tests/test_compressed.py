@@ -0,0 +1,113 @@
+import math
+import random
+import pytest
+from typing import List, Tuple
+from sensors.compressed import CompressedSeries, CompressedStore
+from sensors.station import Station
+from sensors.wind import WindSensor
+
+@pytest.fixture
+def samples() -> List[Tuple[float, float]]:
+    """
+    Fixture to create a minute-polled temperature random walk with jitter, a gap, a repeated timestamp, missing values and outliers.
+    """
+    rng = random.Random(7)
+    timestamp, value = 1_700_000_000.0, 7.0
+    result = []
+    for i in range(1000):
+        timestamp += 60 + rng.choice([0, 0, 0, 0.001, -0.002, 0.25]) + (3600 if i == 500 else 0)
+        if rng.random() < 0.3:
+            value = round(value + rng.uniform(-0.5, 0.5), 1)
+        result.append((round(timestamp, 3), value))
+    result[10] = (result[10][0], math.nan)
+    result[11] = (result[11][0], -1e300)
+    result[12] = (result[11][0], 0.0)
+    return result
+
+def assert_samples_equal(actual: List[Tuple[float, float]], expected: List[Tuple[float, float]]) -> None:
+    """
+    Assert that two lists of samples are equal, treating NaN values as equal.
+    """
+    assert len(actual) == len(expected)
+    for (ts, value), (expected_ts, expected_value) in zip(actual, expected):
+        assert ts == expected_ts
+        assert value == expected_value or (math.isnan(value) and math.isnan(expected_value))
+
+def test_round_trip(samples: List[Tuple[float, float]]) -> None:
+    """
+    Test if every timestamp and value decodes exactly, across blocks and in the open block.
+    """
+    series = CompressedSeries(block_size=64)
+    for timestamp, value in samples:
+        series.append(timestamp, value)
+    assert len(series) == 1000
+    assert_samples_equal(list(series), samples)
+    assert list(series.values())[100:110] == [value for _, value in samples[100:110]]
+
+def test_random_access_and_range(samples: List[Tuple[float, float]]) -> None:
+    """
+    Test if positions and time ranges are served from their blocks, including ranges across block boundaries.
+    """
+    series = CompressedSeries(block_size=64)
+    for timestamp, value in samples:
+        series.append(timestamp, value)
+    for index in (0, 63, 64, 500, 999, -1):
+        assert series[index] == samples[index]
+    with pytest.raises(IndexError):
+        series[1000]
+    start, end = samples[100][0], samples[300][0]
+    assert list(series.range(start, end)) == samples[100:301]
+    assert list(series.range(samples[-1][0] + 1)) == []
+    assert list(series.range(end=samples[0][0])) == samples[:1]
+
+def test_range_with_duplicates_across_blocks() -> None:
+    """
+    Test if every sample at the start of a range is found when equal timestamps span several blocks.
+    """
+    series = CompressedSeries(block_size=3)
+    samples = [(10.0, 0.0), (20.0, 1.0), (20.0, 2.0), (20.0, 3.0), (20.0, 4.0), (20.0, 5.0), (20.0, 6.0), (30.0, 7.0)]
+    for timestamp, value in samples:
+        series.append(timestamp, value)
+    assert list(series.range(20.0, 20.0)) == samples[1:7]
+    assert list(series.range(20.0)) == samples[1:]
+
+def test_compression_of_slow_readings() -> None:
+    """
+    Test if regularly polled, slowly changing readings take a small fraction of the 16 bytes of a raw sample.
+    """
+    series = CompressedSeries()
+    for i in range(10_000):
+        series.append(1_700_000_000 + 60 * i, 1012 + (i // 50) % 5)
+    assert series.bytes_per_sample() < 1
+    empty = CompressedSeries()
+    assert empty.bytes_per_sample() == 0 and list(empty) == [] and list(empty.range()) == []
+
+def test_rejects_earlier_timestamps() -> None:
+    """
+    Test if a sample earlier than the previous one is rejected, and equal timestamps are accepted.
+    """
+    series = CompressedSeries()
+    series.append(100.0, 1.0)
+    series.append(100.0, None)
+    with pytest.raises(ValueError):
+        series.append(99.0, 2.0)
+    assert len(series) == 2 and math.isnan(series[1][1])
+
+def test_store_appends_sensors() -> None:
+    """
+    Test if the store keeps one series per sensor and metric, including every metric of stations.
+    """
+    store = CompressedStore(block_size=8)
+    wind = WindSensor(1, "Bratislava", data_file_path="../data/data.json")
+    station = Station(2, "Zilina", data_file_path="../data/data.json", metrics=["temperature", "humidity"])
+    for step in range(20):
+        wind.read_data()
+        station.read_data()
+        assert store.append_sensor(wind, 60.0 * step) == 3
+        store.append_sensor(station, 60.0 * step)
+    assert len(store) == 5
+    assert list(store.series(1, "wind_speed").values()) == [wind.last_data["speed"]] * 20
+    assert store.series(2, "temp")[-1] == (1140.0, station.temperature.last_data)
+    assert store.nbytes < 5 * 20 * 16
+    with pytest.raises(KeyError):
+        store.series(1, "temp")
@@ -0,0 +1,72 @@
+import json
+import pytest
+import requests
+from typing import Iterator
+from unittest.mock import patch, MagicMock
+from sensors import decoder
+from sensors.decoder import JsonDecoder, available_backends, get_decoder, set_decoder
+from sensors.file_cache import file_cache
+from sensors.http_client import HttpClient
+
+PAYLOAD = {
+    "coord": {"lon": 17.1, "lat": 48.1},
+    "weather": [{"id": 800, "main": "Clear", "description": "clear sky", "icon": "01d"}],
+    "main": {"temp": 7.5, "pressure": 1012, "humidity": 60, "note": "\"quoted\" \\ {braces}"},
+    "wind": {"speed": 3.5, "deg": 42, "gust": 5.1},
+    "name": "Bratislava",
+}
+
+@pytest.fixture
+def stdlib_decoder() -> Iterator[JsonDecoder]:
+    """
+    Fixture to make the standard library the shared decoder for one test.
+    """
+    previous = get_decoder()
+    stdlib = JsonDecoder("json")
+    set_decoder(stdlib)
+    yield stdlib
+    set_decoder(previous)
+
+def test_backends_agree() -> None:
+    """
+    Test if every installed backend decodes the same document and reports errors as json.JSONDecodeError.
+    """
+    backends = available_backends()
+    assert backends[-1] == "json"
+    assert JsonDecoder().backend == backends[0]
+    raw = json.dumps(PAYLOAD).encode()
+    for backend in backends:
+        assert JsonDecoder(backend).loads(raw) == PAYLOAD
+        assert JsonDecoder(backend).loads(raw.decode()) == PAYLOAD
+        with pytest.raises(json.JSONDecodeError):
+            JsonDecoder(backend).loads(b'{"main": ')
+    with pytest.raises(ValueError):
+        JsonDecoder("yaml")
+
+def test_file_cache_uses_shared_decoder(stdlib_decoder: JsonDecoder, tmp_path) -> None:
+    """
+    Test if data files are decoded by the decoder set with set_decoder.
+    """
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"city_data": {"Nitra": {"temp": 9.0}}}))
+    with patch.object(stdlib_decoder, "loads", wraps=stdlib_decoder.loads) as loads:
+        assert file_cache.load(str(path))["city_data"]["Nitra"] == {"temp": 9.0}
+    assert loads.call_count == 1
+    assert decoder.get_decoder() is stdlib_decoder
+
+@patch("sensors.http_client.requests.Session.get")
+def test_http_client_decodes_body(mock_get: MagicMock) -> None:
+    """
+    Test if API bodies are decoded from bytes and invalid ones raise a requests error.
+
+    Args:
+        mock_get (MagicMock): Mocked requests.Session.get function.
+    """
+    mock_resp = MagicMock()
+    mock_resp.content = json.dumps(PAYLOAD).encode()
+    mock_get.return_value = mock_resp
+    client = HttpClient()
+    assert client.get_json("https://fake.url") == PAYLOAD
+    mock_resp.content = b"<html>Bad gateway</html>"
+    with pytest.raises(requests.RequestException):
+        client.get_json("https://fake.url")
@@ -0,0 +1,80 @@
+import csv
+import json
+import math
+import pytest
+from typing import List
+from sensors.base_sensor import BaseSensor
+from sensors.bulk_loader import METRICS
+from sensors.exporter import export_fleet, iter_rows, read_binary
+from sensors.humidity import HumiditySensor
+from sensors.station import Station
+from sensors.temperature import TemperatureSensor
+from sensors.wind import WindSensor
+
+@pytest.fixture
+def fleet() -> List[BaseSensor]:
+    """
+    Fixture to create a fleet with read sensors, a sensor without data, a partial wind reading and a NaN value.
+    """
+    sensors = [
+        TemperatureSensor(0, "Bratislava", data_file_path="../data/data.json"),
+        WindSensor(1, "Zilina", data_file_path="../data/data.json"),
+        Station(2, "Kosice", data_file_path="../data/data.json", metrics=["temperature", "humidity"]),
+        HumiditySensor(3, 'Nove "Zamky"'),
+        WindSensor(4, "Nitra"),
+        TemperatureSensor(5, "Presov"),
+    ]
+    for sensor in sensors[:3]:
+        sensor.read_data()
+    sensors[4].last_data = {"speed": 2.5, "deg": None}
+    sensors[5].last_data = math.nan
+    return sensors
+
+def test_iter_rows(fleet: List[BaseSensor]) -> None:
+    """
+    Test if every sensor gives one row with its metrics in place and None for missing or non-finite values.
+    """
+    rows = list(iter_rows(fleet))
+    assert [row[2] for row in rows] == ["temperature", "wind", "station", "humidity", "wind", "temperature"]
+    temp, speed = METRICS.index("temp"), METRICS.index("wind_speed")
+    assert rows[0][3 + temp] == fleet[0].last_data and rows[2][3 + temp] == fleet[2].temperature.last_data
+    assert rows[3][3:] == (None,) * len(METRICS)
+    assert rows[4][3 + speed] == 2.5 and rows[4][3:].count(None) == len(METRICS) - 1
+    assert rows[5][3 + temp] is None
+
+def test_csv_export(fleet: List[BaseSensor], tmp_path) -> None:
+    """
+    Test if the CSV export has a header and one row per sensor, with empty fields for missing values.
+    """
+    path = str(tmp_path / "fleet.csv")
+    assert export_fleet(fleet, path) == len(fleet)
+    with open(path, newline="") as file:
+        lines = list(csv.reader(file))
+    assert lines[0] == ["sensor_id", "location", "type", *METRICS]
+    assert lines[4][:3] == ["3", 'Nove "Zamky"', "humidity"] and lines[4][3:] == [""] * len(METRICS)
+    assert float(lines[1][3 + METRICS.index("temp")]) == fleet[0].last_data
+
+def test_ndjson_export(fleet: List[BaseSensor], tmp_path) -> None:
+    """
+    Test if every NDJSON line is a valid object equal to the row, with null for missing values.
+    """
+    path = str(tmp_path / "fleet.ndjson")
+    export_fleet(fleet, path, chunk_rows=4)
+    with open(path) as file:
+        objects = [json.loads(line) for line in file]
+    assert [tuple(obj.values()) for obj in objects] == list(iter_rows(fleet))
+    assert list(objects[0]) == ["sensor_id", "location", "type", *METRICS]
+
+def test_binary_round_trip(fleet: List[BaseSensor], tmp_path) -> None:
+    """
+    Test if the binary export reads back as the same rows, as floats, and rejects non-integer ids.
+    """
+    path = str(tmp_path / "fleet.bin")
+    assert export_fleet(fleet, path, chunk_rows=4) == len(fleet)
+    metrics, rows = read_binary(path)
+    assert metrics == list(METRICS)
+    assert list(rows) == [row[:3] + tuple(None if value is None else float(value) for value in row[3:]) for row in iter_rows(fleet)]
+    with pytest.raises(ValueError):
+        export_fleet([TemperatureSensor("t0", "Nitra")], path)
+    with pytest.raises(ValueError):
+        export_fleet(fleet, str(tmp_path / "fleet.xml"))
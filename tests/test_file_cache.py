@@ -0,0 +1,84 @@
+import json
+import os
+import pytest
+from sensors.file_cache import FileCache, file_cache
+from sensors.temperature import TemperatureSensor
+from sensors.humidity import HumiditySensor
+
+def write_data(path, city_data: dict) -> None:
+    """
+    Write a data file in the format of data/data.json.
+
+    Args:
+        path: Path of the file to write.
+        city_data (dict): Content of the 'city_data' object.
+    """
+    with open(path, "w") as file:
+        json.dump({"city_data": city_data}, file)
+
+def test_file_cache_hit_and_miss(tmp_path) -> None:
+    """
+    Test if an unchanged file is parsed only once.
+    """
+    path = tmp_path / "data.json"
+    write_data(path, {"Bratislava": {"temp": 7.0}})
+    cache = FileCache()
+    first = cache.load(str(path))
+    second = cache.load(str(path))
+    assert first is second, "Unchanged file should be served from the cache."
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "files": 1}
+
+def test_file_cache_invalidated_on_change(tmp_path) -> None:
+    """
+    Test if a modified file is parsed again.
+    """
+    path = tmp_path / "data.json"
+    write_data(path, {"Bratislava": {"temp": 7.0}})
+    cache = FileCache()
+    assert cache.load(str(path))["city_data"]["Bratislava"]["temp"] == 7.0
+    write_data(path, {"Bratislava": {"temp": 12.5, "humidity": 40}})
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.load(str(path))["city_data"]["Bratislava"]["temp"] == 12.5
+    assert cache.misses == 2
+
+def test_file_cache_lru_eviction(tmp_path) -> None:
+    """
+    Test if the least recently used file is evicted when the cap is reached.
+    """
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"data_{i}.json"
+        write_data(path, {"City": {"temp": float(i)}})
+        paths.append(str(path))
+    cache = FileCache(max_files=2)
+    cache.load(paths[0])
+    cache.load(paths[1])
+    cache.load(paths[0])
+    cache.load(paths[2])
+    assert cache.evictions == 1
+    assert len(cache) == 2
+    cache.load(paths[0])
+    assert cache.hits == 2, "Recently used file should have survived the eviction."
+
+def test_file_cache_errors(tmp_path) -> None:
+    """
+    Test if missing and invalid files raise the expected exceptions.
+    """
+    cache = FileCache()
+    with pytest.raises(FileNotFoundError):
+        cache.load(str(tmp_path / "missing.json"))
+    path = tmp_path / "broken.json"
+    path.write_text("{not json")
+    with pytest.raises(json.JSONDecodeError):
+        cache.load(str(path))
+
+def test_file_cache_shared_between_sensor_types() -> None:
+    """
+    Test if different sensor types reading the same file share one parse.
+    """
+    file_cache.clear()
+    TemperatureSensor(0, "Bratislava", source="file", data_file_path="../data/data.json").read_data()
+    HumiditySensor(1, "Zilina", source="file", data_file_path="../data/data.json").read_data()
+    assert file_cache.misses == 1
+    assert file_cache.hits == 1
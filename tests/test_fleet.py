@@ -0,0 +1,110 @@
+import asyncio
+import json
+import time
+from typing import List
+from sensors.fleet import read_fleet
+from sensors.temperature import TemperatureSensor
+from sensors.wind import WindSensor
+from sensors.humidity import HumiditySensor
+
+PAYLOAD = {"main": {"temp": 4.2, "humidity": 81}, "wind": {"speed": 2.1, "deg": 250, "gust": 3.4}}
+
+async def handle_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """
+    Serve one request of the asyncio stub of the weather API.
+
+    The path selects the behaviour: '/slow' answers after 1 second and '/error' answers with 404.
+    """
+    request_line = (await reader.readline()).decode()
+    while (await reader.readline()) not in (b"\r\n", b""):
+        pass
+    path = request_line.split(" ")[1]
+    status = "200 OK"
+    if path.startswith("/slow"):
+        await asyncio.sleep(1)
+    if path.startswith("/error"):
+        status = "404 Not Found"
+    body = json.dumps(PAYLOAD).encode()
+    writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    writer.close()
+
+async def read_with_stub(paths: List[str], concurrency: int = 16, timeout: float = 1.0):
+    """
+    Start the asyncio stub and read one temperature sensor per path through it.
+    """
+    server = await asyncio.start_server(handle_request, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    sensors = [TemperatureSensor(i, f"City {i}", source="api", api_url=f"http://127.0.0.1:{port}{path}?id={i}") for i, path in enumerate(paths)]
+    async with server:
+        results = await read_fleet(sensors, concurrency=concurrency, timeout=timeout)
+        if any("/slow" in path for path in paths):
+            await asyncio.sleep(1)
+    return sensors, results
+
+def test_read_data_async_file() -> None:
+    """
+    Test if the async read path returns the same data as the synchronous one.
+    """
+    sensor = WindSensor(0, "Bratislava", source="file", data_file_path="../data/data.json")
+    data = asyncio.run(sensor.read_data_async())
+    assert data == {"speed": 3.5, "deg": 42, "gust": 2.54}
+    assert sensor.get_data() == data
+
+def test_read_fleet_api() -> None:
+    """
+    Test if a fleet of API sensors is read concurrently against the stub.
+    """
+    sensors, results = asyncio.run(read_with_stub(["/weather"] * 50))
+    assert all(result.ok for result in results)
+    assert [result.sensor for result in results] == sensors
+    assert all(result.data == 4.2 for result in results)
+
+def test_read_fleet_failures_are_isolated() -> None:
+    """
+    Test if errors and missed deadlines are reported per sensor without cancelling the rest.
+    """
+    _, results = asyncio.run(read_with_stub(["/weather", "/slow", "/error", "/weather"], timeout=0.5))
+    assert results[0].ok and results[0].data == 4.2
+    assert isinstance(results[1].error, asyncio.TimeoutError)
+    assert isinstance(results[2].error, RuntimeError)
+    assert results[3].ok and results[3].data == 4.2
+    assert results[3].elapsed < 0.5, "Slow sensor should not hold up the fleet."
+
+def test_read_fleet_mixed_sources() -> None:
+    """
+    Test if file sensors with errors are reported alongside successful reads.
+    """
+    sensors = [
+        HumiditySensor(0, "Zilina", source="file", data_file_path="../data/data.json"),
+        HumiditySensor(1, "Atlantis", source="file", data_file_path="../data/data.json"),
+        HumiditySensor(2, "Zilina", status="inactive", source="file", data_file_path="../data/data.json"),
+    ]
+    results = asyncio.run(read_fleet(sensors, concurrency=2))
+    assert results[0].data == 40
+    assert isinstance(results[1].error, KeyError)
+    assert isinstance(results[2].error, RuntimeError)
+
+class SleepySensor(TemperatureSensor):
+    """
+    Temperature sensor whose file read takes `delay` seconds and yields 99.
+    """
+
+    __slots__ = ("delay",)
+
+    def read_data_from_file(self) -> None:
+        time.sleep(self.delay)
+        self.last_data = 99
+
+def test_read_fleet_late_results_and_queued_deadlines() -> None:
+    """
+    Test if a read finishing after its timeout does not overwrite the sensor, and a read queued behind it gets its full deadline.
+    """
+    stuck, queued = SleepySensor(0, "Nitra"), SleepySensor(1, "Nitra")
+    stuck.delay, queued.delay = 0.4, 0.05
+    stuck.last_data = 7.0
+    results = asyncio.run(read_fleet([stuck, queued], concurrency=1, timeout=0.2))
+    assert isinstance(results[0].error, asyncio.TimeoutError)
+    assert results[1].ok and results[1].data == 99
+    time.sleep(0.4)
+    assert stuck.last_data == 7.0
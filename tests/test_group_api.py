@@ -0,0 +1,119 @@
+import threading
+import pytest
+import requests
+from benchmarks.stub_server import StubServer
+from sensors.api_cache import ResponseCache
+from sensors.fleet import FleetResult
+from sensors.group_api import GroupBatcher, group_url, split_city_url
+from sensors.humidity import HumiditySensor
+from sensors.station import Station
+from sensors.temperature import TemperatureSensor
+
+@pytest.fixture
+def server() -> StubServer:
+    """
+    Start a local stub emulating the current weather and group endpoints.
+    """
+    with StubServer() as server:
+        yield server
+
+def city_url(server: StubServer, city_id: int) -> str:
+    return f"{server.url}/data/2.5/weather?id={city_id}&units=metric&appid=KEY"
+
+def test_split_and_build_group_url() -> None:
+    """
+    Test if URLs by city ID are grouped by endpoint and parameters and others are not grouped.
+    """
+    key, city_id = split_city_url("https://host/data/2.5/weather?id=42&units=metric&appid=KEY")
+    assert city_id == 42
+    assert split_city_url("https://host/data/2.5/weather?appid=KEY&units=metric&id=7")[0] == key
+    assert split_city_url("https://host/data/2.5/weather?id=7&units=imperial&appid=KEY")[0] != key
+    assert split_city_url("https://host/data/2.5/weather?lat=49.2&lon=19.3&appid=KEY") is None
+    assert group_url(key, [42, 7]) == "https://host/data/2.5/group?id=42,7&appid=KEY&units=metric"
+
+def test_sensors_read_in_groups_of_twenty(server: StubServer) -> None:
+    """
+    Test if 45 cities need 3 group requests and every sensor gets its own city's data.
+    """
+    sensors = [TemperatureSensor(i, f"City {i}", source="api", api_url=city_url(server, 1000 + i)) for i in range(45)]
+    sensors += [HumiditySensor(100 + i, f"City {i}", source="api", api_url=city_url(server, 1000 + i)) for i in range(45)]
+    batcher = GroupBatcher(cache=ResponseCache(ttl=0))
+    results = batcher.read(sensors)
+    assert all(result.ok for result in results)
+    assert server.requests == 3
+    assert [sensor.get_data() for sensor in sensors[:3]] == [20.0, 20.1, 20.2]
+    assert sensors[45].get_data() == 81
+
+def test_missing_city_and_fallback(server: StubServer) -> None:
+    """
+    Test if a city missing from the response fails only its sensors and ungroupable URLs are read directly.
+    """
+    station = Station(0, "Known", source="api", api_url=city_url(server, 5), metrics=("temperature", "wind"))
+    unknown = TemperatureSensor(1, "Unknown", source="api", api_url=city_url(server, 999999999))
+    by_coordinates = TemperatureSensor(2, "Dolny Kubin", source="api", api_url=f"{server.url}/data/2.5/weather?lat=49.2&lon=19.3")
+    results = GroupBatcher(cache=ResponseCache(ttl=0)).read([station, unknown, by_coordinates])
+    assert results[0].data == {"temperature": 0.5, "wind": {"speed": 2.1, "deg": 250, "gust": 3.4}}
+    assert isinstance(results[1].error, RuntimeError)
+    assert unknown.get_data() is None
+    assert results[2].data == 4.2
+    assert server.requests == 2
+
+def test_failed_group_request() -> None:
+    """
+    Test if a failed group request is reported as an API read error of every sensor in it.
+    """
+    def fail(url: str) -> None:
+        raise requests.ConnectionError(f"cannot reach {url}")
+
+    sensors = [TemperatureSensor(i, "City", source="api", api_url=f"https://host/data/2.5/weather?id={i}") for i in range(2)]
+    sensors[0].last_data = 3.0
+    results = GroupBatcher(cache=ResponseCache(ttl=0, fetch=fail)).read(sensors)
+    assert all(isinstance(result.error, RuntimeError) for result in results)
+    assert sensors[0].get_data() is None
+
+def test_stale_group_response() -> None:
+    """
+    Test if data of a group response served stale sets the age of the sensors and is not recorded as a reading.
+    """
+    now = [0.0]
+    responses = [{"list": [{"id": 1, "main": {"temp": 3.5}}]}]
+
+    def fetch(url: str) -> dict:
+        if not responses:
+            raise requests.ConnectionError(f"cannot reach {url}")
+        return responses.pop()
+
+    sensor = TemperatureSensor(0, "City", source="api", api_url="https://host/data/2.5/weather?id=1", history_capacity=5)
+    batcher = GroupBatcher(cache=ResponseCache(ttl=10, fetch=fetch, clock=lambda: now[0]))
+    assert batcher.read([sensor])[0].data == 3.5
+    assert sensor.stale_age is None and len(sensor.history) == 1
+    now[0] = 25.0
+    assert batcher.read([sensor])[0].data == 3.5
+    assert sensor.stale_age == 25.0
+    assert len(sensor.history) == 1, "A stale response should not be recorded as a new reading."
+
+def test_submit_collects_reads(server: StubServer) -> None:
+    """
+    Test if reads submitted separately are sent as one group request.
+    """
+    batcher = GroupBatcher(cache=ResponseCache(ttl=0), linger=0.2)
+    futures = [batcher.submit(TemperatureSensor(i, f"City {i}", source="api", api_url=city_url(server, i))) for i in range(5)]
+    assert [future.result(timeout=5) for future in futures] == [0.0, 0.1, 0.2, 0.3, 0.4]
+    assert server.requests == 1
+
+def test_full_batch_sent_in_background() -> None:
+    """
+    Test if the submit that fills a batch returns before the batch is sent.
+    """
+    release = threading.Event()
+    batcher = GroupBatcher(max_ids=2, cache=ResponseCache(ttl=0), linger=60)
+
+    def read(sensors):
+        release.wait(5)
+        return [FleetResult(sensor, sensor.sensor_id) for sensor in sensors]
+
+    batcher.read = read
+    futures = [batcher.submit(TemperatureSensor(i, f"City {i}")) for i in range(2)]
+    assert not any(future.done() for future in futures)
+    release.set()
+    assert [future.result(timeout=5) for future in futures] == [0, 1]
@@ -0,0 +1,99 @@
+import random
+import statistics
+import pytest
+from sensors.history import RollingWindow, ReadingHistory, MultiChannelHistory
+from sensors.pressure import PressureSensor
+from sensors.wind import WindSensor
+from sensors.station import Station
+
+def test_rolling_window_matches_rescan() -> None:
+    """
+    Test if the incremental statistics match a full rescan of the window.
+    """
+    rng = random.Random(42)
+    window = RollingWindow(50)
+    values = []
+    for _ in range(1000):
+        value = rng.uniform(980, 1040)
+        window.append(value)
+        values.append(value)
+        recent = values[-50:]
+        assert window.min() == min(recent)
+        assert window.max() == max(recent)
+        assert window.mean() == pytest.approx(statistics.fmean(recent))
+        assert window.variance() == pytest.approx(statistics.pvariance(recent), rel=1e-6)
+    assert list(window) == values[-50:]
+
+def test_rolling_window_monotonic_runs() -> None:
+    """
+    Test if min/max stay correct when the monotonic queues fill the whole window and wrap around.
+    """
+    window = RollingWindow(4)
+    values = [*range(10, 0, -1), *range(10), 5, 5, 5, None, 5, 7]
+    for i, value in enumerate(values):
+        window.append(value)
+        recent = [v for v in values[max(i - 3, 0):i + 1] if v is not None]
+        assert window.min() == min(recent)
+        assert window.max() == max(recent)
+
+def test_rolling_window_missing_values() -> None:
+    """
+    Test if missing values are kept in the buffer but ignored by the statistics.
+    """
+    window = RollingWindow(3)
+    assert window.mean() is None and window.min() is None
+    window.append(10)
+    window.append(None)
+    window.append(20)
+    assert len(window) == 3
+    assert window.count() == 2
+    assert window.mean() == 15
+    window.append(30)
+    window.append(40)
+    window.append(None)
+    assert window.stats() == {"count": 2, "min": 30, "max": 40, "mean": 35, "variance": 25}
+
+def test_reading_history_ring_buffer() -> None:
+    """
+    Test if the history keeps only the newest readings with their timestamps.
+    """
+    history = ReadingHistory(3)
+    for i in range(5):
+        history.append(100.0 + i, float(i))
+    assert len(history) == 3
+    assert list(history) == [(102.0, 2.0), (103.0, 3.0), (104.0, 4.0)]
+    assert history.window.latest() == 4.0
+    with pytest.raises(ValueError):
+        ReadingHistory(0)
+
+def test_sensor_records_history() -> None:
+    """
+    Test if a sensor with a history capacity records every successful read.
+    """
+    sensor = PressureSensor(0, "Kosice", source="file", data_file_path="../data/data.json", history_capacity=10)
+    for _ in range(3):
+        sensor.read_data()
+    assert len(sensor.history) == 3
+    assert sensor.history.stats()["mean"] == 995
+    assert PressureSensor(1, "Kosice").history is None
+
+def test_wind_sensor_multi_channel_history() -> None:
+    """
+    Test if the wind sensor keeps one channel per wind component.
+    """
+    sensor = WindSensor(0, "Bratislava", source="file", data_file_path="../data/data.json", history_capacity=5)
+    sensor.read_data()
+    assert isinstance(sensor.history, MultiChannelHistory)
+    assert sensor.history["speed"].latest() == 3.5
+    assert sensor.history["deg"].latest() == 42
+    assert sensor.history["gust"].mean() == 2.54
+
+def test_station_metric_histories() -> None:
+    """
+    Test if a station records the history of every metric sensor.
+    """
+    station = Station(0, "Zilina", source="file", data_file_path="../data/data.json", history_capacity=4)
+    station.read_data()
+    station.read_data()
+    assert len(station.temperature.history) == 2
+    assert station.wind.history["speed"].mean() == 1.3
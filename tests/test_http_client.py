@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+import pytest
+import requests
+from sensors.http_client import HttpClient
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Local stub of the weather API. The path selects the behaviour of the response.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    calls = 0
+    connections = set()
+
+    def do_GET(self) -> None:
+        StubHandler.calls += 1
+        StubHandler.connections.add(self.client_address)
+        if self.path.startswith("/slow"):
+            time.sleep(0.5)
+        if self.path.startswith("/flaky") and StubHandler.calls < 3:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps({"main": {"temp": 7.0}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+@pytest.fixture
+def stub_url() -> Iterator[str]:
+    """
+    Start the stub server on a free local port.
+
+    Returns:
+        str: Base URL of the stub server.
+    """
+    StubHandler.calls = 0
+    StubHandler.connections = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_http_client_get_json(stub_url: str) -> None:
+    """
+    Test if the client decodes a JSON response.
+    """
+    client = HttpClient()
+    assert client.get_json(stub_url + "/weather") == {"main": {"temp": 7.0}}
+    client.close()
+
+def test_http_client_keep_alive(stub_url: str) -> None:
+    """
+    Test if sequential requests reuse one pooled connection.
+    """
+    client = HttpClient(pool_size=1)
+    for _ in range(5):
+        client.get_json(stub_url + "/weather")
+    assert StubHandler.calls == 5
+    assert len(StubHandler.connections) == 1, "Requests should reuse the kept-alive connection."
+    client.close()
+
+def test_http_client_read_timeout(stub_url: str) -> None:
+    """
+    Test if a stalled upstream raises instead of hanging.
+    """
+    client = HttpClient(read_timeout=0.1, retries=0)
+    with pytest.raises(requests.RequestException):
+        client.get_json(stub_url + "/slow")
+    client.close()
+
+def test_http_client_retries_with_backoff(stub_url: str) -> None:
+    """
+    Test if failing statuses are retried until the request succeeds.
+    """
+    client = HttpClient(retries=3, backoff_factor=0.01)
+    assert client.get_json(stub_url + "/flaky") == {"main": {"temp": 7.0}}
+    assert StubHandler.calls == 3
+    client.close()
+
+def test_http_client_gives_up_after_retries(stub_url: str) -> None:
+    """
+    Test if the client raises once the retries are exhausted.
+    """
+    client = HttpClient(retries=1, backoff_factor=0.01)
+    with pytest.raises(requests.HTTPError):
+        client.get_json(stub_url + "/flaky")
+    assert StubHandler.calls == 2
+    client.close()
+
+def test_shared_client_created_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test if concurrent first callers of get_http_client share a single client.
+    """
+    import sensors.http_client as module
+    created = []
+
+    class SlowClient:
+        def __init__(self) -> None:
+            created.append(self)
+            time.sleep(0.05)
+
+    monkeypatch.setattr(module, "_http_client", None)
+    monkeypatch.setattr(module, "HttpClient", SlowClient)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(module.get_http_client())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(created) == 1 and all(client is created[0] for client in results)
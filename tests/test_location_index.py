@@ -0,0 +1,80 @@
+import json
+import os
+import shutil
+import pytest
+from benchmarks.datagen import make_city_data
+from sensors.location_index import LocationIndex, location_index, scan_locations
+from sensors.station import Station
+from sensors.temperature import TemperatureSensor
+
+@pytest.fixture
+def data_file(tmp_path) -> str:
+    """
+    Copy the sample data file to a temporary directory, so sidecars are not written into the repository.
+
+    Returns:
+        str: Path of the copy.
+    """
+    location_index.clear()
+    path = str(tmp_path / "data.json")
+    shutil.copy("../data/data.json", path)
+    yield path
+    location_index.clear()
+
+def test_scan_matches_full_parse() -> None:
+    """
+    Test if every byte range decodes to the record of a full parse, including tricky strings and nesting.
+    """
+    city_data = make_city_data(50)
+    city_data['Quote "City" \\ {'] = {"temp": 1.0, "notes": ["a}", {"b": "]"}]}
+    city_data["Žilina – Považie"] = {"temp": -2.5}
+    raw = json.dumps({"meta": {"source": "x"}, "city_data": city_data}, ensure_ascii=False, indent=2).encode()
+    locations = scan_locations(raw)
+    assert set(locations) == set(city_data)
+    for location, (start, end) in locations.items():
+        assert json.loads(raw[start:end]) == city_data[location]
+
+def test_lookup_writes_sidecar(data_file: str) -> None:
+    """
+    Test if the first lookup builds the sidecar and another index reuses it without scanning.
+    """
+    assert location_index.lookup(data_file, "Zilina")["pressure"] == 1035
+    assert location_index.lookup(data_file, "Atlantis") is None
+    assert os.path.exists(data_file + ".idx")
+    assert location_index.builds == 1
+    other = LocationIndex()
+    assert other.lookup(data_file, "Kosice")["temp"] == 3.3
+    assert other.builds == 0
+
+def test_index_rebuilt_on_change(data_file: str) -> None:
+    """
+    Test if a changed data file gets a new index instead of stale offsets.
+    """
+    location_index.lookup(data_file, "Bratislava")
+    with open(data_file, "w") as file:
+        json.dump({"city_data": {"Presov": {"temp": 1.5}, "Bratislava": {"temp": -4.0}}}, file)
+    assert location_index.lookup(data_file, "Bratislava") == {"temp": -4.0}
+    assert location_index.lookup(data_file, "Presov") == {"temp": 1.5}
+    assert location_index.builds == 2
+
+def test_sensors_read_through_index(data_file: str) -> None:
+    """
+    Test if indexed sensors and stations read the same data as full parses.
+    """
+    indexed = TemperatureSensor(1, "Kosice", data_file_path=data_file, use_index=True)
+    full = TemperatureSensor(2, "Kosice", data_file_path=data_file)
+    assert indexed.read_data() == full.read_data() == 3.3
+    station = Station(3, "Bratislava", data_file_path=data_file, use_index=True)
+    assert station.read_data()["wind"] == {"speed": 3.5, "deg": 42, "gust": 2.54}
+    with pytest.raises(KeyError):
+        TemperatureSensor(4, "Atlantis", data_file_path=data_file, use_index=True).read_data()
+
+def test_invalid_file_raises(tmp_path) -> None:
+    """
+    Test if missing and malformed data files raise the usual sensor errors.
+    """
+    broken = tmp_path / "broken.json"
+    broken.write_text('{"city_data": {"Bratislava": {"temp": 7.0}')
+    for path in (str(broken), str(tmp_path / "missing.json")):
+        with pytest.raises(RuntimeError):
+            TemperatureSensor(1, "Bratislava", data_file_path=path, use_index=True).read_data()
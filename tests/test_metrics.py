@@ -0,0 +1,126 @@
+import statistics
+import time
+import urllib.request
+from typing import Iterator
+import pytest
+from sensors.file_cache import file_cache
+from sensors.metrics import Histogram, MetricsRegistry, registry, start_metrics_server
+from sensors.temperature import TemperatureSensor
+
+@pytest.fixture
+def metrics() -> Iterator[MetricsRegistry]:
+    """
+    Enable the shared registry for one test and start from a cold file cache.
+    """
+    registry.reset()
+    registry.enable()
+    file_cache.clear()
+    yield registry
+    registry.disable()
+    registry.reset()
+    file_cache.clear()
+
+def test_histogram_buckets() -> None:
+    """
+    Test if observations land in the first bucket whose bound is not exceeded.
+    """
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(2.65)
+
+def test_read_phases_recorded(metrics) -> None:
+    """
+    Test if a cold file read records the io, decode and extract phases and a read counter.
+    """
+    sensor = TemperatureSensor(1, "Bratislava", data_file_path="../data/data.json")
+    sensor.read_data()
+    for phase in ("io", "decode", "extract", "total"):
+        assert metrics.histogram("TemperatureSensor", "file", phase).count == 1
+    total = metrics.histogram("TemperatureSensor", "file", "total").sum
+    assert metrics.histogram("TemperatureSensor", "file", "io").sum <= total
+    assert metrics.reads("TemperatureSensor", "Bratislava", "file") == 1
+
+def test_errors_counted_by_class(metrics) -> None:
+    """
+    Test if failed reads are counted by exception class and still re-raised.
+    """
+    sensor = TemperatureSensor(1, "Atlantis", data_file_path="../data/data.json")
+    with pytest.raises(KeyError):
+        sensor.read_data()
+    sensor.data_file_path = "../data/missing.json"
+    with pytest.raises(RuntimeError):
+        sensor.read_data()
+    assert metrics.reads("TemperatureSensor", "Atlantis", "file") == 2
+    assert metrics.errors("TemperatureSensor", "Atlantis", "file", "KeyError") == 1
+    assert metrics.errors("TemperatureSensor", "Atlantis", "file", "RuntimeError") == 1
+
+def test_disabled_records_nothing() -> None:
+    """
+    Test if reads are not instrumented while the registry is disabled.
+    """
+    registry.reset()
+    sensor = TemperatureSensor(1, "Bratislava", data_file_path="../data/data.json")
+    sensor.read_data()
+    assert registry.histogram("TemperatureSensor", "file", "total") is None
+    assert registry.reads("TemperatureSensor", "Bratislava", "file") == 0
+
+def test_render_prometheus_format() -> None:
+    """
+    Test if the exposition has cumulative buckets, escaped labels and typed metric families.
+    """
+    metrics = MetricsRegistry(enabled=True, buckets=(0.1, 1.0))
+    with pytest.raises(ValueError):
+        metrics.timed_read("TemperatureSensor", 'Say "hi"', "file", lambda: (_ for _ in ()).throw(ValueError()))
+    text = metrics.render()
+    assert "# TYPE sensor_read_duration_seconds histogram" in text
+    assert 'sensor_read_duration_seconds_bucket{sensor_type="TemperatureSensor",source="file",phase="total",le="+Inf"} 1' in text
+    assert 'sensor_reads_total{sensor_type="TemperatureSensor",location="Say \\"hi\\"",source="file"} 1' in text
+    assert 'error="ValueError"} 1' in text
+
+def test_metrics_endpoint(metrics) -> None:
+    """
+    Test if the HTTP endpoint serves the exposition on /metrics.
+    """
+    TemperatureSensor(1, "Bratislava", data_file_path="../data/data.json").read_data()
+    server = start_metrics_server(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            body = response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert 'sensor_reads_total{sensor_type="TemperatureSensor",location="Bratislava",source="file"} 1' in body
+
+class NullTemperatureSensor(TemperatureSensor):
+    """
+    Temperature sensor whose file read does nothing, so only the read_data wrapper is timed.
+    """
+    __slots__ = ()
+
+    def read_data_from_file(self) -> None:
+        pass
+
+def test_disabled_overhead() -> None:
+    """
+    Test if read_data with metrics disabled adds about a microsecond on top of the source read.
+    """
+    assert not registry.enabled
+    sensor = NullTemperatureSensor(1, "City")
+    n = 20_000
+    overheads = []
+    for _ in range(9):
+        start = time.perf_counter()
+        for _ in range(n):
+            sensor.read_data()
+        per_read = (time.perf_counter() - start) / n
+        start = time.perf_counter()
+        for _ in range(n):
+            sensor.read_data_from_file()
+        overheads.append(per_read - (time.perf_counter() - start) / n)
+    overhead = statistics.median(overheads)
+    assert overhead < 1e-6, f"read_data adds {overhead * 1e6:.2f} us per read."
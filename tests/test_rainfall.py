@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 from sensors.rainfall import RainfallSensor
@@ -93,18 +94,18 @@ def test_is_raining_param(rain_value: float, threshold: float, expected: bool) -
     assert result == expected, f"For rainfall={rain_value} and threshold={threshold}, expected {expected} but got {result}"
 
 
-@patch("sensors.rainfall.requests.get")
+@patch("sensors.http_client.requests.Session.get")
 def test_rainfall_read_from_api_valid(mock_get: MagicMock) -> None:
     """
     Test reading rainfall data from an API.
 
     Args:
-        mock_get (MagicMock): A MagicMock object for the requests.get function.
+        mock_get (MagicMock): A MagicMock object for the requests.Session.get function.
     """
     mock_resp = MagicMock()
-    mock_resp.json.return_value = {
+    mock_resp.content = json.dumps({
         "clouds": {"all": 60}
-    }
+    }).encode()
     mock_resp.raise_for_status.return_value = None
     mock_get.return_value = mock_resp
 
@@ -118,18 +119,18 @@ def test_rainfall_read_from_api_valid(mock_get: MagicMock) -> None:
     assert sensor.get_data() == 60, "Rainfall (clouds.all) should be 60."
 
 
-@patch("sensors.rainfall.requests.get")
+@patch("sensors.http_client.requests.Session.get")
 def test_rainfall_read_from_api_missing_key(mock_get: MagicMock) -> None:
     """
     Test reading rainfall data from an API with missing keys.
 
     Args:
-        mock_get (MagicMock): A MagicMock object for the requests.get function.
+        mock_get (MagicMock): A MagicMock object for the requests.Session.get function.
     """
     mock_resp = MagicMock()
-    mock_resp.json.return_value = {
+    mock_resp.content = json.dumps({
         "clouds": {}
-    }
+    }).encode()
     mock_resp.raise_for_status.return_value = None
     mock_get.return_value = mock_resp
 
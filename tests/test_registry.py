@@ -0,0 +1,140 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+from sensors.humidity import HumiditySensor
+from sensors.registry import SensorRegistry, build_fleet, load_fleet
+from sensors.station import Station
+from sensors.temperature import TemperatureSensor
+from sensors.wind import WindSensor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_US = 60_000
+
+FLEET_TOML = """
+[defaults]
+data_file_path = "data.json"
+
+[[sensors]]
+id = 0
+type = "temperature"
+location = "Bratislava"
+
+[[sensors]]
+id = 10
+type = "wind"
+locations = ["Bratislava", "Zilina", "Kosice"]
+history_capacity = 5
+
+[[sensors]]
+id = 20
+type = "station"
+location = "Zilina"
+metrics = ["temperature", "humidity"]
+"""
+
+@pytest.fixture
+def fleet_dir(tmp_path) -> str:
+    """
+    Fixture to create a directory with a TOML fleet config next to a copy of the data file.
+    """
+    shutil.copy("../data/data.json", tmp_path / "data.json")
+    (tmp_path / "fleet.toml").write_text(FLEET_TOML)
+    return str(tmp_path)
+
+def test_load_toml_fleet(fleet_dir: str) -> None:
+    """
+    Test if a TOML config builds every sensor, expanding location lists and resolving paths against the config.
+    """
+    fleet = load_fleet(os.path.join(fleet_dir, "fleet.toml"))
+    assert [sensor.sensor_id for sensor in fleet] == [0, 10, 11, 12, 20]
+    assert fleet[11].location == "Zilina" and fleet[11].history is not None
+    assert fleet[0].data_file_path == os.path.join(fleet_dir, "data.json")
+    assert list(fleet[20].sensors) == ["temperature", "humidity"]
+    for sensor in fleet:
+        assert sensor.read_data() is not None
+
+def test_json_config_matches_toml(fleet_dir: str) -> None:
+    """
+    Test if a JSON config with the same content builds the same fleet.
+    """
+    config = {
+        "defaults": {"data_file_path": "data.json"},
+        "sensors": [{"id": 0, "type": "temperature", "location": "Bratislava"}, {"id": 10, "type": "wind", "locations": ["Bratislava", "Zilina"]}],
+    }
+    path = os.path.join(fleet_dir, "fleet.json")
+    with open(path, "w") as file:
+        json.dump(config, file)
+    fleet = load_fleet(path)
+    assert [(type(sensor), sensor.sensor_id, sensor.location) for sensor in fleet] == [(TemperatureSensor, 0, "Bratislava"), (WindSensor, 10, "Bratislava"), (WindSensor, 11, "Zilina")]
+    with pytest.raises(ValueError):
+        load_fleet(os.path.join(fleet_dir, "fleet.yaml"))
+
+def test_registry_indexes() -> None:
+    """
+    Test if the id, location and type indexes follow additions and removals.
+    """
+    sensors = [TemperatureSensor(0, "Bratislava"), HumiditySensor(1, "Bratislava"), TemperatureSensor(2, "Kosice"), Station(3, "Kosice")]
+    fleet = SensorRegistry(sensors)
+    assert fleet.by_location("Bratislava") == sensors[:2]
+    assert fleet.by_type("temperature") == [sensors[0], sensors[2]]
+    assert fleet.by_type(Station) == [sensors[3]]
+    assert fleet.locations() == ["Bratislava", "Kosice"]
+    assert fleet.remove(2) is sensors[2]
+    assert 2 not in fleet and len(fleet) == 3
+    assert fleet.by_location("Kosice") == [sensors[3]]
+    assert fleet.by_location("Atlantis") == []
+    with pytest.raises(KeyError):
+        fleet.get(2)
+    with pytest.raises(ValueError):
+        fleet.add(TemperatureSensor(0, "Zilina"))
+    with pytest.raises(ValueError):
+        fleet.by_type("barometer")
+
+@pytest.mark.parametrize("entry", [
+    {"id": 0, "type": "barometer", "location": "Zilina"},
+    {"id": 0, "type": "temperature", "location": "Zilina", "colour": "red"},
+    {"id": 0, "type": "temperature"},
+    {"type": "temperature", "location": "Zilina"},
+    {"id": 0, "type": "temperature", "location": "Zilina", "metrics": ["wind"]},
+    {"id": 0, "type": "station", "location": "Zilina", "metrics": ["snow"]},
+])
+def test_invalid_entries(entry: dict) -> None:
+    """
+    Test if invalid sensor entries are rejected with their position.
+    """
+    with pytest.raises(ValueError, match="Sensor entry 0"):
+        build_fleet({"sensors": [entry]})
+
+def test_import_time_budget(fleet_dir: str) -> None:
+    """
+    Test if a file-only worker never imports the HTTP stack or the modules of unused features, and imports the package within the budget.
+    """
+    script = (
+        "import sys\n"
+        "from sensors.registry import load_fleet\n"
+        f"for sensor in load_fleet({os.path.join(fleet_dir, 'fleet.toml')!r}):\n"
+        "    sensor.read_data()\n"
+        "heavy = [name for name in ('requests', 'urllib3', 'asyncio', 'http.server', 'ctypes', 'sqlite3', 'multiprocessing', 'concurrent.futures') if name in sys.modules]\n"
+        "assert not heavy, heavy\n"
+    )
+    timings = []
+    for _ in range(3):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", script], cwd=REPO_ROOT, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr[-2000:]
+        cumulative = [int(line.split("|")[1]) for line in result.stderr.splitlines() if line.startswith("import time:") and line.split("|")[2].strip() == "sensors"]
+        timings.append(cumulative[0])
+    assert min(timings) < IMPORT_BUDGET_US
+
+def test_lazy_package_exports() -> None:
+    """
+    Test if names exported lazily by the package resolve to the objects of their modules.
+    """
+    import sensors
+    from sensors.sqlite_sink import SqliteSink
+    assert sensors.SqliteSink is SqliteSink
+    assert "FileWatcher" in dir(sensors) and "FileWatcher" in sensors.__all__
+    with pytest.raises(AttributeError):
+        sensors.NoSuchSensor
@@ -0,0 +1,85 @@
+import pytest
+from sensors.rollup import RollupEngine
+from sensors.wind import WindSensor
+from sensors.station import Station
+
+@pytest.fixture
+def engine() -> RollupEngine:
+    """
+    Fixture to create an engine with minute and hour buckets and no allowed lateness.
+    """
+    return RollupEngine()
+
+def test_minute_and_hour_rollups(engine: RollupEngine) -> None:
+    """
+    Test if finished buckets are emitted with their min, max and mean once the watermark passes them.
+    """
+    for second, value in [(0, 10.0), (20, 14.0), (59, 12.0), (60, 20.0), (119, 22.0)]:
+        engine.add("s1", "temp", second, value)
+    rollups = engine.drain()
+    assert [(r.resolution, r.start, r.count, r.min, r.max, r.mean) for r in rollups] == [(60.0, 0.0, 3, 10.0, 14.0, 12.0)]
+    engine.advance(3600)
+    rollups = engine.drain()
+    assert [(r.resolution, r.start, r.mean) for r in rollups] == [(60.0, 60.0, 21.0), (3600.0, 0.0, 15.6)]
+    assert rollups[1].min == 10.0 and rollups[1].max == 22.0 and rollups[1].count == 5
+
+def test_wind_direction_circular_mean(engine: RollupEngine) -> None:
+    """
+    Test if wind directions are averaged as vectors weighted by the wind speed.
+    """
+    engine.add("w", "wind_deg", 0, 350, weight=2.0)
+    engine.add("w", "wind_deg", 1, 10, weight=2.0)
+    assert engine.current("w", "wind_deg", 60, 0).mean == pytest.approx(0.0, abs=1e-9)
+    engine.add("w", "wind_deg", 2, 90, weight=0.0)
+    rollup = engine.current("w", "wind_deg", 60, 0)
+    assert rollup.mean == pytest.approx(0.0, abs=1e-9)
+    assert rollup.count == 3 and rollup.min is None and rollup.max is None
+    engine.add("calm", "wind_deg", 0, 180, weight=0.0)
+    assert engine.current("calm", "wind_deg", 60, 0).mean is None
+
+def test_late_reading_updates_only_its_buckets(engine: RollupEngine) -> None:
+    """
+    Test if a late reading re-emits only the buckets it falls into, with a new revision.
+    """
+    engine.add("s1", "temp", 10, 1.0)
+    engine.add("s1", "temp", 70, 2.0)
+    engine.add("s2", "temp", 10, 5.0)
+    engine.add("s1", "temp", 130, 3.0)
+    engine.drain()
+    engine.add("s1", "temp", 30, 4.0)
+    rollups = engine.drain()
+    assert len(rollups) == 1
+    assert (rollups[0].key, rollups[0].start, rollups[0].mean, rollups[0].max, rollups[0].revision) == ("s1", 0.0, 2.5, 4.0, 1)
+    assert engine.current("s1", "temp", 3600, 0).count == 4
+
+def test_lateness_and_retention() -> None:
+    """
+    Test if buckets stay open for the allowed lateness and readings older than the retention are dropped.
+    """
+    engine = RollupEngine(resolutions=(60,), lateness=30, retention=120)
+    emitted = []
+    engine.on_rollup = emitted.append
+    engine.add("s1", "temp", 0, 1.0)
+    engine.add("s1", "temp", 80, 2.0)
+    assert emitted == []
+    engine.add("s1", "temp", 50, 3.0)
+    engine.add("s1", "temp", 90, 2.0)
+    assert [(r.start, r.mean, r.revision) for r in emitted] == [(0.0, 2.0, 0)]
+    engine.add("s1", "temp", 400, 1.0)
+    engine.add("s1", "temp", 10, 9.0)
+    assert engine.dropped == 1
+    assert engine.current("s1", "temp", 60, 0) is None
+
+def test_add_sensor_and_flush(engine: RollupEngine) -> None:
+    """
+    Test if every metric of a station is rolled up, using the wind speed as weight of the direction.
+    """
+    station = Station(7, "Bratislava", source="file", data_file_path="../data/data.json")
+    station.read_data()
+    engine.add_sensor(station, 0)
+    engine.flush()
+    rollups = {(r.metric, r.resolution): r for r in engine.drain()}
+    assert rollups[("temp", 60.0)].mean == station.temperature.last_data
+    assert rollups[("wind_deg", 3600.0)].mean == pytest.approx(42.0)
+    assert all(r.key == 7 for r in rollups.values())
+    assert WindSensor(8, "Bratislava").readings() == []
@@ -0,0 +1,167 @@
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Callable, List
+import pytest
+from sensors.scheduler import PollingScheduler
+from sensors.temperature import TemperatureSensor
+
+class ManualClock:
+    """
+    Clock advanced explicitly by the test.
+    """
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class HeldExecutor(Executor):
+    """
+    Executor that runs a submitted read only when the test releases it.
+    """
+    def __init__(self) -> None:
+        self.queue: List = []
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        future = Future()
+        self.queue.append((future, fn))
+        return future
+
+    def release(self) -> None:
+        queue, self.queue = self.queue, []
+        for future, fn in queue:
+            future.set_result(fn())
+
+def make_sensor(sensor_id: int) -> TemperatureSensor:
+    """
+    Create a file sensor for Bratislava.
+    """
+    return TemperatureSensor(sensor_id, "Bratislava", source="file", data_file_path="../data/data.json")
+
+def test_scheduler_fixed_grid_without_drift() -> None:
+    """
+    Test if ticks follow start + n * interval even when dispatched late.
+    """
+    clock = ManualClock()
+    executor = HeldExecutor()
+    scheduler = PollingScheduler(executor=executor, clock=clock)
+    entry = scheduler.add(make_sensor(0), interval=10, start_delay=0)
+    for now in (0.0, 10.4, 20.1, 30.0):
+        clock.now = now
+        scheduler.run_pending()
+        executor.release()
+    assert entry.runs == 4
+    assert entry._base_due == 40.0, "Late dispatches should not shift the schedule."
+    assert scheduler.lag.max() == pytest.approx(0.4)
+
+def test_scheduler_per_sensor_intervals() -> None:
+    """
+    Test if every sensor is polled at its own rate.
+    """
+    clock = ManualClock()
+    executor = HeldExecutor()
+    scheduler = PollingScheduler(executor=executor, clock=clock)
+    fast = scheduler.add(make_sensor(0), interval=1, start_delay=0)
+    slow = scheduler.add(make_sensor(1), interval=5, start_delay=0)
+    for step in range(10):
+        clock.now = float(step)
+        scheduler.run_pending()
+        executor.release()
+    assert fast.runs == 10
+    assert slow.runs == 2
+
+def test_scheduler_skips_busy_sensor() -> None:
+    """
+    Test if ticks of a sensor whose read is still running are skipped.
+    """
+    clock = ManualClock()
+    executor = HeldExecutor()
+    scheduler = PollingScheduler(executor=executor, clock=clock)
+    entry = scheduler.add(make_sensor(0), interval=1, start_delay=0)
+    for step in range(4):
+        clock.now = float(step)
+        scheduler.run_pending()
+    assert entry.runs == 1
+    assert entry.skipped == 3
+    executor.release()
+    assert not executor.queue
+
+def test_scheduler_coalesces_busy_sensor() -> None:
+    """
+    Test if ticks of a busy sensor are merged into one follow-up read.
+    """
+    clock = ManualClock()
+    executor = HeldExecutor()
+    results = []
+    scheduler = PollingScheduler(executor=executor, clock=clock, backpressure="coalesce", on_result=lambda sensor, data: results.append(data))
+    entry = scheduler.add(make_sensor(0), interval=1, start_delay=0)
+    for step in range(4):
+        clock.now = float(step)
+        scheduler.run_pending()
+    executor.release()
+    assert entry.coalesced == 1 and entry.skipped == 2
+    assert len(executor.queue) == 1, "One follow-up read should have been submitted."
+    executor.release()
+    assert results == [7.0, 7.0]
+
+def test_scheduler_jitter_stays_on_grid() -> None:
+    """
+    Test if jitter delays ticks without accumulating.
+    """
+    clock = ManualClock()
+    scheduler = PollingScheduler(executor=HeldExecutor(), clock=clock, seed=1)
+    entry = scheduler.add(make_sensor(0), interval=10, jitter=2, start_delay=0)
+    for _ in range(5):
+        clock.now = entry._fire_at
+        scheduler.run_pending()
+        scheduler._executor.release()
+        assert entry._base_due <= entry._fire_at < entry._base_due + 2
+
+def test_scheduler_thread_and_errors() -> None:
+    """
+    Test if the timer thread polls sensors and reports failed reads.
+    """
+    errors = []
+    done = threading.Event()
+    scheduler = PollingScheduler(workers=2, on_error=lambda sensor, error: (errors.append(error), done.set()))
+    good = scheduler.add(make_sensor(0), interval=0.02, start_delay=0)
+    scheduler.add(TemperatureSensor(1, "Atlantis", source="file", data_file_path="../data/data.json"), interval=0.02, start_delay=0)
+    with scheduler:
+        done.wait(2)
+        time.sleep(0.1)
+    assert good.runs >= 2
+    assert isinstance(errors[0], KeyError)
+    assert scheduler.stats()["errors"] >= 1
+
+def test_scheduler_survives_raising_callback_and_closed_executor() -> None:
+    """
+    Test if a raising callback or a shut down executor does not leave the sensor in flight forever.
+    """
+    clock = ManualClock()
+    executor = HeldExecutor()
+
+    def on_result(sensor, data) -> None:
+        raise ValueError("callback failed")
+
+    scheduler = PollingScheduler(executor=executor, clock=clock, on_result=on_result)
+    entry = scheduler.add(make_sensor(0), interval=1, start_delay=0)
+    for step in range(3):
+        clock.now = float(step)
+        scheduler.run_pending()
+        executor.release()
+    assert entry.runs == 3 and entry.skipped == 0
+    assert entry.callback_errors == 3
+    assert isinstance(entry.last_error, ValueError)
+
+    closed = ThreadPoolExecutor(max_workers=1)
+    closed.shutdown()
+    scheduler._executor = closed
+    clock.now = 3.0
+    scheduler.run_pending()
+    assert not entry._in_flight
+    assert isinstance(entry.last_error, RuntimeError)
+    scheduler._executor = executor
+    clock.now = 4.0
+    scheduler.run_pending()
+    assert len(executor.queue) == 1, "The sensor should be read again once the executor accepts work."
@@ -0,0 +1,122 @@
+import sqlite3
+import time
+import pytest
+from typing import Iterator
+from sensors.sqlite_sink import SqliteSink
+from sensors.station import Station
+from sensors.temperature import TemperatureSensor
+
+@pytest.fixture
+def sink(tmp_path) -> Iterator[SqliteSink]:
+    """
+    Fixture to create a sink writing to a temporary database and close it after the test.
+    """
+    sink = SqliteSink(str(tmp_path / "readings.db"), batch_size=100, flush_interval=0.05)
+    yield sink
+    sink.close()
+
+def test_batches_and_schema(sink: SqliteSink) -> None:
+    """
+    Test if queued readings are committed in batches into a WAL database with the (sensor_id, ts) index.
+    """
+    for i in range(250):
+        sink.add(i % 5, "Nitra", "temp", float(i), i / 10)
+    assert sink.flush(timeout=5)
+    assert sink.written == 250 and sink.batches == 3
+    assert sink.query(3, 100, 200)[:2] == [(103.0, "temp", 10.3), (108.0, "temp", 10.8)]
+    with sqlite3.connect(sink.path) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        plan = connection.execute("EXPLAIN QUERY PLAN SELECT * FROM readings WHERE sensor_id = 1 AND ts > 5").fetchall()
+    connection.close()
+    assert "readings_sensor_ts" in str(plan)
+
+def test_sensor_reads_go_to_sink(sink: SqliteSink) -> None:
+    """
+    Test if every successful read of a sensor with a sink is persisted, one row per metric.
+    """
+    sensor = TemperatureSensor(0, "Bratislava", source="file", data_file_path="../data/data.json")
+    station = Station(1, "Zilina", source="file", data_file_path="../data/data.json", metrics=["temperature", "humidity"])
+    sensor.sink = sink
+    station.sink = sink
+    sensor.read_data()
+    sensor.read_data()
+    station.read_data()
+    sink.flush(timeout=5)
+    assert [(metric, value) for _, metric, value in sink.query(0)] == [("temp", sensor.last_data)] * 2
+    assert sorted(metric for _, metric, _ in sink.query(1)) == ["humidity", "temp"]
+
+def test_partial_batch_flushed_by_interval(sink: SqliteSink) -> None:
+    """
+    Test if a partial batch is committed after the flush interval without an explicit flush.
+    """
+    sink.add(7, None, "pressure", 1.0, 1012)
+    for _ in range(100):
+        if sink.written:
+            break
+        sink._thread.join(0.02)
+    assert sink.written == 1
+
+def test_close_is_durable(tmp_path) -> None:
+    """
+    Test if close commits every queued reading, checkpoints the WAL and drops later writes.
+    """
+    path = str(tmp_path / "readings.db")
+    sink = SqliteSink(path, batch_size=10_000, flush_interval=60)
+    for i in range(5000):
+        sink.add(1, "Kosice", "humidity", float(i), 50)
+    sink.close()
+    sink.close()
+    assert not (tmp_path / "readings.db-wal").exists() or (tmp_path / "readings.db-wal").stat().st_size == 0
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM readings").fetchone() == (5000,)
+    connection.close()
+    assert sink.add(1, "Kosice", "humidity", 5000.0, 50) is False
+    assert sink.dropped == 1
+
+def test_full_queue_drops(tmp_path) -> None:
+    """
+    Test if writes to a full queue are dropped after the put timeout while the writer is stuck on a locked database.
+    """
+    path = str(tmp_path / "readings.db")
+    sink = SqliteSink(path, batch_size=1, max_queue=1, put_timeout=0.01)
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN EXCLUSIVE")
+    assert sink.add(0, None, "temp", 0.0, 1.0)
+    while not sink._queue.empty():
+        sink._thread.join(0.01)
+    assert sink.add(0, None, "temp", 1.0, 1.0)
+    assert not sink.add(0, None, "temp", 2.0, 1.0)
+    blocker.execute("COMMIT")
+    blocker.close()
+    sink.close()
+    assert (sink.written, sink.dropped) == (2, 1)
+
+def test_write_never_waits(tmp_path) -> None:
+    """
+    Test if a sensor's write to a full queue is dropped right away instead of waiting for the put timeout.
+    """
+    path = str(tmp_path / "readings.db")
+    sink = SqliteSink(path, batch_size=1, max_queue=1, put_timeout=5)
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN EXCLUSIVE")
+    sensor = Station(0, "Zilina", source="file", data_file_path="../data/data.json")
+    sensor.read_data()
+    start = time.perf_counter()
+    assert sink.write(sensor) < len(sensor.sensors)
+    assert time.perf_counter() - start < 1
+    blocker.execute("COMMIT")
+    blocker.close()
+    sink.close()
+    assert sink.dropped > 0
+
+def test_bad_row_isolated(sink: SqliteSink) -> None:
+    """
+    Test if a row that cannot be inserted is dropped without losing the rest of its batch.
+    """
+    for i in range(50):
+        sink.add(1, "Nitra", None if i == 17 else "temp", float(i), 20.0)
+    assert sink.flush(timeout=5)
+    assert sink.written == 49
+    assert sink.dropped == 1
+    assert isinstance(sink.last_error, sqlite3.IntegrityError)
+    assert [ts for ts, _, _ in sink.query(1)] == [float(i) for i in range(50) if i != 17]
@@ -0,0 +1,112 @@
+import json
+import pytest
+from unittest.mock import patch, MagicMock
+from sensors.file_cache import file_cache
+from sensors.station import Station
+from sensors.temperature import TemperatureSensor
+
+@pytest.fixture
+def station_bratislava() -> Station:
+    """
+    Create a station for Bratislava reading from a file.
+
+    Returns:
+        Station: A station for Bratislava.
+    """
+    station = Station(0, "Bratislava", source="file", data_file_path="../data/data.json")
+    station.read_data()
+    return station
+
+def test_station_reads_all_metrics(station_bratislava: Station) -> None:
+    """
+    Test if one read fills every metric of the station.
+    """
+    assert station_bratislava.get_data() == {
+        "temperature": 7.0,
+        "humidity": 60,
+        "pressure": 1012,
+        "wind": {"speed": 3.5, "deg": 42, "gust": 2.54},
+        "rainfall": 12,
+    }
+    assert station_bratislava.missing == []
+
+def test_station_per_type_methods(station_bratislava: Station) -> None:
+    """
+    Test if the station exposes the per-type methods of its metric sensors.
+    """
+    assert isinstance(station_bratislava.temperature, TemperatureSensor)
+    assert station_bratislava.convert_to_fahrenheit() == pytest.approx(44.6)
+    assert station_bratislava.convert_to_psi() == pytest.approx(14.677, rel=1e-3)
+    assert station_bratislava.is_humid() is False
+    assert station_bratislava.is_raining() is False
+    assert station_bratislava.convert_speed_to_kmh() == pytest.approx(12.6)
+
+def test_station_single_file_lookup() -> None:
+    """
+    Test if a station looks up its data file only once per read.
+    """
+    file_cache.clear()
+    Station(0, "Kosice", source="file", data_file_path="../data/data.json").read_data()
+    assert file_cache.hits + file_cache.misses == 1
+
+def test_station_subset_of_metrics() -> None:
+    """
+    Test if a station can measure only some metrics.
+    """
+    station = Station(0, "Zilina", source="file", data_file_path="../data/data.json", metrics=["temperature", "rainfall"])
+    station.read_data()
+    assert station.get_data() == {"temperature": 5.2, "rainfall": 0}
+    with pytest.raises(AttributeError):
+        station.convert_to_psi()
+    with pytest.raises(ValueError):
+        Station(1, "Zilina", metrics=["visibility"])
+
+def test_station_missing_location() -> None:
+    """
+    Test if a station raises a KeyError for a missing location.
+    """
+    station = Station(0, "Atlantis", source="file", data_file_path="../data/data.json")
+    with pytest.raises(KeyError):
+        station.read_data()
+
+def test_station_failed_read_clears_metrics(station_bratislava: Station) -> None:
+    """
+    Test if a failed read leaves no metric sensor with a value from the previous read.
+
+    Args:
+        station_bratislava (Station): A station for Bratislava that has been read.
+    """
+    station_bratislava.location = "Atlantis"
+    with pytest.raises(KeyError):
+        station_bratislava.read_data()
+    assert station_bratislava.get_data() is None
+    assert all(sensor.get_data() is None for sensor in station_bratislava.sensors.values())
+    assert station_bratislava.missing == list(station_bratislava.sensors)
+    station_bratislava.data_file_path = "missing.json"
+    with pytest.raises(RuntimeError):
+        station_bratislava.read_data()
+    assert station_bratislava.temperature.get_data() is None
+
+@patch("sensors.http_client.requests.Session.get")
+def test_station_single_api_call(mock_get: MagicMock) -> None:
+    """
+    Test if a station fills all metrics from one API call and reports missing ones.
+
+    Args:
+        mock_get (MagicMock): Mocked requests.Session.get function.
+    """
+    mock_resp = MagicMock()
+    mock_resp.content = json.dumps({
+        "main": {"temp": 4.2, "humidity": 81, "pressure": 1021},
+        "clouds": {"all": 75},
+    }).encode()
+    mock_resp.raise_for_status.return_value = None
+    mock_get.return_value = mock_resp
+
+    station = Station(0, "Dolny Kubin", source="api", api_url="https://fake.url")
+    station.read_data()
+    assert mock_get.call_count == 1
+    assert station.get_data()["temperature"] == 4.2
+    assert station.get_data()["wind"] is None
+    assert station.missing == ["wind"]
+    assert station.convert_speed_to_kmh() is None
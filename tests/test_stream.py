@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+import pytest
+import sensors.stream as stream_module
+from sensors.decoder import get_decoder
+from sensors.stream import iter_observations, latest_observation, tail_observations
+from sensors.temperature import TemperatureSensor
+from sensors.wind import WindSensor
+from sensors.station import Station
+
+OBSERVATIONS = [
+    {"ts": 1, "location": "Bratislava", "temp": 7.0, "humidity": 60},
+    {"ts": 2, "location": "Zilina", "temp": 5.2},
+    {"ts": 3, "location": "Bratislava", "wind_speed": 3.5, "wind_deg": 42, "wind_gust": 2.54},
+    {"ts": 4, "location": "Bratislava", "temp": 8.1, "pressure": 1010},
+]
+
+@pytest.fixture
+def log_path(tmp_path) -> str:
+    """
+    Write the sample observations to an NDJSON log.
+
+    Returns:
+        str: Path of the log.
+    """
+    path = tmp_path / "observations.ndjson"
+    path.write_text("\n".join(json.dumps(record) for record in OBSERVATIONS) + "\n\n")
+    return str(path)
+
+def test_iter_observations_filters(log_path: str) -> None:
+    """
+    Test if observations are filtered by location and metric.
+    """
+    assert list(iter_observations(log_path)) == OBSERVATIONS
+    assert [record["ts"] for record in iter_observations(log_path, locations=["Bratislava"])] == [1, 3, 4]
+    assert list(iter_observations(log_path, metrics=["pressure"])) == [{"pressure": 1010, "location": "Bratislava", "ts": 4}]
+
+def test_latest_observation(log_path: str) -> None:
+    """
+    Test if the newest observation with the requested metrics is found.
+    """
+    assert latest_observation(log_path, "Bratislava")["ts"] == 4
+    assert latest_observation(log_path, "Bratislava", ["wind_speed"])["ts"] == 3
+    assert latest_observation(log_path, "Kosice") is None
+
+def test_latest_observation_reads_appended_lines_only(log_path: str, monkeypatch) -> None:
+    """
+    Test if repeated lookups only decode the lines appended since the last one and restart on a replaced log.
+    """
+    decoded = []
+    decoder = get_decoder()
+
+    class CountingDecoder:
+        def loads(self, data):
+            decoded.append(data)
+            return decoder.loads(data)
+
+    monkeypatch.setattr(stream_module, "get_decoder", lambda: CountingDecoder())
+    assert latest_observation(log_path, "Zilina")["ts"] == 2
+    assert len(decoded) == len(OBSERVATIONS)
+    assert latest_observation(log_path, "Bratislava", ["temp"])["temp"] == 8.1
+    assert len(decoded) == len(OBSERVATIONS)
+    with open(log_path, "a") as file:
+        file.write(json.dumps({"ts": 5, "location": "Zilina", "temp": 6.0}) + "\n")
+        file.write('{"ts": 6, "location": "Zil')
+    assert latest_observation(log_path, "Zilina")["ts"] == 5
+    assert len(decoded) == len(OBSERVATIONS) + 2
+    with open(log_path, "a") as file:
+        file.write('ina", "temp": 6.5}\n')
+    assert latest_observation(log_path, "Zilina", ["temp"]) == {"temp": 6.5, "location": "Zilina", "ts": 6}
+    replacement = log_path + ".new"
+    with open(replacement, "w") as file:
+        file.write(json.dumps({"ts": 7, "location": "Kosice", "temp": 1.0}) + "\n")
+    os.replace(replacement, log_path)
+    assert latest_observation(log_path, "Zilina") is None
+    assert latest_observation(log_path, "Kosice")["ts"] == 7
+
+def test_sensors_read_from_stream(log_path: str) -> None:
+    """
+    Test if sensors read the newest value of their metric from the stream source.
+    """
+    temperature = TemperatureSensor(0, "Bratislava", source="stream", data_file_path=log_path)
+    assert temperature.read_data() == 8.1
+    wind = WindSensor(1, "Bratislava", source="stream", data_file_path=log_path)
+    assert wind.read_data() == {"speed": 3.5, "deg": 42, "gust": 2.54}
+    station = Station(2, "Zilina", source="stream", data_file_path=log_path, metrics=["temperature", "humidity"])
+    assert station.read_data() == {"temperature": 5.2, "humidity": None}
+
+def test_stream_errors(log_path: str, tmp_path) -> None:
+    """
+    Test if missing locations and files raise the same errors as the file source.
+    """
+    with pytest.raises(KeyError):
+        TemperatureSensor(0, "Atlantis", source="stream", data_file_path=log_path).read_data()
+    with pytest.raises(RuntimeError):
+        TemperatureSensor(0, "Bratislava", source="stream", data_file_path=str(tmp_path / "missing.ndjson")).read_data()
+
+def test_station_failed_stream_read_clears_metrics(log_path: str, tmp_path) -> None:
+    """
+    Test if a station drops the values of all metric sensors when a stream read fails.
+    """
+    station = Station(1, "Bratislava", source="stream", data_file_path=log_path, metrics=["temperature", "humidity"])
+    assert station.read_data()["temperature"] == 8.1
+    station.data_file_path = str(tmp_path / "missing.ndjson")
+    with pytest.raises(RuntimeError):
+        station.read_data()
+    assert station.get_data() is None and station.temperature.get_data() is None and station.humidity.get_data() is None
+    assert station.missing == ["temperature", "humidity"]
+
+def test_iter_observations_constant_memory(tmp_path) -> None:
+    """
+    Test if memory does not grow with the size of the log.
+    """
+    path = tmp_path / "big.ndjson"
+    with open(path, "w") as file:
+        for i in range(50_000):
+            file.write(json.dumps({"ts": i, "location": f"City {i % 100}", "temp": i / 10}) + "\n")
+    tracemalloc.start()
+    count = sum(1 for _ in iter_observations(str(path), locations=["City 7"]))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert count == 500
+    assert peak < 256 * 1024, f"Peak memory {peak} bytes should not depend on the file size."
+
+def test_tail_observations(tmp_path) -> None:
+    """
+    Test if appended observations are yielded, including lines written in parts.
+    """
+    path = tmp_path / "live.ndjson"
+    path.write_text(json.dumps({"ts": 0, "location": "Zilina", "temp": 1.0}) + "\n")
+    stop = threading.Event()
+    received = []
+
+    def follow() -> None:
+        for record in tail_observations(str(path), locations=["Zilina"], poll_interval=0.01, stop=stop):
+            received.append(record)
+
+    thread = threading.Thread(target=follow)
+    thread.start()
+    time.sleep(0.05)
+    with open(path, "a") as file:
+        file.write(json.dumps({"ts": 1, "location": "Kosice", "temp": 2.0}) + "\n")
+        file.write('{"ts": 2, "location": "Zil')
+        file.flush()
+        time.sleep(0.05)
+        file.write('ina", "temp": 3.0}\n')
+    deadline = time.time() + 2
+    while not received and time.time() < deadline:
+        time.sleep(0.01)
+    stop.set()
+    thread.join(2)
+    assert received == [{"ts": 2, "location": "Zilina", "temp": 3.0}]
@@ -1,3 +1,4 @@
+import json
 import pytest
 from sensors.temperature import TemperatureSensor
 from unittest.mock import patch, MagicMock
@@ -63,18 +64,18 @@ def test_convert_to_fahrenheit(celsius_input: float, expected_fahrenheit: float)
     sensor.last_data = celsius_input
     assert sensor.convert_to_fahrenheit() == pytest.approx(expected_fahrenheit, 0.1)
 
-@patch("sensors.temperature.requests.get")
+@patch("sensors.http_client.requests.Session.get")
 def test_temperature_read_data_from_api(mock_get: MagicMock) -> None:
     """
     Test if the temperature sensor reads data from an API.
 
     Args:
-        mock_get (MagicMock): Mocked requests.get function.
+        mock_get (MagicMock): Mocked requests.Session.get function.
     """
     mock_response = MagicMock()
-    mock_response.json.return_value = {
+    mock_response.content = json.dumps({
         "main": {"temp": 15.5}
-    }
+    }).encode()
     mock_response.raise_for_status.return_value = None
 
     mock_get.return_value = mock_response
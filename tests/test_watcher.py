@@ -0,0 +1,132 @@
+import json
+import os
+import threading
+import pytest
+from sensors.file_cache import file_cache
+from sensors.humidity import HumiditySensor
+from sensors.station import Station
+from sensors.temperature import TemperatureSensor
+from sensors.watcher import FileWatcher
+
+def write(path: str, city_data: dict) -> None:
+    """
+    Replace a data file atomically, as a producer should.
+    """
+    with open(path + ".tmp", "w") as file:
+        json.dump({"city_data": city_data}, file)
+    os.replace(path + ".tmp", path)
+
+@pytest.fixture
+def data_file(tmp_path) -> str:
+    """
+    Create a data file with two cities.
+
+    Returns:
+        str: Path of the data file.
+    """
+    file_cache.clear()
+    path = str(tmp_path / "data.json")
+    write(path, {"Bratislava": {"temp": 7.0, "humidity": 60}, "Zilina": {"temp": 5.2, "humidity": 40}})
+    yield path
+    file_cache.clear()
+
+def test_subscribe_reads_current_values(data_file: str) -> None:
+    """
+    Test if subscribing fills the sensor right away with a single parse.
+    """
+    watcher = FileWatcher(use_inotify=False)
+    sensors = [TemperatureSensor(i, "Bratislava", data_file_path=data_file) for i in range(3)]
+    for sensor in sensors:
+        watcher.subscribe(sensor)
+    assert [sensor.get_data() for sensor in sensors] == [7.0, 7.0, 7.0]
+    assert watcher.reloads == 1
+
+def test_only_changed_sensors_updated(data_file: str) -> None:
+    """
+    Test if a change reaches only the sensors whose metric of their location changed.
+    """
+    changes = []
+    watcher = FileWatcher(use_inotify=False, on_change=lambda sensor, old, new: changes.append((sensor.sensor_id, old, new)))
+    watcher.subscribe(TemperatureSensor(1, "Bratislava", data_file_path=data_file))
+    watcher.subscribe(HumiditySensor(2, "Bratislava", data_file_path=data_file))
+    watcher.subscribe(TemperatureSensor(3, "Zilina", data_file_path=data_file))
+    assert watcher.check() == 0
+    write(data_file, {"Bratislava": {"temp": 8.5, "humidity": 60}, "Zilina": {"temp": 5.2, "humidity": 40}})
+    assert watcher.check() == 1
+    assert changes == [(1, 7.0, 8.5)]
+    assert watcher.reloads == 2
+
+def test_unchanged_file_not_parsed(data_file: str) -> None:
+    """
+    Test if checks of an unchanged file do not parse it again.
+    """
+    watcher = FileWatcher(use_inotify=False)
+    watcher.subscribe(TemperatureSensor(1, "Bratislava", data_file_path=data_file))
+    for _ in range(10):
+        watcher.check()
+    assert watcher.reloads == 1
+
+def test_removed_location_and_station(data_file: str) -> None:
+    """
+    Test if a removed location clears the sensor and stations follow their metrics.
+    """
+    watcher = FileWatcher(use_inotify=False)
+    sensor = TemperatureSensor(1, "Zilina", data_file_path=data_file)
+    station = Station(2, "Bratislava", data_file_path=data_file, metrics=("temperature", "humidity"))
+    watcher.subscribe(sensor)
+    watcher.subscribe(station)
+    write(data_file, {"Bratislava": {"temp": 7.0, "humidity": 75}})
+    assert watcher.check() == 2
+    assert sensor.get_data() is None
+    assert station.get_data() == {"temperature": 7.0, "humidity": 75}
+
+def test_broken_file_keeps_values(data_file: str) -> None:
+    """
+    Test if a half-written file is reported as an error and the sensors keep their data.
+    """
+    watcher = FileWatcher(use_inotify=False)
+    sensor = TemperatureSensor(1, "Bratislava", data_file_path=data_file)
+    watcher.subscribe(sensor)
+    with open(data_file, "w") as file:
+        file.write('{"city_data": {"Bratislava": ')
+    assert watcher.check() == 0
+    assert watcher.errors == 1
+    assert sensor.get_data() == 7.0
+
+def test_recovers_from_broken_first_load(data_file: str) -> None:
+    """
+    Test if sensors that subscribed to a broken file are updated once it becomes valid.
+    """
+    changes = []
+    watcher = FileWatcher(use_inotify=False, on_change=lambda sensor, old, new: changes.append((sensor.sensor_id, old, new)))
+    with open(data_file, "w") as file:
+        file.write('{"city_data": {"Bratislava": ')
+    sensor = TemperatureSensor(1, "Bratislava", data_file_path=data_file)
+    watcher.subscribe(sensor)
+    assert sensor.get_data() is None
+    assert watcher.errors == 1
+    write(data_file, {"Bratislava": {"temp": 9.1, "humidity": 60}})
+    assert watcher.check() == 1
+    assert sensor.get_data() == 9.1
+    assert changes == [(1, None, 9.1)]
+    write(data_file, {"Bratislava": {"temp": 9.4, "humidity": 60}})
+    assert watcher.check() == 1
+    assert sensor.get_data() == 9.4
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_background_thread_pushes_changes(data_file: str, use_inotify: bool) -> None:
+    """
+    Test if the running watcher pushes a change through inotify or polling.
+    """
+    try:
+        watcher = FileWatcher(poll_interval=0.05, use_inotify=use_inotify)
+    except OSError:
+        pytest.skip("inotify is not available")
+    changed = threading.Event()
+    sensor = TemperatureSensor(1, "Zilina", data_file_path=data_file)
+    watcher.subscribe(sensor, callback=lambda sensor, old, new: changed.set())
+    with watcher:
+        write(data_file, {"Zilina": {"temp": -1.0}})
+        assert changed.wait(5)
+    assert sensor.get_data() == -1.0
+    assert watcher.stats()["inotify"] is use_inotify
@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 from sensors.wind import WindSensor
@@ -89,18 +90,30 @@ def test_wind_convert_speed_to_kmh(wind_sensor_bratislava: WindSensor, speed: fl
     assert kmh == pytest.approx(expected_kmh, 0.1), f"Expected ~{expected_kmh} km/h but got {kmh}."
 
 
-@patch("sensors.wind.requests.get")
+def test_wind_str_without_data(wind_sensor_bratislava: WindSensor) -> None:
+    """
+    Test if the string representation of a sensor without data or with partial data does not raise.
+
+    Args:
+        wind_sensor_bratislava (WindSensor): A WindSensor instance for Bratislava.
+    """
+    assert str(wind_sensor_bratislava) == "Wind sensor for location Bratislava with last data: Wind speed None m/s, Wind direction None degrees, Wind gust None m/s"
+    wind_sensor_bratislava.last_data = {"speed": 3.5}
+    assert "Wind speed 3.5 m/s, Wind direction None degrees" in str(wind_sensor_bratislava)
+
+
+@patch("sensors.http_client.requests.Session.get")
 def test_wind_read_from_api_valid(mock_get: MagicMock) -> None:
     """
     Test reading wind data from an API.
 
     Args:
-        mock_get (MagicMock): A MagicMock object for the requests.get function.
+        mock_get (MagicMock): A MagicMock object for the requests.Session.get function.
     """
     mock_resp = MagicMock()
-    mock_resp.json.return_value = {
+    mock_resp.content = json.dumps({
         "wind": {"speed": 2.0, "deg": 100, "gust": 3.1}
-    }
+    }).encode()
     mock_resp.raise_for_status.return_value = None
     mock_get.return_value = mock_resp
 
@@ -118,18 +131,18 @@ def test_wind_read_from_api_valid(mock_get: MagicMock) -> None:
     assert data["gust"] == 3.1
 
 
-@patch("sensors.wind.requests.get")
+@patch("sensors.http_client.requests.Session.get")
 def test_wind_read_from_api_missing_keys(mock_get: MagicMock) -> None:
     """
     Test reading wind data from an API when the response is missing keys.
 
     Args:
-        mock_get (MagicMock): A MagicMock object for the requests.get function.
+        mock_get (MagicMock): A MagicMock object for the requests.Session.get function.
     """
     mock_resp = MagicMock()
-    mock_resp.json.return_value = {
+    mock_resp.content = json.dumps({
         "wind": {"speed": 2.0, "deg": 120}
-    }
+    }).encode()
     mock_resp.raise_for_status.return_value = None
     mock_get.return_value = mock_resp
 